@@ -0,0 +1,412 @@
+"""autoplay.py – scripted bot players for soak and leak testing
+
+A `Bot` plays a headless `CasinoApp` through the same path as a person: it
+only taps and holds keys on `NullPyxel`, which `InputHelper.sample()` reads
+like a keyboard. It picks a table from the menu, places bets, hits or
+stands, spins and races, goes broke and restarts, as its `Policy` says.
+It reads game state only to decide what to press.
+
+While a bot plays, `run_bot` samples memory every `sample_every` ticks:
+tracemalloc's traced bytes and the peak since the last sample (allocation
+churn), the process RSS and the number of GC‑tracked objects. After a
+warm‑up (caches, the rewind ring and the label atlas filling up) it fits
+the growth per 100k ticks, and flags a leak when the low‑water mark of a
+metric keeps rising faster than `LEAK_LIMITS` (see `leaks`), with the
+source lines that grew most. A bot that makes no progress – same
+scene and balance, no finished round – for `STUCK_TICKS` is logged as
+stuck and sent back with Q.
+
+Bots run in parallel worker processes (inline where the platform has
+none), each with its own seed:
+
+    python autoplay.py                               # 4 bots, 200k ticks each
+    python autoplay.py --bots 8 --minutes 120        # long soak
+    python autoplay.py --policy masher rewinder --no-trace
+
+The exit status is 1 if any bot leaked or got stuck.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import backend
+from common import BOUND_KEYS, SIM_FPS
+from main import CasinoApp
+
+STUCK_TICKS  = 60 * SIM_FPS     # a minute of game time without progress
+WARMUP       = 0.25             # share of the run ignored by the fit …
+WARMUP_TICKS = 50_000           # … and never less than this (caches filling)
+QUARTERS     = 4                # steady part split for the low‑water test
+TOP_GROWERS  = 5
+LEAK_LIMITS  = {"traced": 256 * 1024,   # growth per 100k ticks that is a leak
+                "rss": 16 * 1024 * 1024,       # coarse: allocator slack, NumPy
+                "objects": 2_000}
+
+
+class Policy(NamedTuple):
+    """How a bot plays; every field is a knob of the scripted player."""
+    name: str
+    games: Tuple[str, ...] = ("Roulette", "Blackjack", "Horse")
+    rounds: int = 5             # rounds per table visit, then Q to the menu
+    stand_on: int = 17          # blackjack: hit below this total
+    max_raise: int = 3          # up to this many ↑ presses on a bet screen
+    think: int = 2              # ticks between key presses
+    chaos: float = 0.0          # chance a press is a random bound key instead
+    rewind: float = 0.0         # chance per round of a rewind or quick‑save/load (dev keys)
+
+
+POLICIES: Dict[str, Policy] = {p.name: p for p in (
+    Policy("player"),
+    Policy("gambler", rounds=20, stand_on=15, max_raise=10, think=0),
+    Policy("masher", think=0, chaos=1.0),
+    Policy("rewinder", rewind=0.3, chaos=0.05),
+)}
+
+
+class MemSample(NamedTuple):
+    tick: int
+    traced: int                 # bytes held by Python allocations (tracemalloc)
+    churn: int                  # peak above `traced` since the last sample
+    rss: int                    # resident set size, bytes
+    objects: int                # GC‑tracked objects
+
+
+class BotReport(NamedTuple):
+    bot: int
+    policy: str
+    seed: int
+    ticks: int
+    seconds: float
+    rounds: int
+    restarts: int               # game overs
+    balance: int
+    visits: Dict[str, int]      # ticks per scene
+    stuck: Tuple[Tuple[int, str], ...]
+    samples: Tuple[MemSample, ...]
+    growth: Dict[str, float]    # per 100k ticks, after warm‑up
+    leaks: Tuple[str, ...]      # metrics over `LEAK_LIMITS`
+    top: Tuple[str, ...]        # fastest‑growing source lines (tracemalloc)
+
+
+# ───────────────────────────── the bot ─────────────────────────────────
+class Bot:
+    """Presses keys for one headless app; call `act()` before every tick."""
+
+    def __init__(self, app: CasinoApp, policy: Policy, rng: random.Random) -> None:
+        self.app, self.policy, self.rng = app, policy, rng
+        self.null = backend.active()
+        self.keys = {name: getattr(self.null, name) for name in BOUND_KEYS}
+        self.menu = [spec.name for spec in app.menu_items]
+        self.plan: List[int] = []        # keys still to press, in order
+        self.plan_scene = ""
+        self.target: str | None = None   # table the bot is heading for
+        self.rounds_left = 0
+        self.rounds = self.restarts = 0
+        self.wait = 0
+        self.held: int | None = None     # key being held down (rewind)
+        self.hold_left = 0
+
+    def key(self, name: str) -> int:
+        return self.keys["KEY_" + name]
+
+    def act(self) -> None:
+        if self.held is not None:
+            self.hold_left -= 1
+            if self.hold_left <= 0:
+                self.null.release(self.held)
+                self.held = None
+            return
+        if self.wait:
+            self.wait -= 1
+            return
+        if self.plan_scene != self.app.scene:    # a plan never crosses scenes
+            self.plan.clear()
+            self.plan_scene = self.app.scene
+        if not self.plan:
+            self.plan = self._decide()
+        if self.plan:
+            key = self.plan.pop(0)
+            if self.rng.random() < self.policy.chaos:
+                key = self.rng.choice(list(self.keys.values()))
+            self.null.tap(key)
+            self.wait = self.policy.think
+
+    def hold(self, key: int, ticks: int) -> None:
+        self.null.hold(key)
+        self.held, self.hold_left = key, ticks
+
+    # ------------------------------------------------------- decisions
+    def _decide(self) -> List[int]:
+        scene = self.app.scene
+        if scene == "menu":
+            return self._menu()
+        if scene == "game_over":
+            self.restarts += 1
+            return [self.key("RETURN")]
+        game = self.app.games[scene]
+        return getattr(self, "_" + scene.lower())(game)
+
+    def _menu(self) -> List[int]:
+        if self.target is None:
+            self.target = self.rng.choice(self.policy.games)
+        idx = self.menu.index(self.target)
+        if self.app.menu_idx != idx:
+            return [self.key("DOWN")]
+        self.target, self.rounds_left = None, self.policy.rounds
+        return [self.key("RETURN")]
+
+    def _new_round(self, moves: List[str], start: List[str]) -> List[int]:
+        """
+        Keys for one bet screen: *moves*, a random raise, then *start* – or
+        Q once the visit is over, or now and then a rewind / quick‑save / load.
+        """
+        rng = self.rng
+        if self.rounds_left <= 0:
+            return [self.key("Q")]
+        if rng.random() < self.policy.rewind:
+            r = rng.random()
+            if r < 0.5:
+                self.hold(self.key("R"), rng.randint(5, 120))
+                return []
+            return [self.key("F5" if r < 0.75 else "F9")]
+        self.rounds_left -= 1
+        self.rounds += 1
+        raise_by = ["UP"] * rng.randint(0, self.policy.max_raise)
+        return [self.key(name) for name in moves + raise_by + start]
+
+    def _blackjack(self, game) -> List[int]:
+        if game.stage == "bet":
+            return self._new_round([], ["SPACE"])
+        if game.stage == "result":
+            return [self.key("RETURN")]
+        if game.player_stand:                    # dealer drawing
+            return []
+        return [self.key("H" if game.player.value < self.policy.stand_on else "S")]
+
+    def _roulette(self, game) -> List[int]:
+        if game.animating:
+            return []
+        if game.result is not None:
+            return [self.key("SPACE")]
+        rng = self.rng
+        moves = ["TAB"] * rng.randint(0, 2) + [rng.choice(("LEFT", "RIGHT"))] * rng.randint(0, 5)
+        return self._new_round(moves, ["A"] * rng.randint(0, 2) + ["SPACE"])
+
+    def _horse(self, game) -> List[int]:
+        if game.winner is None:
+            moves = [self.rng.choice(("LEFT", "RIGHT"))] * self.rng.randint(0, 3)
+            return self._new_round(moves, ["SPACE"])
+        if game.winner >= 0:
+            return [self.key("RETURN")]
+        return []                                # racing
+
+
+# ───────────────────────────── memory ──────────────────────────────────
+def _rss() -> int:
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource                         # peak, not current, elsewhere
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _sample(tick: int) -> MemSample:
+    traced = peak = 0
+    if tracemalloc.is_tracing():
+        traced, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+    return MemSample(tick, traced, peak - traced, _rss(), len(gc.get_objects()))
+
+
+def _slope(xs: Sequence[float], ys: Sequence[float]) -> float:
+    """Least‑squares slope of *ys* over *xs* (0 for fewer than 2 points)."""
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mx, my = sum(xs) / n, sum(ys) / n
+    var = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var if var else 0.0
+
+
+def _rates(samples: Sequence[MemSample]) -> Dict[str, float]:
+    ticks = [s.tick for s in samples]
+    return {name: _slope(ticks, [getattr(s, name) for s in samples]) * 100_000
+            for name in LEAK_LIMITS}
+
+
+def growth(samples: Sequence[MemSample]) -> Dict[str, float]:
+    """Growth per 100k ticks of every metric, after the warm‑up samples."""
+    return _rates(_steady(samples))
+
+
+def _steady(samples: Sequence[MemSample]) -> Sequence[MemSample]:
+    """The samples after the warm‑up."""
+    if not samples:
+        return samples
+    start = max(samples[-1].tick * WARMUP, WARMUP_TICKS)
+    return [s for s in samples if s.tick > start]
+
+
+def leaks(samples: Sequence[MemSample], traced: bool = True) -> Tuple[str, ...]:
+    """
+    Metrics whose low‑water mark rises in every quarter of the steady part,
+    by more than their `LEAK_LIMITS` rate overall. The rewind ring, caches
+    and NumPy temporaries make memory swing up and down; a leak lifts the
+    floor and keeps lifting it.
+    """
+    steady = _steady(samples)
+    n = len(steady)
+    if n < 2 * QUARTERS:
+        return ()
+    parts = [steady[i * n // QUARTERS:(i + 1) * n // QUARTERS] for i in range(QUARTERS)]
+    span = (parts[-1][0].tick - parts[0][0].tick) / 100_000
+    out = []
+    for name, limit in LEAK_LIMITS.items():
+        if name == "traced" and not traced:
+            continue
+        lows = [min(getattr(s, name) for s in part) for part in parts]
+        if all(b > a for a, b in zip(lows, lows[1:])) and (lows[-1] - lows[0]) / span > limit:
+            out.append(name)
+    return tuple(out)
+
+
+def _snapshot() -> "tracemalloc.Snapshot":
+    return tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),
+         tracemalloc.Filter(False, __file__)))
+
+
+# ───────────────────────────── one bot ─────────────────────────────────
+def run_bot(policy: Policy, seed: int = 0, *, ticks: int | None = 200_000,
+            seconds: float | None = None, sample_every: int = 2_000,
+            trace: bool = True, bot: int = 0) -> BotReport:
+    """Play *policy* for *ticks* ticks or *seconds* of wall time, whichever ends first."""
+    if trace:
+        tracemalloc.start()
+    app = CasinoApp(headless=True, seed=seed, dev=policy.rewind > 0)
+    player = Bot(app, policy, random.Random(seed))
+    visits: Dict[str, int] = {}
+    stuck: List[Tuple[int, str]] = []
+    samples: List[MemSample] = []
+    base = None                                 # tracemalloc snapshot after warm‑up
+    deadline = None if seconds is None else time.perf_counter() + seconds
+    warm_ticks = max(ticks * WARMUP, WARMUP_TICKS) if ticks else WARMUP_TICKS
+    progress, last_change = None, 0
+    t0 = time.perf_counter()
+    tick = 0
+    while ticks is None or tick < ticks:
+        player.act()
+        app.step()
+        tick += 1
+        visits[app.scene] = visits.get(app.scene, 0) + 1
+        state = (app.scene, app.balance, player.rounds)
+        if state != progress:
+            progress, last_change = state, tick
+        elif tick - last_change > STUCK_TICKS:
+            stuck.append((tick, app.scene))
+            player.plan = [player.key("Q")]    # try to get out
+            last_change = tick
+        if tick % sample_every == 0:
+            samples.append(_sample(tick))
+            if trace and base is None and tick > warm_ticks and (
+                    deadline is None or time.perf_counter() - t0 > seconds * WARMUP):
+                base = _snapshot()
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+    seconds_run = time.perf_counter() - t0
+
+    leaked = leaks(samples, trace)
+    top: Tuple[str, ...] = ()
+    if trace:
+        if base is not None:
+            diff = _snapshot().compare_to(base, "lineno")
+            top = tuple(str(d) for d in diff[:TOP_GROWERS] if d.size_diff > 0)
+        tracemalloc.stop()
+    return BotReport(bot, policy.name, seed, tick, seconds_run, player.rounds,
+                     player.restarts, app.balance, visits, tuple(stuck),
+                     tuple(samples), growth(samples), leaked, top)
+
+
+def _run_job(job: tuple) -> BotReport:
+    policy, seed, kwargs = job
+    return run_bot(policy, seed, **kwargs)
+
+
+# ───────────────────────────── many bots ───────────────────────────────
+def run_bots(policies: Sequence[Policy], bots: int = 4, seed: int = 0, *,
+             workers: int | None = None, **kwargs) -> List[BotReport]:
+    """*bots* bots, cycling through *policies*, one process each where possible."""
+    jobs = [(policies[i % len(policies)], seed + i, dict(kwargs, bot=i))
+            for i in range(bots)]
+    workers = workers or os.cpu_count() or 1
+    reports = None
+    if workers > 1 and len(jobs) > 1:
+        try:
+            with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+                reports = list(pool.map(_run_job, jobs))
+        except (OSError, ImportError, NotImplementedError, BrokenProcessPool):
+            reports = None                       # no processes (e.g. web build)
+    if reports is None:
+        reports = [_run_job(job) for job in jobs]
+    return reports
+
+
+def _kib(n: float) -> str:
+    return f"{n / 1024:+,.0f} KiB"
+
+
+def report(r: BotReport) -> str:
+    g, traced = r.growth, bool(r.samples and r.samples[-1].traced)
+    lines = [f"bot {r.bot} {r.policy:<9} seed {r.seed}: {r.ticks:,} ticks in "
+             f"{r.seconds:.0f}s ({r.ticks / max(r.seconds, 1e-9):,.0f}/s)  "
+             f"{r.rounds} rounds  {r.restarts} game overs  balance ${r.balance}",
+             "    per 100k ticks: "
+             + (f"traced {_kib(g['traced'])}  " if traced else "")
+             + f"rss {_kib(g['rss'])}  objects {g['objects']:+,.0f}"
+             + (f"  churn ≤{_kib(max(s.churn for s in r.samples))} / sample" if traced else "")]
+    if r.leaks:
+        lines.append(f"    LEAK: {', '.join(r.leaks)}")
+        lines += [f"      {line}" for line in r.top]
+    for tick, scene in r.stuck:
+        lines.append(f"    STUCK in {scene} at tick {tick:,}")
+    return "\n".join(lines)
+
+
+# ──────────────────────────── script entry ─────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Soak the casino with bot players")
+    parser.add_argument("--bots", type=int, default=4)
+    parser.add_argument("--policy", nargs="+", choices=sorted(POLICIES),
+                        default=sorted(POLICIES))
+    parser.add_argument("--ticks", type=int, default=200_000, help="per bot")
+    parser.add_argument("--minutes", type=float, help="wall time per bot (overrides --ticks)")
+    parser.add_argument("--sample-every", type=int, default=2_000, metavar="TICKS")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--no-trace", action="store_true",
+                        help="skip tracemalloc (faster; RSS and object counts only)")
+    args = parser.parse_args()
+    t0 = time.perf_counter()
+    reports = run_bots([POLICIES[p] for p in args.policy], args.bots, args.seed,
+                       workers=args.workers,
+                       ticks=None if args.minutes else args.ticks,
+                       seconds=args.minutes * 60 if args.minutes else None,
+                       sample_every=args.sample_every, trace=not args.no_trace)
+    for r in reports:
+        print(report(r))
+    bad = [r for r in reports if r.leaks or r.stuck]
+    print(f"{len(reports)} bots, {sum(r.ticks for r in reports):,} ticks in "
+          f"{time.perf_counter() - t0:.0f}s – "
+          f"{'all clean' if not bad else f'{len(bad)} flagged'}")
+    sys.exit(1 if bad else 0)
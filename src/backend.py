@@ -0,0 +1,177 @@
+"""backend.py – pluggable pyxel backend
+
+Every scene talks to pyxel through the `pyxel` proxy exported here:
+
+    from backend import pyxel
+
+By default the proxy forwards to the real pyxel module (imported on first
+use). `use(NullPyxel())` swaps in an in‑process fake with no window, no
+frame cadence and scriptable input, so `CasinoApp` and all sub‑games can be
+stepped headless as fast as the CPU allows:
+
+    null = NullPyxel()
+    use(null)
+    null.tap(null.KEY_RETURN)       # key goes down for the next frame only
+    app.step()                      # update + draw + end_frame
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Set
+
+
+# ───────────────────────── key constants ───────────────────────────────
+def _fallback_keys() -> Dict[str, int]:
+    """SDL keycodes, the same values pyxel exposes (used when it is absent)."""
+    keys = {f"KEY_{c.upper()}": ord(c) for c in "abcdefghijklmnopqrstuvwxyz"}
+    keys.update({f"KEY_{d}": ord(d) for d in "0123456789"})
+    keys.update(KEY_SPACE=32, KEY_RETURN=13, KEY_TAB=9, KEY_BACKSPACE=8,
+                KEY_ESCAPE=27,
+                KEY_RIGHT=0x4000004F, KEY_LEFT=0x40000050,
+                KEY_DOWN=0x40000051, KEY_UP=0x40000052)
+    keys.update({f"KEY_F{i}": 0x40000039 + i for i in range(1, 13)})
+    return keys
+
+
+def _key_constants() -> Dict[str, int]:
+    try:
+        import pyxel as real
+    except ImportError:
+        return _fallback_keys()
+    return {n: getattr(real, n) for n in dir(real) if n.startswith("KEY_")}
+
+
+# ───────────────────────── null backend ────────────────────────────────
+class NullImage:
+    """Stand‑in for `pyxel.Image`: accepts every draw call, stores nothing."""
+
+    def __init__(self, width: int = 256, height: int = 256) -> None:
+        self.width  = width
+        self.height = height
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        return _noop
+
+    def pget(self, x: float, y: float) -> int:
+        return 0
+
+
+def _noop(*args: Any, **kwargs: Any) -> None:
+    return None
+
+
+class NullPyxel:
+    """
+    In‑process pyxel replacement for headless runs.
+
+    Drawing calls are counted and discarded. Keyboard state is driven by
+    `tap` / `hold` / `release` and advanced by `end_frame()`, which the
+    caller invokes once per simulated frame.
+    """
+
+    Image = NullImage
+
+    def __init__(self) -> None:
+        self.__dict__.update(_key_constants())
+        self.width       = 0
+        self.height      = 0
+        self.frame_count = 0
+        self.draw_calls  = 0
+        self.images      = [NullImage() for _ in range(3)]
+        self._down: Set[int] = set()
+        self._pressed: Set[int] = set()
+        self._taps: Set[int] = set()
+
+    # ------------------------------------------------------------ system
+    def init(self, width: int, height: int, **kwargs: Any) -> None:
+        self.width, self.height = width, height
+
+    def run(self, update: Callable[[], None], draw: Callable[[], None]) -> None:
+        raise RuntimeError("NullPyxel has no main loop – step the app instead")
+
+    def quit(self) -> None:
+        pass
+
+    def end_frame(self) -> None:
+        """Close the current frame: edge state rolls over, taps release."""
+        self.frame_count += 1
+        self._pressed.clear()
+        self._down -= self._taps
+        self._taps.clear()
+
+    # ------------------------------------------------------------- input
+    def tap(self, key: int) -> None:
+        self.hold(key)
+        self._taps.add(key)
+
+    def hold(self, key: int) -> None:
+        if key not in self._down:
+            self._pressed.add(key)
+        self._down.add(key)
+        self._taps.discard(key)
+
+    def release(self, key: int) -> None:
+        self._down.discard(key)
+
+    def set_frame(self, down: Set[int], pressed: Set[int]) -> None:
+        """Force this frame's key state (used by replays)."""
+        self._down = set(down)
+        self._pressed = set(pressed)
+        self._taps.clear()
+
+    def btn(self, key: int) -> bool:
+        return key in self._down
+
+    def btnp(self, key: int, hold: int = 0, repeat: int = 0) -> bool:
+        return key in self._pressed
+
+    # ----------------------------------------------------------- drawing
+    def _draw(self, *args: Any, **kwargs: Any) -> None:
+        self.draw_calls += 1
+
+    cls = pset = line = rect = rectb = circ = circb = elli = ellib = _draw
+    tri = trib = fill = blt = bltm = text = _draw
+
+    def pal(self, *args: Any) -> None:
+        pass
+
+    clip = camera = pal
+
+
+# ───────────────────────── proxy ───────────────────────────────────────
+class _Proxy:
+    """
+    Forwards attribute access to the active backend.
+
+    Functions and classes (`blt`, `text`, `Image` …) are bound onto the proxy
+    on first use, so a hot draw path pays one instance‑dict lookup per call,
+    not a `__getattr__` round trip. Plain values (`width`, `frame_count` …)
+    change under the backend and are always read through. `use()` drops
+    the bindings.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(active(), name)
+        if callable(value):
+            self.__dict__[name] = value
+        return value
+
+
+_active: Any = None
+pyxel: Any = _Proxy()
+
+
+def active() -> Any:
+    """The backend in use; the real pyxel module unless `use()` said otherwise."""
+    global _active
+    if _active is None:
+        import pyxel as real
+        _active = real
+    return _active
+
+
+def use(impl: Any) -> Any:
+    """Route every `backend.pyxel` call to *impl*; returns it for chaining."""
+    global _active
+    _active = impl
+    pyxel.__dict__.clear()
+    return impl
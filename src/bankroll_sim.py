@@ -0,0 +1,295 @@
+"""bankroll_sim.py – vectorised risk‑of‑ruin simulator for all three games
+
+The app sends the player to `game_over` once the balance reaches 0,
+starting from `STARTING_BALANCE`. This module plays many bankrolls side by
+side as NumPy arrays to see how long that takes under a given table and
+staking policy, and how high the balance gets on the way.
+
+Each game is reduced to its per‑round return distribution (`Game`: stake
+× return multiple, with probabilities), taken from the same tables the
+scenes use:
+
+• roulette – the pocket masks and `PAYOUT_MULT` via `roulette_odds`;
+• blackjack – W/P/L frequencies of the vectorised `blackjack_sim` engine
+  under a hit policy;
+• horse racing – the shipped `horse_odds.GAME_CALIBRATION`: its
+  multipliers and the win probabilities it measured for them.
+
+Winnings are floored to whole dollars the way the scenes pay them
+(`horse_odds.payout`), after rounding off float error in stake × multiple.
+
+A round is one vector step over the bankrolls still alive: the staking
+policy picks every stake at once, one uniform per bankroll picks the
+outcome, ruined bankrolls drop out of the working set. Flat stakes – the
+game's own `BET_INCREMENT` betting – skip even that: while the balance
+covers the stake, a block of rounds is a single cumulative sum.
+
+    python bankroll_sim.py             # sweep start balance × stake per game
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from common import (BET_INCREMENT, HORSE_FINISH, HORSE_TARGET_RTP, HORSE_WEIGHTS,
+                    ROULETTE_LAYOUT, STARTING_BALANCE)
+
+DEFAULT_BANKROLLS = 200_000
+DEFAULT_ROUNDS    = 1_000
+BLOCK             = 64          # rounds per cumulative sum (flat staking)
+
+# (balance, last stake, last net) → next stake, for every live bankroll
+Staking = Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+
+# ─────────────────────────────── games ─────────────────────────────────
+@dataclass(frozen=True)
+class Game:
+    name: str
+    returns: Tuple[float, ...]     # stake * return = paid back (stake included)
+    probs: Tuple[float, ...]
+
+    @property
+    def house_edge(self) -> float:
+        return 1.0 - float(np.dot(self.returns, self.probs))
+
+
+def roulette_game(bet_type=None, selection: int = 0, layout=None) -> Game:
+    """One unit bet of *bet_type* (default red) on the configured wheel."""
+    from roulette_odds import spin_distribution
+    from roulette_table import LAYOUTS, BetBoard, BetType
+    bet_type = bet_type or BetType.COLOR
+    board = BetBoard(layout or LAYOUTS[ROULETTE_LAYOUT])
+    board.place(bet_type, selection, 1)
+    lo, step, pmf = spin_distribution(board)
+    nz = np.flatnonzero(pmf)
+    return Game(f"roulette {bet_type.name.lower()}",
+                tuple(float(1 + lo + step * i) for i in nz), tuple(pmf[nz].tolist()))
+
+
+def blackjack_game(policy=None, hands: int = 500_000, seed: int = 0) -> Game:
+    """Loss / push / win frequencies of *hands* simulated hands under *policy*."""
+    from blackjack_rules import PUSH_PAYOUT, WIN_PAYOUT
+    from blackjack_sim import simulate
+    res = simulate(hands, policy, seed=seed)
+    return Game("blackjack", (0.0, float(PUSH_PAYOUT), float(WIN_PAYOUT)),
+                (res.losses / hands, res.pushes / hands, res.wins / hands))
+
+
+def horse_game(horse: int = 0) -> Game:
+    """A bet on horse *horse* (0 = favourite) at the shipped payouts."""
+    from horse_odds import game_calibration
+    cal = game_calibration(HORSE_WEIGHTS, HORSE_FINISH, HORSE_TARGET_RTP)
+    p = cal.win_prob[horse]
+    return Game(f"horse {horse + 1}", (0.0, cal.multipliers[horse]), (1.0 - p, p))
+
+
+# ───────────────────────────── staking ─────────────────────────────────
+def flat(stake: int = BET_INCREMENT) -> Staking:
+    """The same stake every round."""
+    def staking(balance: np.ndarray, last: np.ndarray, net: np.ndarray) -> np.ndarray:
+        return np.full_like(balance, stake)
+    staking.stake = stake                 # lets `simulate` take the block path
+    return staking
+
+
+def proportional(fraction: float, step: int = BET_INCREMENT) -> Staking:
+    """*fraction* of the balance, in whole `step`s, at least one step."""
+    def staking(balance: np.ndarray, last: np.ndarray, net: np.ndarray) -> np.ndarray:
+        return np.maximum(step, (balance * fraction).astype(np.int64) // step * step)
+    return staking
+
+
+def martingale(base: int = BET_INCREMENT) -> Staking:
+    """Double the stake after a loss, back to *base* after anything else."""
+    def staking(balance: np.ndarray, last: np.ndarray, net: np.ndarray) -> np.ndarray:
+        return np.where(net < 0, last * 2, base)
+    return staking
+
+
+# ───────────────────────────── simulation ──────────────────────────────
+@dataclass(frozen=True)
+class RuinResult:
+    """Per‑bankroll arrays of one `simulate` call."""
+
+    game: str
+    start: int
+    rounds: int                # horizon
+    ruin_round: np.ndarray     # int32, round the balance hit 0 (-1 = never)
+    peak: np.ndarray           # int64, highest balance seen
+    final: np.ndarray          # int64, balance after the horizon (0 if ruined)
+
+    @property
+    def p_ruin(self) -> float:
+        """Share of bankrolls ruined within the horizon."""
+        return float(np.count_nonzero(self.ruin_round >= 0)) / self.ruin_round.size
+
+    def ruin_quantile(self, q: float) -> int | None:
+        """Round by which a share *q* of bankrolls is ruined (None: beyond the horizon)."""
+        t = np.where(self.ruin_round >= 0, self.ruin_round, self.rounds + 1)
+        r = int(np.quantile(t, q, method="inverted_cdf"))
+        return r if r <= self.rounds else None
+
+    def survival(self) -> np.ndarray:
+        """Share of bankrolls still alive after each round 0 … rounds."""
+        ruined = np.bincount(self.ruin_round[self.ruin_round >= 0],
+                             minlength=self.rounds + 1)
+        return 1.0 - np.cumsum(ruined) / self.ruin_round.size
+
+
+class _Chunk:
+    """Result arrays of one chunk plus its working set of live bankrolls."""
+
+    def __init__(self, n: int, start: int) -> None:
+        self.ruin_round = np.full(n, -1, dtype=np.int32)
+        self.peak  = np.full(n, start, dtype=np.int64)
+        self.final = np.zeros(n, dtype=np.int64)
+        self.ids   = np.arange(n)
+        self.bal   = np.full(n, start, dtype=np.int64)
+        self.top   = self.bal.copy()
+        self.clock = np.zeros(n, dtype=np.int32)    # rounds played so far
+
+    def keep(self, live: np.ndarray) -> None:
+        self.ids, self.bal = self.ids[live], self.bal[live]
+        self.top, self.clock = self.top[live], self.clock[live]
+
+    def retire(self, rows: np.ndarray) -> None:
+        """Record *rows* (a mask of the working set) that are ruined or done."""
+        ids = self.ids[rows]
+        self.peak[ids] = self.top[rows]
+        ruined = self.bal[rows] <= 0
+        self.ruin_round[ids[ruined]] = self.clock[rows][ruined]
+        self.final[ids] = np.maximum(self.bal[rows], 0)
+        self.keep(~rows)
+
+
+def _outcomes(game: Game, rng: np.random.Generator, shape: Tuple[int, ...]) -> np.ndarray:
+    """Outcome index (into `game.returns`) of every round in *shape*."""
+    cuts = np.cumsum(game.probs, dtype=np.float32)[:-1]
+    if not cuts.size:
+        return np.zeros(shape, dtype=np.uint8)
+    u = rng.random(shape, dtype=np.float32)
+    k = (u >= cuts[0]).view(np.uint8)
+    for c in cuts[1:]:
+        k += u >= c
+    return k
+
+
+def _paid(stake, returns: np.ndarray) -> np.ndarray:
+    """Whole dollars paid back, floored like `horse_odds.payout`."""
+    return np.floor(np.round(stake * returns, 6))
+
+
+def _flat_blocks(ch: _Chunk, game: Game, stake: int, rounds: int,
+                 rng: np.random.Generator) -> None:
+    """
+    Flat staking: while a balance covers the stake every round nets a
+    fixed amount, so `BLOCK` rounds are one cumulative sum. Bankrolls
+    that drop below the stake (the scenes would clamp it) are left to
+    the round‑by‑round loop.
+    """
+    gain = _paid(stake, np.array(game.returns)) - stake
+    fits = ch.bal.max(initial=0) + rounds * gain.max() < np.iinfo(np.int32).max
+    gain = gain.astype(np.int32 if fits else np.int64)
+    covered = ch.bal >= stake
+    done = 0
+    while done < rounds and covered.any():
+        width = min(BLOCK, rounds - done)
+        rows = np.flatnonzero(covered)
+        path = gain.take(_outcomes(game, rng, (rows.size, width)))
+        np.cumsum(path, axis=1, out=path)
+        path += ch.bal[rows, None].astype(path.dtype)
+        top = path.max(axis=1)
+        first = np.full(rows.size, width - 1)
+        dips = path.min(axis=1) < stake
+        if dips.any():
+            sub = path[dips]
+            first[dips] = f = (sub < stake).argmax(axis=1)
+            top[dips] = np.where(np.arange(width) <= f[:, None], sub, 0).max(axis=1)
+            covered[rows[dips]] = False
+        ch.top[rows] = np.maximum(ch.top[rows], top)
+        ch.bal[rows] = path[np.arange(rows.size), first]
+        ch.clock[rows] += first.astype(np.int32) + 1
+        done += width
+    ch.retire((ch.bal <= 0) | (ch.clock >= rounds))
+
+
+def _step(ch: _Chunk, game: Game, staking: Staking, rounds: int,
+          rng: np.random.Generator) -> None:
+    """Any staking policy: one round per iteration for every live bankroll."""
+    returns = np.array(game.returns)
+    last = np.zeros(ch.ids.size, dtype=np.int64)
+    net = np.zeros(ch.ids.size, dtype=np.int64)
+    while ch.ids.size:
+        last = np.clip(staking(ch.bal, last, net), 1, ch.bal)
+        net = _paid(last, returns[_outcomes(game, rng, (ch.ids.size,))]
+                    ).astype(np.int64) - last
+        ch.bal += net
+        np.maximum(ch.top, ch.bal, out=ch.top)
+        ch.clock += 1
+        out = (ch.bal <= 0) | (ch.clock >= rounds)
+        if out.any():
+            live = ~out
+            last, net = last[live], net[live]
+            ch.retire(out)
+
+
+def simulate(game: Game, *, start: int = STARTING_BALANCE,
+             staking: Staking | None = None, bankrolls: int = DEFAULT_BANKROLLS,
+             rounds: int = DEFAULT_ROUNDS, seed: int | None = None,
+             chunk_size: int = 1 << 15) -> RuinResult:
+    """Play *bankrolls* independent sessions of up to *rounds* rounds each.
+
+    Stakes are clamped to the balance like the scenes do; a bankroll is
+    ruined when its balance reaches 0. Bankrolls are processed
+    *chunk_size* at a time to keep memory bounded.
+    """
+    staking = staking or flat()
+    stake = getattr(staking, "stake", None)
+    rng = np.random.default_rng(seed)
+    parts = []
+    for lo in range(0, bankrolls, chunk_size):
+        ch = _Chunk(min(chunk_size, bankrolls - lo), start)
+        if stake is not None:
+            _flat_blocks(ch, game, stake, rounds, rng)
+        _step(ch, game, staking, rounds, rng)
+        parts.append(ch)
+    return RuinResult(game.name, start, rounds,
+                      np.concatenate([c.ruin_round for c in parts]),
+                      np.concatenate([c.peak for c in parts]),
+                      np.concatenate([c.final for c in parts]))
+
+
+# ──────────────────────────── script entry ─────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bankroll risk-of-ruin sweep")
+    parser.add_argument("--bankrolls", type=int, default=DEFAULT_BANKROLLS)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    args = parser.parse_args()
+    games = [roulette_game(), blackjack_game(), horse_game()]
+    starts = (STARTING_BALANCE // 2, STARTING_BALANCE, STARTING_BALANCE * 2)
+    stakes: Dict[str, Staking] = {f"flat {BET_INCREMENT}": flat(),
+                                  f"flat {BET_INCREMENT * 5}": flat(BET_INCREMENT * 5),
+                                  "10 %": proportional(0.10),
+                                  "martingale": martingale()}
+    print(f"{args.bankrolls:,} bankrolls × {args.rounds:,} rounds")
+    for game in games:
+        print(f"\n{game.name}  (house edge {game.house_edge * 100:.2f} %)")
+        print(f"  {'start':>6} {'staking':<11} {'P(ruin)':>8} {'25%':>6} "
+              f"{'median':>7} {'peak p50':>9} {'peak p95':>9}")
+        for start in starts:
+            for label, staking in stakes.items():
+                t0 = time.perf_counter()
+                res = simulate(game, start=start, staking=staking,
+                               bankrolls=args.bankrolls, rounds=args.rounds, seed=0)
+                dt = time.perf_counter() - t0
+                q25, q50 = res.ruin_quantile(0.25), res.ruin_quantile(0.5)
+                print(f"  {start:>6} {label:<11} {res.p_ruin:8.3f} "
+                      f"{q25 if q25 is not None else '-':>6} "
+                      f"{q50 if q50 is not None else '-':>7} "
+                      f"{np.median(res.peak):>9.0f} {np.quantile(res.peak, 0.95):>9.0f}"
+                      f"   ({dt:.2f}s)")
@@ -10,39 +10,36 @@ This file fully replaces the previous version.
 
 from __future__ import annotations
 
-import random
-from typing import List, Tuple
-
-import pyxel
-
-from common import BET_INCREMENT, draw_text_center
-
-# ────────────────────────────── constants ──────────────────────────────
-RANK_STR = {1: "A", 11: "J", 12: "Q", 13: "K"}
-SUIT_STR = {0: "♠", 1: "♥", 2: "♦", 3: "♣"}  # will display as simple letters on Pyxel
-
-Card = Tuple[int, int]  # (rank 1‑13, suit 0‑3)
-
-
-# ────────────────────────────── helpers ────────────────────────────────
-
-def card_str(card: Card) -> str:
-    """Human‑friendly one‑character rank + optional suit."""
-    rank, suit = card
-    rank_s = RANK_STR.get(rank, str(rank))
-    suit_s = SUIT_STR.get(suit, "S")
-    # Pyxel’s default font is narrow – we drop suit to save space if needed
-    return f"{rank_s}{suit_s}"
-
-
-def hand_value(hand: List[Card]) -> int:
-    """Return blackjack value, treating aces as 11 or 1 as appropriate."""
-    total = sum(10 if r > 10 else 11 if r == 1 else r for r, _ in hand)
-    aces = sum(1 for r, _ in hand if r == 1)
-    while total > 21 and aces:
-        total -= 10
-        aces -= 1
-    return total
+from typing import NamedTuple, Tuple
+
+from backend import pyxel
+
+from blackjack_rules import (
+    DEALER_STANDS_ON,
+    PUSH_PAYOUT,
+    WIN_PAYOUT,
+    Card,
+    Hand,
+    Shoe,
+    ShoeState,
+    hand_value,
+    payout_multiple,
+)
+from blackjack_tables import action_ev, hint
+from card_sprites import CARD_H, CardAtlas
+from common import BET_INCREMENT, draw_text, draw_text_center
+
+
+class BlackjackState(NamedTuple):
+    bet: int
+    stage: str
+    player: Tuple[Card, ...]
+    dealer: Tuple[Card, ...]
+    outcome: str
+    player_stand: bool
+    hint: str
+    ev: Tuple[float, float] | None
+    shoe: ShoeState
 
 
 # ────────────────────────────── main class ─────────────────────────────
@@ -51,24 +48,53 @@ class BlackjackGame:
 
     def __init__(self, app) -> None:
         self.app = app  # backlink to CasinoApp for balance & input helpers
+        self.shoe = Shoe(rng=app.rngs["blackjack"])  # persists until the cut card
+        self.cards = CardAtlas()                      # all 52 faces + the back
+        self.stage = "bet"
         self.reset()
 
     # ───────────────────────── public lifecycle ────────────────────────
     def reset(self) -> None:
         """Return to bet selection screen."""
+        if self.stage == "play" and not self.player_stand:
+            self.shoe.reveal(self.dealer[1])    # hand abandoned: count its hole card
         self.bet: int = BET_INCREMENT
         self.stage: str = "bet"  # bet | play | result
-        self.deck: List[Card] = []
-        self.player: List[Card] = []
-        self.dealer: List[Card] = []
+        self.player: Hand = Hand()
+        self.dealer: Hand = Hand()
         self.outcome: str = ""
         self.player_stand: bool = False
+        self.hint: str = ""      # basic-strategy advice, shown until the next move
+        self.ev: Tuple[float, float] | None = None   # (stand, hit) while deciding
+        self._ev_job = None      # `action_ev_steps` still running for this hand
         self.app.input.reset()
 
     start_new = reset  # alias expected by main menu
 
+    def snapshot(self) -> BlackjackState:
+        return BlackjackState(self.bet, self.stage, tuple(self.player),
+                              tuple(self.dealer), self.outcome, self.player_stand,
+                              self.hint, self.ev, self.shoe.snapshot())
+
+    def restore(self, state: BlackjackState) -> None:
+        self.bet, self.stage = state.bet, state.stage
+        self.player, self.dealer = Hand(state.player), Hand(state.dealer)
+        self.outcome, self.player_stand = state.outcome, state.player_stand
+        self.hint, self.ev = state.hint, state.ev
+        self.shoe.restore(state.shoe)
+        self._ev_job = None
+        if self.stage == "play" and not self.player_stand and self.ev is None:
+            self._start_ev()                    # was still being computed
+
+    @property
+    def animating(self) -> bool:
+        """Dealer drawing after a stand, or EVs still being computed."""
+        return self.stage == "play" and (self.player_stand or self._ev_job is not None)
+
     # ───────────────────────── update entrypoint ───────────────────────
     def update(self) -> None:
+        if self._ev_job is not None:
+            self._step_ev()
         if self.stage == "bet":
             self._update_bet()
         elif self.stage == "play":
@@ -91,70 +117,94 @@ class BlackjackGame:
         if ih.accelerated_press(pyxel.KEY_DOWN) and self.bet - BET_INCREMENT >= BET_INCREMENT:
             self.bet -= BET_INCREMENT
 
-        if pyxel.btnp(pyxel.KEY_SPACE) or pyxel.btnp(pyxel.KEY_RETURN):
+        if ih.btnp(pyxel.KEY_SPACE, pyxel.KEY_RETURN):
             self._deal_cards()
-        if pyxel.btnp(pyxel.KEY_Q):
+        if ih.btnp(pyxel.KEY_Q):
             self.app.to_menu()
 
     def _deal_cards(self) -> None:
-        self.deck = [(r, s) for r in range(1, 14) for s in range(4)]
-        random.shuffle(self.deck)
+        shoe = self.shoe
+        shoe.new_round()                    # the cut card shuffles here
 
-        self.player = [self.deck.pop(), self.deck.pop()]
-        self.dealer = [self.deck.pop(), self.deck.pop()]
+        self.player = Hand((shoe.deal(), shoe.deal()))
+        self.dealer = Hand((shoe.deal(), shoe.deal(visible=False)))  # hole card
 
         self.bet = min(self.bet, self.app.balance)  # final clamp
-        self.app.balance -= self.bet
+        self.app.ledger.bet("Blackjack", self.bet)
 
         self.player_stand = False
         self.outcome = ""
         self.stage = "play"
+        self._start_ev()
         self.app.input.reset()
 
+    def _start_ev(self) -> None:
+        """Exact EVs for the new hand: a shipped‑table lookup, else computed
+        one slice per tick (`blackjack_exact.SLICE_BUDGET_MS`) from the next one."""
+        self.ev = action_ev(self.player, self.dealer[0], self.shoe.decks)
+        self._ev_job = None
+        if self.ev is None:
+            from blackjack_exact import action_ev_steps, prepare   # NumPy – no table
+            prepare()
+            self._ev_job = action_ev_steps(self.player, self.dealer[0], self.shoe.decks)
+
+    def _step_ev(self) -> None:
+        ev = next(self._ev_job)
+        if ev is not None:
+            self.ev, self._ev_job = ev, None
+
     # ───────────────────────── play phase ──────────────────────────────
     def _update_play(self) -> None:
+        ih = self.app.input
         if not self.player_stand:
-            if pyxel.btnp(pyxel.KEY_H):
-                self.player.append(self.deck.pop())
-                if hand_value(self.player) > 21:
+            if ih.btnp(pyxel.KEY_I):
+                self.hint = hint(self.player, self.dealer[0])
+            if ih.btnp(pyxel.KEY_H):
+                self.hint = ""
+                self.player.append(self.shoe.deal())
+                if self.player.value > 21:
+                    self.shoe.reveal(self.dealer[1])
                     self._settle("Bust! Dealer wins.")
-            if pyxel.btnp(pyxel.KEY_S):
+                else:
+                    self._start_ev()
+            if ih.btnp(pyxel.KEY_S) and self.stage == "play":
+                self.hint = ""
+                self.ev = self._ev_job = None
                 self.player_stand = True
+                self.shoe.reveal(self.dealer[1])
         else:
-            if hand_value(self.dealer) < 17:
-                self.dealer.append(self.deck.pop())
+            if self.dealer.value < DEALER_STANDS_ON:
+                self.dealer.append(self.shoe.deal())
             else:
                 self._evaluate_winner()
 
-        if pyxel.btnp(pyxel.KEY_Q):
+        if ih.btnp(pyxel.KEY_Q):
             self.app.to_menu()
 
     def _evaluate_winner(self) -> None:
-        p, d = hand_value(self.player), hand_value(self.dealer)
-        if d > 21 or p > d:
-            self._settle("Player wins!", payout=2)
-        elif p == d:
-            self._settle("Push – bet returned.", payout=1)
-        else:
-            self._settle("Dealer wins.")
+        payout = payout_multiple(self.player.value, self.dealer.value)
+        message = {WIN_PAYOUT: "Player wins!",
+                   PUSH_PAYOUT: "Push – bet returned."}.get(payout, "Dealer wins.")
+        self._settle(message, payout=payout)
 
     def _settle(self, message: str, *, payout: int = 0) -> None:
-        if payout:
-            self.app.balance += self.bet * payout
+        self.app.ledger.payout("Blackjack", self.bet * payout)
         self.outcome = message
+        self.ev = self._ev_job = None
         self.stage = "result"
 
     # ───────────────────────── result phase ─────────────────────────────
     def _update_result(self) -> None:
-        if pyxel.btnp(pyxel.KEY_RETURN):
+        ih = self.app.input
+        if ih.btnp(pyxel.KEY_RETURN):
             self.reset()
-        if pyxel.btnp(pyxel.KEY_Q):
+        if ih.btnp(pyxel.KEY_Q):
             self.app.to_menu()
 
     # ─────────────────────────── drawing ───────────────────────────────
     def _draw_bet(self) -> None:
         draw_text_center("Blackjack – place your bet", 40, 7)
-        draw_text_center(f"Bet: ${self.bet}", 70, 11)
+        draw_text_center("Bet: ${}", 70, 11, self.bet)
         draw_text_center("↑ ↓ change  •  Space/Enter deal  •  Q menu", 200, 5)
 
     def _draw_table(self) -> None:
@@ -164,27 +214,30 @@ class BlackjackGame:
 
         # dealer hand (hide hole card until player stands/busts)
         if self.stage == "play" and not self.player_stand and not self.outcome:
-            dealer_cards = f"{card_str(self.dealer[0])} ??"
-            dealer_val = "?"
+            draw_text(10, y, "Dealer: ?", 7)
+            self.cards.draw_hand(10, y + 10, self.dealer, hidden=1)
         else:
-            dealer_cards = " ".join(card_str(c) for c in self.dealer)
-            dealer_val = str(hand_value(self.dealer))
-
-        pyxel.text(10, y, f"Dealer: {dealer_val}", 7)
-        pyxel.text(10, y + 10, dealer_cards, 7)
+            draw_text(10, y, "Dealer: {}", 7, self.dealer.value)
+            self.cards.draw_hand(10, y + 10, self.dealer)
 
         # player hand
-        y += 30
-        pyxel.text(10, y, f"Player: {hand_value(self.player)}", 7)
-        pyxel.text(10, y + 10, " ".join(card_str(c) for c in self.player), 7)
+        y += CARD_H + 20
+        draw_text(10, y, "Player: {}", 7, self.player.value)
+        self.cards.draw_hand(10, y + 10, self.player)
 
         # bet amount
-        y += 30
-        pyxel.text(10, y, f"Bet: ${self.bet}", 7)
+        y += CARD_H + 20
+        draw_text(10, y, "Bet: ${}", 7, self.bet)
+        if self.ev is not None:
+            draw_text(10, y + 15, "EV  stand {:+.3f}   hit {:+.3f}", 6, *self.ev)
+        elif self._ev_job is not None:
+            draw_text(10, y + 15, "EV  …", 5)
 
         # footer
         if self.stage == "result":
             draw_text_center(self.outcome, 200, 11)
             draw_text_center("Enter = new bet  •  Q = menu", 214, 5)
         else:
-            pyxel.text(10, 200, "H = Hit   S = Stand   Q = Quit", 5)
+            if self.hint:
+                draw_text_center("Basic strategy: {}", 186, 10, self.hint)
+            draw_text(10, 200, "H = Hit   S = Stand   I = Hint   Q = Quit", 5)
@@ -0,0 +1,281 @@
+"""blackjack_rules.py – pyxel‑free blackjack rules
+--------------------------------------------------
+• Card helpers (`card_str`, `hand_value`) shared by the pyxel scene and any
+  headless tooling – importing this module never touches pyxel.
+• Table rules as plain constants so the scene and the simulators cannot
+  drift apart: dealer draws below 17, a win pays 2× the stake, a push 1×.
+• `Hand` keeps a running hard total + ace flag, so reading its value every
+  frame is O(1) instead of re‑walking the cards.
+• `Shoe` is a persistent N‑deck shoe stored as one byte per card and only
+  reshuffled between rounds, once the cut card is reached; it keeps a
+  Hi‑Lo running count as cards are dealt. `snapshot()` copies the card
+  order once per shuffle; every later snapshot shares those bytes.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Iterable, List, NamedTuple, Tuple
+
+# ────────────────────────────── constants ──────────────────────────────
+RANK_STR = {1: "A", 11: "J", 12: "Q", 13: "K"}
+SUIT_STR = {0: "♠", 1: "♥", 2: "♦", 3: "♣"}  # will display as simple letters on Pyxel
+
+DEALER_STANDS_ON = 17   # dealer hits while the hand is below this
+WIN_PAYOUT       = 2    # stake * payout = return (includes original stake)
+                        # → house edge 4.59 % at 6 decks, perfect play (blackjack_exact.py)
+PUSH_PAYOUT      = 1
+
+# rank 1‑13 → hard value (ace counted as 1); index 0 unused
+RANK_VALUE = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+
+DEFAULT_DECKS       = 6      # decks in the table shoe
+DEFAULT_PENETRATION = 0.75   # fraction of the shoe dealt before the cut card
+
+Card = Tuple[int, int]  # (rank 1‑13, suit 0‑3)
+
+
+class Rules(NamedTuple):
+    """A table rule set – what solvers and calculators are keyed by."""
+    stands_on: int = DEALER_STANDS_ON   # dealer draws below this
+    win: int = WIN_PAYOUT               # stake * win = return on a win
+    push: int = PUSH_PAYOUT
+
+
+# compact card code 0‑51 = (rank - 1) * 4 + suit  →  Card tuple
+CARD_OF_CODE: Tuple[Card, ...] = tuple((c // 4 + 1, c % 4) for c in range(52))
+
+# Hi‑Lo tag per card code: 2‑6 → +1, 7‑9 → 0, tens and aces → −1
+HILO_OF_CODE: Tuple[int, ...] = tuple(
+    1 if 2 <= r <= 6 else -1 if r == 1 or r >= 10 else 0 for r, _ in CARD_OF_CODE
+)
+
+
+# ────────────────────────────── helpers ────────────────────────────────
+
+def card_str(card: Card) -> str:
+    """Human‑friendly one‑character rank + optional suit."""
+    rank, suit = card
+    rank_s = RANK_STR.get(rank, str(rank))
+    suit_s = SUIT_STR.get(suit, "S")
+    # Pyxel’s default font is narrow – we drop suit to save space if needed
+    return f"{rank_s}{suit_s}"
+
+
+def _best_total(hard: int, has_ace: bool) -> int:
+    """At most one ace can ever count as 11 without busting."""
+    return hard + 10 if has_ace and hard <= 11 else hard
+
+
+def hand_value(hand: List[Card]) -> int:
+    """Return blackjack value, treating aces as 11 or 1 as appropriate."""
+    if isinstance(hand, Hand):
+        return hand.value
+    hard = 0
+    has_ace = False
+    for r, _ in hand:
+        hard += RANK_VALUE[r]
+        has_ace = has_ace or r == 1
+    return _best_total(hard, has_ace)
+
+
+def payout_multiple(player: int, dealer: int) -> int:
+    """Return multiple (0 / PUSH_PAYOUT / WIN_PAYOUT) for two final totals."""
+    if player > 21:
+        return 0
+    if dealer > 21 or player > dealer:
+        return WIN_PAYOUT
+    return PUSH_PAYOUT if player == dealer else 0
+
+
+# ────────────────────────────── hand ───────────────────────────────────
+class Hand(list):
+    """
+    A list of cards that tracks its own total as cards are added.
+
+    Hands only ever grow during a round, so `append`/`extend`/`+=` update
+    the running hard total and ace flag; `value` and `soft` are then O(1).
+    Every other mutation recounts the cards, so the totals are never stale.
+    """
+
+    __slots__ = ("hard", "has_ace")
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        super().__init__()
+        self.hard = 0
+        self.has_ace = False
+        self.extend(cards)
+
+    def _recount(self) -> None:
+        self.hard = sum(RANK_VALUE[r] for r, _ in self)
+        self.has_ace = any(r == 1 for r, _ in self)
+
+    def append(self, card: Card) -> None:
+        super().append(card)
+        rank = card[0]
+        self.hard += RANK_VALUE[rank]
+        if rank == 1:
+            self.has_ace = True
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        for card in cards:
+            self.append(card)
+
+    def __iadd__(self, cards: Iterable[Card]) -> Hand:
+        self.extend(cards)
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self.hard = 0
+        self.has_ace = False
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._recount()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._recount()
+
+    def __imul__(self, n: int) -> Hand:
+        super().__imul__(n)
+        self._recount()
+        return self
+
+    def insert(self, index: int, card: Card) -> None:
+        super().insert(index, card)
+        self._recount()
+
+    def pop(self, index: int = -1) -> Card:
+        card = super().pop(index)
+        self._recount()
+        return card
+
+    def remove(self, card: Card) -> None:
+        super().remove(card)
+        self._recount()
+
+    @property
+    def value(self) -> int:
+        return _best_total(self.hard, self.has_ace)
+
+    @property
+    def soft(self) -> bool:
+        """True while an ace is being counted as 11."""
+        return self.has_ace and self.hard <= 11
+
+
+# ────────────────────────────── shoe ───────────────────────────────────
+class ShoeState(NamedTuple):
+    order: bytes            # card codes, shared between snapshots
+    pos: int
+    running_count: int
+    round_start: int = 0    # first card of the round on the table
+    round_count: int = 0    # running count when that round began
+
+
+class Shoe:
+    """
+    Persistent multi‑deck shoe with a cut card.
+
+    Cards live in a `bytearray` (one byte per card, see `CARD_OF_CODE`) that
+    is shuffled in place only by `shuffle()`. Dealing just advances an index,
+    so a hand allocates nothing. The running count is updated on every
+    visible card, which makes `running_count`/`true_count` O(1) reads.
+
+    Call `new_round()` before each round's first card: that is where the
+    cut card triggers a shuffle. Should a round still empty the shoe, only
+    the discards of earlier rounds are shuffled back in – the cards on the
+    table stay out and the count carries on.
+    """
+
+    def __init__(self, decks: int = DEFAULT_DECKS,
+                 penetration: float = DEFAULT_PENETRATION,
+                 rng: random.Random | None = None) -> None:
+        if decks < 1:
+            raise ValueError("a shoe needs at least one deck")
+        if not 0.0 < penetration <= 1.0:
+            raise ValueError("penetration must be in (0, 1]")
+        self.decks = decks
+        self.rng = rng or random.Random()
+        self._cards = bytearray(range(52)) * decks
+        self._order: bytes | None = None       # frozen copy for snapshots
+        self.cut = int(len(self._cards) * penetration)
+        self.shuffle()
+        self._round = self._round_count = 0
+
+    # ---------------------------------------------------------- state ----
+    def shuffle(self) -> None:
+        """Shuffle every card back into the shoe and reset the count."""
+        self.rng.shuffle(self._cards)
+        self._order = None
+        self.pos = 0
+        self.running_count = 0
+
+    def new_round(self) -> None:
+        """Shuffle if the cut card is out, then start a round at `pos`."""
+        if self.needs_shuffle:
+            self.shuffle()
+        self._round, self._round_count = self.pos, self.running_count
+
+    def snapshot(self) -> ShoeState:
+        """The card order is only copied once per shuffle and then shared."""
+        if self._order is None:
+            self._order = bytes(self._cards)
+        return ShoeState(self._order, self.pos, self.running_count,
+                         self._round, self._round_count)
+
+    def restore(self, state: ShoeState) -> None:
+        if state.order is not self._order:
+            self._cards[:] = state.order
+            self._order = state.order
+        self.pos = state.pos
+        self.running_count = state.running_count
+        self._round, self._round_count = state.round_start, state.round_count
+
+    @property
+    def needs_shuffle(self) -> bool:
+        """True once the cut card has come out (checked by `new_round`)."""
+        return self.pos >= self.cut
+
+    @property
+    def remaining(self) -> int:
+        return len(self._cards) - self.pos
+
+    @property
+    def true_count(self) -> float:
+        """Running count per deck still in the shoe."""
+        return self.running_count * 52 / max(self.remaining, 1)
+
+    # ---------------------------------------------------------- deal -----
+    def deal(self, visible: bool = True) -> Card:
+        """Take the next card; hidden cards are counted by `reveal()`."""
+        if self.pos >= len(self._cards):        # ran dry mid‑round
+            self._reshuffle_discards()
+        code = self._cards[self.pos]
+        self.pos += 1
+        if visible:
+            self.running_count += HILO_OF_CODE[code]
+        return CARD_OF_CODE[code]
+
+    def reveal(self, card: Card) -> None:
+        """Count a card that was dealt face down."""
+        rank, suit = card
+        self.running_count += HILO_OF_CODE[(rank - 1) * 4 + suit]
+
+    def _reshuffle_discards(self) -> None:
+        """
+        Shuffle the earlier rounds' cards back in behind this round's. The
+        count keeps only this round's visible cards: every discard is unseen
+        again, and the cards of a full shoe sum to zero.
+        """
+        if not self._round:
+            raise RuntimeError("one round used up the whole shoe")
+        discards = self._cards[:self._round]
+        self.rng.shuffle(discards)
+        self._cards[:] = self._cards[self._round:] + discards
+        self._order = None
+        self.pos -= self._round
+        self.running_count -= self._round_count
+        self._round = self._round_count = 0
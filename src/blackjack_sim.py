@@ -0,0 +1,206 @@
+"""blackjack_sim.py – headless, vectorised blackjack engine
+-----------------------------------------------------------
+Plays whole batches of hands at once with NumPy, using exactly the table
+rules of `BlackjackGame`:
+
+• every hand is dealt from a freshly shuffled shoe of `decks` decks
+  (`_deal_cards`; the cut‑card history of the real `Shoe` is ignored);
+• the player draws while the policy says "hit" and loses straight away on a
+  bust;
+• the dealer draws below `DEALER_STANDS_ON` (`_update_play`);
+• dealer bust or higher total wins `WIN_PAYOUT`, equal totals push
+  (`_evaluate_winner`).
+
+Nothing here imports pyxel, so house‑edge or payout changes can be checked
+from a plain Python shell:
+
+    >>> from blackjack_sim import simulate, threshold_policy
+    >>> simulate(1_000_000, threshold_policy(15), seed=1).house_edge
+
+Cards are encoded as a single uint8 `(rank - 1) * 4 + suit` (same code as
+`Shoe`), so a shoe is one row of a `(hands, 52 * decks)` array and a draw is a
+partial Fisher–Yates step.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from blackjack_rules import (
+    DEALER_STANDS_ON,
+    DEFAULT_DECKS,
+    PUSH_PAYOUT,
+    RANK_VALUE,
+    WIN_PAYOUT,
+)
+
+# ────────────────────────────── constants ──────────────────────────────
+# code >> 2 → rank index 0‑12 → value with the ace counted as 1
+RANK_VALUE_NP = np.array(RANK_VALUE[1:], dtype=np.int16)
+
+LOSS, PUSH, WIN = -1, 0, 1
+
+# (player_total, player_soft, dealer_upcard 1‑10) → True where the player hits
+Policy = Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+
+# ────────────────────────────── policies ───────────────────────────────
+def threshold_policy(stand_on: int = DEALER_STANDS_ON) -> Policy:
+    """Hit below *stand_on*, ignoring the dealer card (mimics the dealer)."""
+    def policy(total: np.ndarray, soft: np.ndarray, up: np.ndarray) -> np.ndarray:
+        return total < stand_on
+    return policy
+
+
+# ────────────────────────────── result ─────────────────────────────────
+@dataclass(frozen=True)
+class SimResult:
+    """Per‑hand arrays for one `simulate` call (all of length `hands`)."""
+
+    outcome: np.ndarray        # int8   LOSS / PUSH / WIN
+    net: np.ndarray            # int64  balance change per hand
+    player_total: np.ndarray   # int16  final player total (> 21 = bust)
+    dealer_total: np.ndarray   # int16  final dealer total (0 if never shown)
+    bet: int
+
+    @property
+    def hands(self) -> int:
+        return int(self.outcome.size)
+
+    @property
+    def wins(self) -> int:
+        return int(np.count_nonzero(self.outcome == WIN))
+
+    @property
+    def pushes(self) -> int:
+        return int(np.count_nonzero(self.outcome == PUSH))
+
+    @property
+    def losses(self) -> int:
+        return int(np.count_nonzero(self.outcome == LOSS))
+
+    @property
+    def house_edge(self) -> float:
+        """Expected loss per unit staked (positive = house advantage)."""
+        return -float(self.net.sum()) / (self.bet * self.hands)
+
+
+# ────────────────────────────── internals ──────────────────────────────
+def _total(hard: np.ndarray, ace: np.ndarray) -> np.ndarray:
+    """Vectorised `hand_value`: one ace may count 11 if it does not bust."""
+    return np.where(ace & (hard <= 11), hard + 10, hard)
+
+
+def _draw(shoes: np.ndarray, ptr: np.ndarray, rows: np.ndarray,
+          rng: np.random.Generator) -> np.ndarray:
+    """Pull the next card for *rows* only (one partial Fisher–Yates step)."""
+    p = ptr[rows]
+    j = p + (rng.random(rows.size) * (shoes.shape[1] - p)).astype(np.intp)
+    cards = shoes[rows, j]
+    shoes[rows, j] = shoes[rows, p]
+    ptr[rows] = p + 1
+    return cards
+
+
+def _play_chunk(n: int, decks: int, policy: Policy, rng: np.random.Generator):
+    shoes = np.tile(np.arange(52, dtype=np.uint8), (n, decks))
+    ptr = np.zeros(n, dtype=np.intp)
+    rows = np.arange(n)
+
+    p_hard = np.zeros(n, dtype=np.int16)
+    d_hard = np.zeros(n, dtype=np.int16)
+    p_ace = np.zeros(n, dtype=bool)
+    d_ace = np.zeros(n, dtype=bool)
+
+    # initial deal – player two cards, then dealer two (first is the upcard)
+    for _ in range(2):
+        c = _draw(shoes, ptr, rows, rng)
+        p_hard += RANK_VALUE_NP[c >> 2]
+        p_ace |= c < 4
+    up = RANK_VALUE_NP[_draw(shoes, ptr, rows, rng) >> 2]
+    d_hard += up
+    d_ace |= up == 1
+    c = _draw(shoes, ptr, rows, rng)
+    d_hard += RANK_VALUE_NP[c >> 2]
+    d_ace |= c < 4
+
+    # player phase – keep drawing for rows whose policy still says hit
+    active = rows
+    while active.size:
+        hard, ace = p_hard[active], p_ace[active]
+        total = _total(hard, ace)
+        hit = np.asarray(policy(total, ace & (hard <= 11), up[active]), dtype=bool)
+        active = active[hit & (total <= 21)]
+        if not active.size:
+            break
+        c = _draw(shoes, ptr, active, rng)
+        p_hard[active] += RANK_VALUE_NP[c >> 2]
+        p_ace[active] |= c < 4
+
+    p_total = _total(p_hard, p_ace)
+    busted = p_total > 21
+
+    # dealer phase – only for hands the player did not bust
+    active = rows[~busted]
+    while active.size:
+        active = active[_total(d_hard[active], d_ace[active]) < DEALER_STANDS_ON]
+        if not active.size:
+            break
+        c = _draw(shoes, ptr, active, rng)
+        d_hard[active] += RANK_VALUE_NP[c >> 2]
+        d_ace[active] |= c < 4
+
+    d_total = np.where(busted, 0, _total(d_hard, d_ace)).astype(np.int16)
+
+    outcome = np.full(n, LOSS, dtype=np.int8)
+    live = ~busted
+    outcome[live & ((d_total > 21) | (p_total > d_total))] = WIN
+    outcome[live & (p_total == d_total)] = PUSH
+    return outcome, p_total, d_total
+
+
+# ────────────────────────────── public API ─────────────────────────────
+def simulate(
+    hands: int,
+    policy: Policy | None = None,
+    *,
+    decks: int = DEFAULT_DECKS,
+    bet: int = 1,
+    seed: int | None = None,
+    chunk_size: int = 1 << 16,
+) -> SimResult:
+    """Play *hands* independent hands under *policy* and return every result.
+
+    Hands are processed *chunk_size* at a time to keep memory bounded
+    (a chunk holds one uint8 shoe per hand).
+    """
+    policy = policy or threshold_policy()
+    rng = np.random.default_rng(seed)
+
+    outcome = np.empty(hands, dtype=np.int8)
+    p_total = np.empty(hands, dtype=np.int16)
+    d_total = np.empty(hands, dtype=np.int16)
+    for lo in range(0, hands, chunk_size):
+        hi = min(lo + chunk_size, hands)
+        outcome[lo:hi], p_total[lo:hi], d_total[lo:hi] = _play_chunk(hi - lo, decks, policy, rng)
+
+    # stake * payout = return, so the net change is stake * (payout - 1)
+    net_per_outcome = np.array([-1, PUSH_PAYOUT - 1, WIN_PAYOUT - 1], dtype=np.int64)
+    net = net_per_outcome[outcome + 1] * bet
+    return SimResult(outcome, net, p_total, d_total, bet)
+
+
+# ──────────────────────────── script entry ─────────────────────────────
+if __name__ == "__main__":
+    N = 2_000_000
+    for stand_on in (12, 15, 17):
+        t0 = time.perf_counter()
+        res = simulate(N, threshold_policy(stand_on), seed=stand_on)
+        dt = time.perf_counter() - t0
+        print(f"stand on {stand_on:2d}: house edge {res.house_edge:+.4f}  "
+              f"W/P/L {res.wins}/{res.pushes}/{res.losses}  "
+              f"({N / dt:,.0f} hands/s)")
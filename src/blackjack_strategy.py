@@ -0,0 +1,210 @@
+"""blackjack_strategy.py – basic‑strategy solver
+
+For every decision the table can present – player total (hard 4‑21 or soft
+12‑21) against dealer upcard (ace‑10) – the solver estimates by Monte Carlo
+the value of standing and of hitting once and then following the current
+table, and keeps the better action. That is policy iteration: the table is
+re‑evaluated with a doubled sample until no decision changes.
+
+The dealer's upcard is fixed for the whole hand, so each upcard is an
+independent problem; the ten of them run in a process pool (inline where
+processes are unavailable). Cards are drawn from an infinite shoe, the
+usual basic‑strategy assumption, so the deck count does not enter the
+rules key.
+
+Solving is an offline job. The game's rules ship with their solved table,
+`blackjack_tables.BASIC_STRATEGY`, which the in‑game `hint()` indexes;
+other rule sets are solved by `strategy_table()` and cached on disk.
+Re‑run the script and paste its output into `blackjack_tables.py` after
+changing the table rules or the solver:
+
+    python blackjack_strategy.py                 # solve, print, check BASIC_STRATEGY
+    python blackjack_strategy.py --stands-on 16  # evaluate a rule variant
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+import disk_cache
+from blackjack_rules import DEALER_STANDS_ON, Rules
+from blackjack_tables import BASIC_STRATEGY, STATES, UPCARDS, table_from_rows
+
+BASE_SAMPLES = 20_000              # hands per decision, first iteration
+MAX_ITERATIONS = 6                 # sample doubles every iteration
+SOLVER_VERSION = 1                 # bump when the solver changes
+
+
+# ─────────────────────────── vectorised hands ──────────────────────────
+def _draw(rng: np.random.Generator, shape: tuple) -> np.ndarray:
+    """Card values 1‑10 from an infinite shoe (tens are 4/13)."""
+    return np.minimum(rng.integers(1, 14, size=shape, dtype=np.int16), 10)
+
+
+def _best(hard: np.ndarray, ace: np.ndarray) -> np.ndarray:
+    return np.where(ace & (hard <= 11), hard + 10, hard)
+
+
+def _dealer_totals(up: int, n: int, stands_on: int,
+                   rng: np.random.Generator) -> np.ndarray:
+    """Final dealer totals (22 = bust) for *n* hands showing *up*."""
+    hole = _draw(rng, (n,))
+    hard = up + hole
+    ace = (hole == 1) | (up == 1)
+    while True:
+        best = _best(hard, ace)
+        draw = best < stands_on
+        if not draw.any():
+            return np.minimum(best, 22)
+        card = _draw(rng, (n,))
+        hard = np.where(draw, hard + card, hard)
+        ace |= draw & (card == 1)
+
+
+def _net(player: np.ndarray, dealer: np.ndarray, rules: Rules) -> np.ndarray:
+    """Net result per unit stake; busts (> 21) always lose."""
+    win = (player <= 21) & ((dealer > 21) | (player > dealer))
+    push = (player <= 21) & (player == dealer)
+    return np.where(win, rules.win - 1, np.where(push, rules.push - 1, -1)).astype(np.float64)
+
+
+def _evaluate(up: int, hit: np.ndarray, n: int, rules: Rules,
+              rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Mean net of standing and of hitting (then following *hit*, indexed
+    `[soft, total]`) for every row of `STATES`, plus the standard error of
+    their difference. Both actions face the same dealer hands.
+    """
+    dealer = _dealer_totals(up, n, rules.stands_on, rng)
+    soft0 = np.array([s for s, _ in STATES])[:, None]
+    total0 = np.array([t for _, t in STATES], dtype=np.int16)[:, None]
+
+    stand = _net(np.broadcast_to(total0, (len(STATES), n)), dealer, rules)
+
+    hard = np.broadcast_to(np.where(soft0, total0 - 10, total0), (len(STATES), n)).copy()
+    ace = np.broadcast_to(soft0, hard.shape).copy()
+    active = np.ones(hard.shape, dtype=bool)            # first card is forced
+    while active.any():
+        card = _draw(rng, hard.shape)
+        hard = np.where(active, hard + card, hard)
+        ace |= active & (card == 1)
+        best = _best(hard, ace)
+        soft = ace & (hard <= 11)
+        active &= (best <= 21) & hit[soft.astype(np.intp), np.minimum(best, 21)]
+    hit_net = _net(_best(hard, ace), dealer, rules)
+
+    diff = hit_net - stand
+    se = diff.std(axis=1, ddof=1) / np.sqrt(n)
+    return stand.mean(axis=1), hit_net.mean(axis=1), se
+
+
+def _solve_upcard(args: Tuple[int, Rules, int, np.random.SeedSequence]) -> Dict[str, list]:
+    """Policy iteration for one dealer upcard."""
+    up, rules, samples, seed = args
+    rng = np.random.default_rng(seed)
+    hit = np.zeros((2, 22), dtype=bool)
+    hit[:, :rules.stands_on] = True                     # start: mimic the dealer
+    n = samples
+    for iteration in range(1, MAX_ITERATIONS + 1):
+        stand_ev, hit_ev, se = _evaluate(up, hit, n, rules, rng)
+        new = hit.copy()
+        for (soft, total), s, h in zip(STATES, stand_ev, hit_ev):
+            new[int(soft), total] = h > s
+        if iteration > 1 and (new == hit).all():
+            break
+        hit, n = new, n * 2
+    return {"hit": [bool(hit[int(s), t]) for s, t in STATES],
+            "stand_ev": stand_ev.round(4).tolist(), "hit_ev": hit_ev.round(4).tolist(),
+            "se": se.round(4).tolist(), "iterations": iteration, "samples": n}
+
+
+# ───────────────────────────── solver ──────────────────────────────────
+def solve(rules: Rules = Rules(), *, samples: int = BASE_SAMPLES,
+          workers: int | None = None, seed: int = 0) -> Dict[str, object]:
+    """Solve every upcard; returns the table plus per‑decision EVs."""
+    workers = workers or os.cpu_count() or 1
+    seeds = np.random.SeedSequence(seed).spawn(len(UPCARDS))
+    jobs = [(up, rules, samples, s) for up, s in zip(UPCARDS, seeds)]
+    results = None
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+                results = list(pool.map(_solve_upcard, jobs))
+        except (OSError, ImportError, NotImplementedError, BrokenProcessPool):
+            results = None                       # no processes (e.g. web build)
+    if results is None:
+        results = [_solve_upcard(job) for job in jobs]
+    return {"rules": rules._asdict(), "states": STATES,
+            "upcards": list(UPCARDS), "by_upcard": results}
+
+
+def _key(rules: Rules, samples: int) -> Dict[str, object]:
+    return {"rules": rules._asdict(), "samples": samples, "deck": "infinite",
+            "solver": SOLVER_VERSION}
+
+
+def _to_table(solved: Dict[str, object]) -> List[List[List[bool]]]:
+    table = [[[True] * 11 for _ in range(22)] for _ in range(2)]
+    for up, res in zip(UPCARDS, solved["by_upcard"]):
+        for (soft, total), hit in zip(STATES, res["hit"]):
+            table[int(soft)][total][up] = hit
+    return table
+
+
+def _rows(solved: Dict[str, object]) -> Tuple[str, ...]:
+    """One H/S string per `STATES` row, upcards A, 2 … 10 – `BASIC_STRATEGY` form."""
+    res = solved["by_upcard"]
+    return tuple("".join("H" if r["hit"][i] else "S" for r in res)
+                 for i in range(len(STATES)))
+
+
+def strategy_table(rules: Rules = Rules(), samples: int = BASE_SAMPLES) -> List[List[List[bool]]]:
+    """Hit table indexed `[soft][total][upcard]` (True = hit).
+
+    The game's rules come from `BASIC_STRATEGY`; any other rule set is
+    solved (seconds, in a process pool) and cached on disk – offline use.
+    """
+    if rules == Rules() and samples == BASE_SAMPLES:
+        return table_from_rows(BASIC_STRATEGY)
+    table = disk_cache.load("bj-strategy", _key(rules, samples))
+    if table is None:
+        table = _to_table(solve(rules, samples=samples, seed=0))
+        disk_cache.store("bj-strategy", _key(rules, samples), table)
+    return table
+
+
+# ──────────────────────────── script entry ─────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve blackjack basic strategy")
+    parser.add_argument("--stands-on", type=int, default=DEALER_STANDS_ON)
+    parser.add_argument("--samples", type=int, default=BASE_SAMPLES)
+    args = parser.parse_args()
+    rules = Rules(stands_on=args.stands_on)
+    t0 = time.perf_counter()
+    solved = solve(rules, samples=args.samples, seed=0)
+    dt = time.perf_counter() - t0
+    if rules != Rules() or args.samples != BASE_SAMPLES:
+        disk_cache.store("bj-strategy", _key(rules, args.samples), _to_table(solved))
+    res = solved["by_upcard"]
+    print(f"solved in {dt:.1f}s  ({rules})")
+    print("        " + " ".join(f"{'A' if u == 1 else u:>2}" for u in UPCARDS))
+    for i, (soft, total) in enumerate(STATES):
+        row = " ".join(f"{'H' if r['hit'][i] else 'S':>2}" for r in res)
+        print(f"{'soft' if soft else 'hard'} {total:>2} {row}")
+    print("iterations per upcard:", [r["iterations"] for r in res])
+    if rules == Rules() and args.samples == BASE_SAMPLES:
+        shipped = _rows(solved) == BASIC_STRATEGY
+        print("shipped BASIC_STRATEGY is", "current" if shipped else "stale – paste into blackjack_tables.py:")
+        if not shipped:
+            print("BASIC_STRATEGY: Tuple[str, ...] = (")
+            for (soft, total), row in zip(STATES, _rows(solved)):
+                print(f'    "{row}",    # {"soft" if soft else "hard"} {total}')
+            print(")")
+        sys.exit(0 if shipped else 1)
@@ -0,0 +1,187 @@
+"""blackjack_tables.py – the blackjack tables shipped with the game
+
+The table scene only ever looks numbers up, here, in plain Python, so it
+runs wherever pyxel does (the web build has no NumPy). The tables are made
+offline by the NumPy tools and checked by them:
+
+• `BASIC_STRATEGY` – hit/stand per decision, from `blackjack_strategy.py`;
+  `hint()` is a list index.
+• `blackjack_ev.bin` – exact net EV of standing and of hitting for every
+  hand a player can hold (value multiset, 2+ cards, hard total ≤ 21)
+  against every upcard, from `blackjack_exact.py --table`, for the game's
+  rules and deck count. `action_ev()` is a dict lookup; it returns None
+  for any other rules, or if the file is missing.
+
+    python blackjack_exact.py --table    # rebuild / check blackjack_ev.bin
+"""
+from __future__ import annotations
+
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, List, Sequence, Tuple
+
+from blackjack_rules import DEFAULT_DECKS, RANK_VALUE, Card, Hand, Rules
+
+HARD_TOTALS = range(4, 22)
+SOFT_TOTALS = range(12, 22)
+UPCARDS     = range(1, 11)         # card value; 1 = ace
+
+# (soft, total) of each decision row, in table order
+STATES: List[Tuple[bool, int]] = ([(False, t) for t in HARD_TOTALS] +
+                                  [(True, t) for t in SOFT_TOTALS])
+
+EV_FILE  = os.path.join(os.path.dirname(os.path.abspath(__file__)), "blackjack_ev.bin")
+EV_MAGIC = b"BJE1"
+EV_SCALE = 10_000                  # EVs stored in 1/10 000 of the stake, int16
+EV_NONE  = -32768                  # hand that cannot be held with this many decks
+_EV_HEADER = struct.Struct("<4sBBBBI")   # magic, decks, stands_on, win, push, #entries
+
+Values = Tuple[int, ...]           # sorted card values 1‑10 of a hand
+
+
+# ───────────────────────── basic strategy ──────────────────────────────
+# `python blackjack_strategy.py` for `Rules()` (BASE_SAMPLES, seed 0): one
+# row per `STATES` entry, H/S against upcards A, 2 … 10.
+BASIC_STRATEGY: Tuple[str, ...] = (
+    "HHHHHHHHHH",    # hard 4
+    "HHHHHHHHHH",    # hard 5
+    "HHHHHHHHHH",    # hard 6
+    "HHHHHHHHHH",    # hard 7
+    "HHHHHHHHHH",    # hard 8
+    "HHHHHHHHHH",    # hard 9
+    "HHHHHHHHHH",    # hard 10
+    "HHHHHHHHHH",    # hard 11
+    "HHHSSSHHHH",    # hard 12
+    "HSSSSSHHHH",    # hard 13
+    "HSSSSSHHHH",    # hard 14
+    "HSSSSSHHHH",    # hard 15
+    "HSSSSSHHHH",    # hard 16
+    "SSSSSSSSSS",    # hard 17
+    "SSSSSSSSSS",    # hard 18
+    "SSSSSSSSSS",    # hard 19
+    "SSSSSSSSSS",    # hard 20
+    "SSSSSSSSSS",    # hard 21
+    "HHHHHHHHHH",    # soft 12
+    "HHHHHHHHHH",    # soft 13
+    "HHHHHHHHHH",    # soft 14
+    "HHHHHHHHHH",    # soft 15
+    "HHHHHHHHHH",    # soft 16
+    "HHHHHHHHHH",    # soft 17
+    "HSSSSSSSHH",    # soft 18
+    "SSSSSSSSSS",    # soft 19
+    "SSSSSSSSSS",    # soft 20
+    "SSSSSSSSSS",    # soft 21
+)
+
+
+def table_from_rows(rows: Tuple[str, ...]) -> List[List[List[bool]]]:
+    """Hit table indexed `[soft][total][upcard]` from `BASIC_STRATEGY` rows."""
+    table = [[[True] * 11 for _ in range(22)] for _ in range(2)]
+    for (soft, total), row in zip(STATES, rows):
+        for up, action in zip(UPCARDS, row):
+            table[int(soft)][total][up] = action == "H"
+    return table
+
+
+_STRATEGY = table_from_rows(BASIC_STRATEGY)
+
+
+def hint(player: Hand, upcard: Card) -> str:
+    """'Hit' or 'Stand' for the current hand under the shipped table – O(1)."""
+    total = player.value
+    if total >= 21:
+        return "Stand"
+    return "Hit" if _STRATEGY[int(player.soft)][total][RANK_VALUE[upcard[0]]] else "Stand"
+
+
+# ─────────────────────────── exact EVs ─────────────────────────────────
+def player_hands() -> List[Values]:
+    """Every hand a player can still act on, as sorted values, in file order
+    (by card count, then lexicographic)."""
+    hands: List[Values] = []
+
+    def grow(hand: Values, room: int) -> None:
+        for v in range(hand[-1], min(room, 10) + 1):
+            hands.append(hand + (v,))
+            grow(hand + (v,), room - v)
+
+    for first in UPCARDS:
+        grow((first,), 21 - first)
+    hands.sort(key=lambda h: (len(h), h))
+    return hands
+
+
+def _little(evs: array) -> array:
+    """*evs* with little‑endian items (the file's order) – a copy on big‑endian."""
+    if sys.byteorder == "little":
+        return evs
+    out = array("h", evs)
+    out.byteswap()
+    return out
+
+
+class EvTable:
+    """(stand, hit) EV per unit stake for every `player_hands()` × upcard."""
+
+    def __init__(self, decks: int, rules: Rules, evs: Sequence[int]) -> None:
+        self.decks = decks
+        self.rules = rules
+        self.evs   = array("h", evs)       # stand, hit per upcard per hand
+        self.index: Dict[Values, int] = {v: i for i, v in enumerate(player_hands())}
+        if len(self.evs) != 2 * len(UPCARDS) * len(self.index):
+            raise ValueError(f"{len(self.evs)} EVs for {len(self.index)} hands")
+
+    def get(self, values: Values, up: int) -> Tuple[float, float] | None:
+        row = self.index.get(values)
+        if row is None:
+            return None
+        i = 2 * (row * len(UPCARDS) + up - 1)
+        if self.evs[i] == EV_NONE:
+            return None
+        return self.evs[i] / EV_SCALE, self.evs[i + 1] / EV_SCALE
+
+    def save(self, path: str = EV_FILE) -> None:
+        head = _EV_HEADER.pack(EV_MAGIC, self.decks, *self.rules, len(self.evs))
+        with open(path, "wb") as fh:
+            fh.write(zlib.compress(head + _little(self.evs).tobytes(), 9))
+
+    @classmethod
+    def load(cls, path: str = EV_FILE) -> "EvTable":
+        with open(path, "rb") as fh:
+            blob = zlib.decompress(fh.read())
+        magic, decks, stands_on, win, push, n = _EV_HEADER.unpack_from(blob)
+        if magic != EV_MAGIC:
+            raise ValueError(f"{path}: not a blackjack EV table")
+        evs = array("h")
+        evs.frombytes(blob[_EV_HEADER.size:_EV_HEADER.size + 2 * n])
+        return cls(decks, Rules(stands_on, win, push), _little(evs))
+
+
+_shipped: List[EvTable | None] = []
+
+
+def shipped_evs() -> EvTable | None:
+    """`blackjack_ev.bin`, read on first use; None if it is missing or bad."""
+    if not _shipped:
+        try:
+            _shipped.append(EvTable.load())
+        except (OSError, ValueError, zlib.error, struct.error):
+            _shipped.append(None)
+    return _shipped[0]
+
+
+def action_ev(player: Sequence[Card], upcard: Card, decks: int = DEFAULT_DECKS,
+              rules: Rules = Rules()) -> Tuple[float, float] | None:
+    """Shipped exact net EV of (stand, hit), or None if the table lacks it.
+
+    Same numbers as `blackjack_exact.action_evs` to four decimals: the shoe
+    is *decks* full decks minus the player's cards and the upcard.
+    """
+    table = shipped_evs()
+    if table is None or (table.decks, table.rules) != (decks, rules):
+        return None
+    values = tuple(sorted(RANK_VALUE[rank] for rank, _ in player))
+    return table.get(values, RANK_VALUE[upcard[0]])
@@ -0,0 +1,116 @@
+"""card_sprites.py – generated playing‑card sprites
+
+All 52 faces and the card back are drawn once, with pyxel primitives, into
+one `pyxel.Image` atlas when the blackjack table is built; no image files
+ship with the game. `CardAtlas.rect` maps a card to its atlas cell through a
+dict built alongside the atlas, so drawing a hand is one `blt` per card.
+
+Pyxel's font has no suit symbols, so suits are 5×5 pip bitmaps (`PIPS`),
+drawn small beside the rank and doubled in the middle of the card.
+
+    python card_sprites.py        # print the pips and the sheet layout
+"""
+from __future__ import annotations
+
+from typing import Dict, Sequence, Tuple
+
+from backend import pyxel
+
+from blackjack_rules import RANK_STR, Card
+
+CARD_W, CARD_H = 16, 24
+CARD_GAP       = 2              # between cards of a hand that fits
+FACE_COL, BACK_COL, BACK_DOT = 7, 5, 1
+SUIT_COL       = (1, 8, 8, 1)   # ♠ ♥ ♦ ♣ – navy, not 0: black is transparent
+
+# 5×5 suit bitmaps, index = suit (0 ♠, 1 ♥, 2 ♦, 3 ♣)
+PIPS: Tuple[Tuple[str, ...], ...] = (
+    ("..#..", ".###.", "#####", "..#..", ".###."),
+    (".#.#.", "#####", "#####", ".###.", "..#.."),
+    ("..#..", ".###.", "#####", ".###.", "..#.."),
+    (".###.", ".###.", "#####", "#.#.#", "..#.."),
+)
+
+
+def rank_label(rank: int) -> str:
+    return RANK_STR.get(rank, str(rank))
+
+
+class CardAtlas:
+    """
+    One cell per card: ranks across (A … K), suits down, the back below
+    them. Build it after `pyxel.init`; the image belongs to that init.
+    """
+
+    def __init__(self) -> None:
+        self.image = pyxel.Image(13 * CARD_W, 5 * CARD_H)
+        self._rects: Dict[Card, Tuple[int, int]] = {}
+        for suit in range(4):
+            for rank in range(1, 14):
+                u, v = (rank - 1) * CARD_W, suit * CARD_H
+                self._render_face(u, v, rank, suit)
+                self._rects[(rank, suit)] = (u, v)
+        self.back = (0, 4 * CARD_H)
+        self._render_back(*self.back)
+
+    # ─────────────────────────── rendering ─────────────────────────────
+    def _blank(self, u: int, v: int, col: int) -> None:
+        """Card outline with clipped corners (left transparent)."""
+        img = self.image
+        img.rect(u + 1, v, CARD_W - 2, CARD_H, col)
+        img.rect(u, v + 1, CARD_W, CARD_H - 2, col)
+
+    def _pip(self, x: int, y: int, suit: int, scale: int = 1) -> None:
+        img, col = self.image, SUIT_COL[suit]
+        for dy, row in enumerate(PIPS[suit]):
+            for dx, bit in enumerate(row):
+                if bit == "#":
+                    img.rect(x + dx * scale, y + dy * scale, scale, scale, col)
+
+    def _render_face(self, u: int, v: int, rank: int, suit: int) -> None:
+        img, col = self.image, SUIT_COL[suit]
+        label = rank_label(rank)
+        self._blank(u, v, FACE_COL)
+        img.text(u + 2, v + 2, label, col)
+        self._pip(u + CARD_W - 6, v + 2, suit)
+        self._pip(u + (CARD_W - 10) // 2, v + 8, suit, 2)
+        img.text(u + CARD_W - 1 - 4 * len(label), v + CARD_H - 6, label, col)
+
+    def _render_back(self, u: int, v: int) -> None:
+        img = self.image
+        self._blank(u, v, BACK_COL)
+        for y in range(v + 2, v + CARD_H - 2):
+            for x in range(u + 2 + (y - v) % 2, u + CARD_W - 2, 2):
+                img.pset(x, y, BACK_DOT)
+
+    # ─────────────────────────── drawing ───────────────────────────────
+    def rect(self, card: Card) -> Tuple[int, int]:
+        """Top‑left of *card*'s cell in `image`."""
+        return self._rects[card]
+
+    def draw(self, x: int, y: int, card: Card | None) -> None:
+        """One card at (x, y); `None` draws the back."""
+        u, v = self.back if card is None else self._rects[card]
+        pyxel.blt(x, y, self.image, u, v, CARD_W, CARD_H, 0)
+
+    def draw_hand(self, x: int, y: int, cards: Sequence[Card], hidden: int = -1,
+                  width: int = 236) -> None:
+        """
+        *cards* left to right from (x, y), overlapping once they outgrow
+        *width*; the card at index *hidden* is drawn face down.
+        """
+        n = len(cards)
+        step = CARD_W + CARD_GAP
+        if n > 1 and (n - 1) * step + CARD_W > width:
+            step = (width - CARD_W) // (n - 1)
+        for i, card in enumerate(cards):
+            self.draw(x + i * step, y, None if i == hidden else card)
+
+
+# ──────────────────────────── script entry ─────────────────────────────
+if __name__ == "__main__":
+    for rows in zip(*PIPS):
+        print("   ".join(row.replace(".", " ") for row in rows))
+    print(f"\n{CARD_W}×{CARD_H} px cards; sheet {13 * CARD_W}×{5 * CARD_H} px: "
+          f"ranks {' '.join(rank_label(r) for r in range(1, 14))} across, "
+          f"suits down, back below")
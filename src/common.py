@@ -1,27 +1,200 @@
-import pyxel
-import collections
+from __future__ import annotations
+
+from backend import pyxel
+import random
+from typing import Any, Callable, Dict, Tuple, Union
 
 # ---------- global configuration ----------
 SCREEN_W, SCREEN_H = 256, 256
 STARTING_BALANCE = 500
 BET_INCREMENT     = 10
 NUM_HORSES        = 4
+HORSE_WEIGHTS     = (0.4, 0.3, 0.2, 0.1)   # stride weights, must sum to 1
+HORSE_FINISH      = SCREEN_W - 20           # finish line x
+ROULETTE_LAYOUT   = "european"   # "european" | "american" (adds 00)
+HORSE_TARGET_RTP  = 0.95         # payouts calibrated to this return-to-player
+
+GLYPH_W, GLYPH_H = 4, 6     # pyxel's built-in font
+
+SIM_FPS     = 30    # fixed simulation rate – gameplay timing is counted in ticks
+RENDER_FPS  = 30    # pyxel's frame rate (`--fps 60` opts in); drawing interpolates
+FRAME_BUDGET_MS = 1000 / 30     # agreed time for one frame, whatever the render rate
+MAX_CATCHUP = 4     # most ticks run for one rendered frame; longer stalls are dropped
 
 # ---------- helpers ----------
-def draw_text_center(text: str, y: int, col: int = 7) -> None:
-    """8×8-font text centered on (y)."""
-    w = len(text) * 4          # each glyph is 4 px wide in the 8×8 font
-    x = (SCREEN_W - w) // 2
-    pyxel.text(x, y, text, col)
+Text = Union[str, Callable[..., str]]
+
+
+class TextCache:
+    """
+    Retained-mode labels: each distinct (text, values, colour) is rendered
+    once into a shared atlas image and blitted from there on.
+
+    *text* is a `str.format` template or a function taking *values*; it is
+    only formatted/called on a miss, so a static screen costs one dict
+    lookup + one blit per line. Changing a value (balance, bet, hand …)
+    changes the key, which is the invalidation. Use module-level functions,
+    not per-frame lambdas, or every frame misses.
+
+    Labels are shelf-packed one row per `GLYPH_H` pixels; when the atlas is
+    full it is wiped and refilled by whatever is still on screen.
+    """
+    ATLAS_W, ATLAS_H = 256, 256
+
+    def __init__(self) -> None:
+        self._labels: Dict[Tuple[Any, ...], Tuple[int, int, int]] = {}
+        self._atlas = None
+        self._row = self._col = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        """Forget every label (call after `pyxel.init`; the atlas is lazy)."""
+        self._labels.clear()
+        self._atlas = None
+        self._row = self._col = 0
+
+    def _render(self, key: Tuple[Any, ...], text: Text, values: tuple,
+                col: int) -> Tuple[int, int, int]:
+        self.misses += 1
+        s = _format(text, values)
+        w = len(s) * GLYPH_W
+        if w > self.ATLAS_W:                    # never fits – drawn directly
+            label = self._labels[key] = (0, 0, w)
+            return label
+        if self._atlas is None:
+            self._atlas = pyxel.Image(self.ATLAS_W, self.ATLAS_H)
+        if self._col + w > self.ATLAS_W:                     # next shelf
+            self._row, self._col = self._row + GLYPH_H, 0
+        if self._row + GLYPH_H > self.ATLAS_H:               # atlas full
+            self._labels.clear()
+            self._atlas.cls(0)
+            self._row = self._col = 0
+        u, v = self._col, self._row
+        self._atlas.text(u, v, s, col)
+        self._col += w
+        label = self._labels[key] = (u, v, w)
+        return label
+
+    def draw(self, x: int | None, y: int, text: Text, col: int = 7,
+             *values: Any) -> None:
+        """Blit a label at (x, y); `x=None` centres it on the screen."""
+        key = (text, values, col)
+        label = self._labels.get(key)
+        if label is None:
+            label = self._render(key, text, values, col)
+        u, v, w = label
+        if w > self.ATLAS_W:
+            pyxel.text((SCREEN_W - w) // 2 if x is None else x, y,
+                       _format(text, values), col)
+            return
+        pyxel.blt((SCREEN_W - w) // 2 if x is None else x, y,
+                  self._atlas, u, v, w, GLYPH_H, 0)
+
+
+def _format(text: Text, values: tuple) -> str:
+    if callable(text):
+        return text(*values)
+    return text.format(*values) if values else text
+
+
+TEXT_CACHE = TextCache()
+
+
+def draw_text(x: int, y: int, text: Text, col: int = 7, *values: Any) -> None:
+    """Cached `pyxel.text`; *text* may be a template filled with *values*."""
+    TEXT_CACHE.draw(x, y, text, col, *values)
+
+
+def draw_text_center(text: Text, y: int, col: int = 7, *values: Any) -> None:
+    """8×8-font text centered on (y), cached like `draw_text`."""
+    TEXT_CACHE.draw(None, y, text, col, *values)
+
+
+# every key a scene polls; bit i of a mask = BOUND_KEYS[i]. These 16 are what
+# `replay.py` records; LOCAL_KEYS (profiler toggle) are polled but never logged.
+BOUND_KEYS = ("KEY_UP", "KEY_DOWN", "KEY_LEFT", "KEY_RIGHT", "KEY_RETURN",
+              "KEY_SPACE", "KEY_TAB", "KEY_A", "KEY_BACKSPACE", "KEY_H",
+              "KEY_S", "KEY_Q", "KEY_I", "KEY_R", "KEY_F5", "KEY_F9")
+LOCAL_KEYS = ("KEY_F1",)
 
 
 class InputHelper:
     """
-    Handles key-repeat with acceleration so every mini-game can share the
-    exact same feel without duplicating code.
+    The only place the keyboard is read. `sample()` runs once per rendered
+    frame and reads each bound key into two bitmasks – held, and went down
+    – with one `pyxel.btn` per key, plus a `pyxel.btnp` only for keys that
+    are down. `poll()` runs once per simulation tick and hands the tick
+    `held` and `pressed`: presses queue until a tick takes them, so none
+    is lost on a frame without a tick or repeated on a frame with several.
+    Scenes then ask `btn(key)` / `btnp(key, …)` / `accelerated_press(key)`,
+    which are bit tests; `events` lists the tick's fresh presses in bit
+    order.
+
+    `feed(held, pressed)` replaces the next sample, which is how replays
+    inject input; recording logs each tick's `held` / `pressed`.
+
+    Key-repeat with acceleration is shared by every mini-game: the hold
+    counters live in a fixed array, one per key, advanced by `poll()`.
     """
     def __init__(self) -> None:
-        self._hold = collections.defaultdict(int)
+        self._keys = [getattr(pyxel, name) for name in BOUND_KEYS + LOCAL_KEYS]
+        self._bits = {key: bit for bit, key in enumerate(self._keys)}
+        self._hold = [0] * len(self._keys)   # frames held since the press
+        self._fed: Tuple[int, int] | None = None
+        self._down = self._queued = 0        # last sample; presses not yet ticked
+        self.held = self.pressed = 0
+        self.events: Tuple[int, ...] = ()
+
+    # -------------------------------------------------------- per frame
+    def sample(self) -> None:
+        if self._fed is not None:
+            held, pressed = self._fed
+            self._fed = None
+        else:
+            btn, btnp = pyxel.btn, pyxel.btnp
+            held = pressed = 0
+            for bit, key in enumerate(self._keys):
+                if btn(key):
+                    held |= 1 << bit
+                    if btnp(key):
+                        pressed |= 1 << bit
+        self._down = held
+        self._queued |= pressed
+
+    def poll(self) -> None:
+        held, pressed = self._down, self._queued
+        self._queued = 0
+        if held or self.held:
+            hold = self._hold
+            for bit in range(len(hold)):
+                if pressed >> bit & 1 or not held >> bit & 1:
+                    hold[bit] = 0
+                else:
+                    hold[bit] += 1
+        self.events = tuple(key for bit, key in enumerate(self._keys)
+                            if pressed >> bit & 1) if pressed else ()
+        self.held, self.pressed = held, pressed
+
+    def feed(self, held: int, pressed: int) -> None:
+        """Use these masks instead of the keyboard for the next `sample()`."""
+        self._fed = (held, pressed)
+
+    # ----------------------------------------------------------- queries
+    def btn(self, *keys: int) -> bool:
+        """Any of *keys* down this tick."""
+        if self.held:
+            for key in keys:
+                if self.held >> self._bits[key] & 1:
+                    return True
+        return False
+
+    def btnp(self, *keys: int) -> bool:
+        """Any of *keys* went down since the previous tick."""
+        if self.pressed:
+            for key in keys:
+                if self.pressed >> self._bits[key] & 1:
+                    return True
+        return False
 
     def accelerated_press(
         self,
@@ -30,18 +203,90 @@ class InputHelper:
         min_interval: int  = 2,
         accel_rate: int    = 10,
     ) -> bool:
-        if pyxel.btnp(key):                 # fresh press → immediate trigger
-            self._hold[key] = 0
+        bit = self._bits[key]
+        if self.pressed >> bit & 1:         # fresh press → immediate trigger
             return True
 
-        if pyxel.btn(key):                  # key held → accelerate
-            self._hold[key] += 1
-            frames   = self._hold[key]
+        if self.held >> bit & 1:            # key held → accelerate
+            frames   = self._hold[bit]
             interval = max(min_interval, base_interval - frames // accel_rate)
             return frames % interval == 0
-
-        self._hold.pop(key, None)           # released → forget counter
         return False
 
     def reset(self) -> None:
-        self._hold.clear()
+        self._hold[:] = [0] * len(self._hold)
+
+    def snapshot(self) -> Tuple[int, ...]:
+        return tuple(self._hold)
+
+    def restore(self, state: Tuple[int, ...]) -> None:
+        self._hold[:] = state
+
+
+class _Stream(random.Random):
+    """`random.Random` that counts its draws (every method goes through these two)."""
+
+    draws = 0
+
+    def random(self) -> float:
+        self.draws += 1
+        return super().random()
+
+    def getrandbits(self, k: int) -> int:
+        self.draws += 1
+        return super().getrandbits(k)
+
+
+class RngStreams:
+    """
+    One reproducible `random.Random` per named stream, all derived from a
+    single session seed, so each game draws from its own sequence and a
+    seed fully determines the session.
+
+    `snapshot()` is cheap between draws: a stream's state (~25 KB) is only
+    copied again after it has been drawn from, otherwise the previous copy
+    is shared.
+    """
+    def __init__(self, seed: int) -> None:
+        self.seed = seed
+        self._streams: dict = {}
+        self._saved: Dict[str, Tuple[int, tuple]] = {}   # name → (draws, state)
+
+    def __getitem__(self, name: str) -> random.Random:
+        rng = self._streams.get(name)
+        if rng is None:
+            rng = self._streams[name] = _Stream(f"{self.seed}:{name}")
+        return rng
+
+    def discard(self, name: str) -> None:
+        """Forget a stream that will not be drawn from again (no‑op if unknown)."""
+        self._streams.pop(name, None)
+        self._saved.pop(name, None)
+
+    def snapshot(self) -> Tuple[Tuple[str, tuple], ...]:
+        out = []
+        for name, rng in self._streams.items():
+            saved = self._saved.get(name)
+            if saved is None or saved[0] != rng.draws:
+                saved = self._saved[name] = (rng.draws, rng.getstate())
+            out.append((name, saved[1]))
+        return tuple(out)
+
+    def restore(self, state: Tuple[Tuple[str, tuple], ...]) -> None:
+        """Rewind every stream in place (games hold references to them)."""
+        states = dict(state)
+        for name, rng in self._streams.items():
+            if name in states:
+                saved = self._saved.get(name)
+                if saved is not None and saved[0] == rng.draws and saved[1] is states[name]:
+                    continue                    # not drawn from since
+                rng.setstate(states[name])
+                self._saved[name] = (rng.draws, states[name])
+            else:                               # first drawn after the snapshot
+                rng.seed(f"{self.seed}:{name}")
+                self._saved.pop(name, None)
+        for name, st in states.items():
+            if name not in self._streams:
+                rng = self[name]
+                rng.setstate(st)
+                self._saved[name] = (rng.draws, st)
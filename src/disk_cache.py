@@ -0,0 +1,53 @@
+"""disk_cache.py – tiny JSON cache for expensive offline tables
+
+Tables such as a strategy solved for non‑default rules are keyed by the
+parameters that produced them; the key is hashed into the file name, so
+changing any parameter simply misses the cache instead of returning stale
+numbers.
+
+The directory defaults to `~/.cache/pyxel-casino` and can be moved with the
+`CASINO_CACHE_DIR` environment variable.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict
+
+CACHE_DIR = os.environ.get(
+    "CASINO_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "pyxel-casino"),
+)
+
+
+def cache_path(kind: str, key: Dict[str, Any]) -> str:
+    """File that holds the *kind* table computed for *key*."""
+    blob = json.dumps(key, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha1(blob.encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{kind}-{digest}.json")
+
+
+def load(kind: str, key: Dict[str, Any]) -> Any | None:
+    """Cached value for *key*, or None if missing / unreadable."""
+    try:
+        with open(cache_path(kind, key), encoding="utf-8") as fh:
+            entry = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return entry["value"] if entry.get("key") == key else None
+
+
+def store(kind: str, key: Dict[str, Any], value: Any) -> str | None:
+    """Atomically write *value*; returns the path, or None if not writable."""
+    path = cache_path(kind, key)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"key": key, "value": value}, fh)
+        os.replace(tmp, path)
+    except OSError:
+        return None
+    return path
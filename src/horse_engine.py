@@ -0,0 +1,84 @@
+"""horse_engine.py – horse‑race rules and the race generator (pure Python)
+
+The whole race is generated in one go when the bet is placed; the pyxel
+scene then just replays `Race.positions` row by row. Only the stdlib
+`random` is used, so the scene runs wherever pyxel does (the web build
+has no NumPy); `horse_odds` races the same rules vectorised to calibrate
+the payouts.
+
+Stride model: every frame horse *i* moves `randint(0, BASE_STRIDE)` pixels,
+plus one more with probability `weight[i] * SURGE`, and the race ends on the
+first frame in which any horse reaches the finish line. The weights only
+nudge the mean stride, so over a ~100‑frame race every horse keeps a real
+chance – with the default field each one wins roughly as often as its
+weight.
+
+Photo finish: a horse that crosses during frame *f* is credited with the
+fractional time `f - 1 + (finish - p_before) / stride`, i.e. the moment it
+actually touched the line assuming constant speed within the frame. The
+lowest time wins; exact ties are split uniformly at random.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+MIN_FIELD, MAX_FIELD = 4, 10_000
+BASE_STRIDE  = 4            # every horse moves 0..BASE_STRIDE px a frame …
+SURGE        = 0.5          # … +1 px with probability weight * SURGE
+
+
+def surge_chances(weights: Sequence[float]) -> Tuple[float, ...]:
+    """Per‑frame chance of each horse's extra pixel."""
+    return tuple(float(w) * SURGE for w in weights)
+
+
+def photo_finish(before: int, after: int, finish: int) -> float:
+    """Fraction of the frame (0‑1] at which a horse reached *finish*.
+
+    A horse that did not cross during the frame gets `inf`.
+    """
+    if before >= finish or after < finish:
+        return float("inf")
+    return (finish - before) / (after - before)
+
+
+@dataclass(frozen=True)
+class Race:
+    positions: Tuple[Tuple[int, ...], ...]   # (frames + 1) rows; row 0 = start line
+    winner: int
+    finish_time: float      # fractional frame at which the winner crossed
+
+    @property
+    def frames(self) -> int:
+        """Frames until the race is decided (last row of `positions`)."""
+        return len(self.positions) - 1
+
+    @property
+    def horses(self) -> int:
+        return len(self.positions[0])
+
+
+def simulate_race(weights: Sequence[float], finish: int,
+                  rng: random.Random | None = None) -> Race:
+    """Generate one complete race for a field of `len(weights)` horses."""
+    n = len(weights)
+    if not MIN_FIELD <= n <= MAX_FIELD:
+        raise ValueError(f"field size must be {MIN_FIELD}‑{MAX_FIELD}, got {n}")
+    rng = rng or random.Random()
+    stride, chance = rng.randrange, rng.random
+    surge = surge_chances(weights)
+
+    row = (0,) * n
+    rows: List[Tuple[int, ...]] = [row]
+    while max(row) < finish:
+        row = tuple(p + stride(BASE_STRIDE + 1) + (chance() < s)
+                    for p, s in zip(row, surge))
+        rows.append(row)
+
+    frac = [photo_finish(b, a, finish) for b, a in zip(rows[-2], row)]
+    first = min(frac)
+    best = [i for i, f in enumerate(frac) if f == first]
+    winner = best[0] if len(best) == 1 else rng.choice(best)
+    return Race(tuple(rows), winner, len(rows) - 2 + first)
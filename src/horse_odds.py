@@ -0,0 +1,203 @@
+"""horse_odds.py – Monte Carlo calibration of horse‑race payouts
+
+The stride weights in `HorseRaceGame.odds` say nothing exact about how often
+each horse actually wins, so paying `bet / weight` gives an unknown RTP.
+This module races millions of fields (`horse_sim`, the `horse_engine` rules
+vectorised with NumPy), estimates every horse's win probability with a
+95 % confidence interval, and turns it into a payout table that hits a
+target return‑to‑player:
+
+    multiplier[i] = target_rtp / p[i]       (to the nearest PAYOUT_STEP)
+
+The step is the track's "breakage": with stakes in `BET_INCREMENT` steps a
+0.1 step makes every payout whole dollars, so the game's `int()` never
+trims a win. A horse that never wins cannot be priced, and one that wins so
+often it would pay x1 or less breaks the table – both are errors, not caps.
+
+The game plays with `GAME_CALIBRATION`, the table for the configured field,
+shipped as a constant. Any other field is calibrated on first use (NumPy,
+`DEFAULT_RACES` races) and cached on disk; re‑run the script and paste its
+output to ship a new table after changing the weights, finish line, target
+RTP or the race engine:
+
+    python horse_odds.py            # calibrate, check, print GAME_CALIBRATION
+"""
+from __future__ import annotations
+
+import math
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import disk_cache
+
+DEFAULT_RTP     = 0.95
+DEFAULT_RACES   = 250_000
+GAME_RACES      = 2_000_000    # sample behind the shipped table
+PAYOUT_STEP     = 0.1          # multipliers are rounded to this
+RTP_TOLERANCE   = 0.01         # |table RTP - target| allowed by `check`
+Z_95            = 1.959964
+ENGINE_VERSION  = 2            # bump when the race rules change
+
+
+# ───────────────────────────── calibration ─────────────────────────────
+@dataclass(frozen=True)
+class Calibration:
+    weights: Tuple[float, ...]
+    finish: int
+    races: int
+    target_rtp: float
+    win_prob: Tuple[float, ...]
+    ci_low: Tuple[float, ...]
+    ci_high: Tuple[float, ...]
+    multipliers: Tuple[float, ...]   # stake * multiplier = return
+    engine: int = ENGINE_VERSION
+
+    @property
+    def rtps(self) -> Tuple[float, ...]:
+        """RTP of a bet on each horse under these multipliers."""
+        return tuple(p * m for p, m in zip(self.win_prob, self.multipliers))
+
+    @property
+    def rtp(self) -> float:
+        """RTP of a bet on a uniformly chosen horse."""
+        return sum(self.rtps) / len(self.weights)
+
+
+def _wilson(wins: int, n: int) -> Tuple[float, float]:
+    """95 % Wilson score interval – stays sane for p near 0."""
+    p = wins / n
+    z2 = Z_95 * Z_95
+    centre = (p + z2 / (2 * n)) / (1 + z2 / n)
+    half = Z_95 * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def calibrate(weights: Sequence[float], finish: int, *,
+              races: int = DEFAULT_RACES, target_rtp: float = DEFAULT_RTP,
+              step: float = PAYOUT_STEP, workers: int | None = None,
+              seed: int | None = None) -> Calibration:
+    """Race *races* fields and derive win probabilities + payout multipliers.
+
+    Raises `ValueError` when some horse cannot be priced: it never won, or
+    it wins so often that its rounded multiplier is not above x1.
+    """
+    from horse_sim import win_counts            # NumPy – offline only
+    counts = win_counts(weights, finish, races, workers=workers, seed=seed)
+    probs = [c / races for c in counts]
+    mults = []
+    for i, p in enumerate(probs):
+        if not p:
+            raise ValueError(f"horse {i + 1} never won in {races:,} races")
+        m = round(round(target_rtp / p / step) * step, 4)
+        if m <= 1.0:
+            raise ValueError(f"horse {i + 1} wins {p:.1%} of races – "
+                             f"x{m} would not return more than the stake")
+        mults.append(m)
+    cis = [_wilson(c, races) for c in counts]
+    return Calibration(tuple(float(w) for w in weights), finish, races, target_rtp,
+                       tuple(probs), tuple(round(lo, 7) for lo, _ in cis),
+                       tuple(round(hi, 7) for _, hi in cis), tuple(mults))
+
+
+def check(cal: Calibration, step: float = PAYOUT_STEP) -> List[str]:
+    """What is wrong with *cal* as a payout table (empty = fine)."""
+    problems = []
+    for i, (p, m, rtp) in enumerate(zip(cal.win_prob, cal.multipliers, cal.rtps)):
+        if m <= 1.0:
+            problems.append(f"horse {i + 1} pays x{m}, not more than the stake")
+        if abs(rtp - cal.target_rtp) > p * step / 2 + 1e-9:
+            problems.append(f"horse {i + 1} returns {rtp:.4f}, "
+                            f"more than rounding from {cal.target_rtp}")
+    if abs(cal.rtp - cal.target_rtp) > RTP_TOLERANCE:
+        problems.append(f"table RTP {cal.rtp:.4f} is off target {cal.target_rtp}")
+    return problems
+
+
+# ───────────────────────── shipped game table ──────────────────────────
+# `python horse_odds.py` for common.HORSE_WEIGHTS / HORSE_FINISH /
+# HORSE_TARGET_RTP (GAME_RACES races, seed 0).
+GAME_CALIBRATION = Calibration(
+    weights=(0.4, 0.3, 0.2, 0.1), finish=236, races=2000000, target_rtp=0.95,
+    win_prob=(0.4448785, 0.285297, 0.172487, 0.0973375),
+    ci_low=(0.4441899, 0.2846716, 0.171964, 0.0969275),
+    ci_high=(0.4455673, 0.2859232, 0.1730112, 0.0977491),
+    multipliers=(2.1, 3.3, 5.5, 9.8),
+    engine=2,
+)
+
+
+def _key(weights: Tuple[float, ...], finish: int, target_rtp: float) -> Dict[str, object]:
+    return {"weights": list(weights), "finish": finish, "target_rtp": target_rtp,
+            "races": DEFAULT_RACES, "engine": ENGINE_VERSION}
+
+
+def game_calibration(weights: Sequence[float], finish: int,
+                     target_rtp: float = DEFAULT_RTP) -> Calibration:
+    """Calibration for these race parameters.
+
+    The configured field comes from `GAME_CALIBRATION`; any other field is
+    calibrated once (seconds, needs NumPy) and cached on disk.
+    """
+    weights = tuple(float(w) for w in weights)
+    cal = GAME_CALIBRATION
+    if (cal.weights, cal.finish, cal.target_rtp, cal.engine) == \
+       (weights, finish, target_rtp, ENGINE_VERSION):
+        return cal
+    key = _key(weights, finish, target_rtp)
+    cached = disk_cache.load("horse-odds", key)
+    if cached is not None:
+        return Calibration(**{k: tuple(v) if isinstance(v, list) else v
+                              for k, v in cached.items()})
+    cal = calibrate(weights, finish, target_rtp=target_rtp, seed=0)
+    disk_cache.store("horse-odds", key, asdict(cal))
+    return cal
+
+
+def payout_table(weights: Sequence[float], finish: int, *,
+                 target_rtp: float = DEFAULT_RTP) -> List[float]:
+    """Payout multipliers (plain floats) for the given race parameters."""
+    return list(game_calibration(weights, finish, target_rtp).multipliers)
+
+
+def payout(stake: int, multiplier: float) -> int:
+    """Whole dollars paid on a winning *stake*, floored like the game's `int()`.
+
+    Float noise is rounded off first: 30 * 3.3 is 98.99999999999999.
+    """
+    return int(round(stake * multiplier, 6))
+
+
+def _literal(cal: Calibration) -> str:
+    return (f"GAME_CALIBRATION = Calibration(\n"
+            f"    weights={cal.weights}, finish={cal.finish}, "
+            f"races={cal.races}, target_rtp={cal.target_rtp},\n"
+            f"    win_prob={cal.win_prob},\n"
+            f"    ci_low={cal.ci_low},\n"
+            f"    ci_high={cal.ci_high},\n"
+            f"    multipliers={cal.multipliers},\n"
+            f"    engine={cal.engine},\n)")
+
+
+# ──────────────────────────── script entry ─────────────────────────────
+if __name__ == "__main__":
+    from common import HORSE_FINISH, HORSE_TARGET_RTP, HORSE_WEIGHTS
+    t0 = time.perf_counter()
+    cal = calibrate(HORSE_WEIGHTS, HORSE_FINISH, races=GAME_RACES,
+                    target_rtp=HORSE_TARGET_RTP, seed=0)
+    dt = time.perf_counter() - t0
+    print(f"{cal.races:,} races in {dt:.1f}s ({cal.races / dt:,.0f} races/s)")
+    for i, (p, lo, hi, m, rtp) in enumerate(zip(cal.win_prob, cal.ci_low, cal.ci_high,
+                                                 cal.multipliers, cal.rtps)):
+        print(f"horse {i + 1}: p={p:.5f}  95% CI [{lo:.5f}, {hi:.5f}]  "
+              f"pays x{m}  RTP {rtp:.4f}")
+    print(f"table RTP {cal.rtp:.4f} (target {cal.target_rtp})")
+    problems = check(cal) + check(GAME_CALIBRATION)
+    shipped = cal == GAME_CALIBRATION
+    print("shipped GAME_CALIBRATION is", "current" if shipped else "stale – paste:")
+    if not shipped:
+        print(_literal(cal))
+    for problem in problems:
+        print("FAIL:", problem)
+    sys.exit(1 if problems or not shipped else 0)
@@ -1,11 +1,33 @@
-import random
-import pyxel
-from common import BET_INCREMENT, NUM_HORSES, SCREEN_W, draw_text_center
+from __future__ import annotations
+
+from typing import NamedTuple, Tuple
+
+from backend import pyxel
+from common import (BET_INCREMENT, HORSE_FINISH, HORSE_TARGET_RTP, HORSE_WEIGHTS, NUM_HORSES,
+                    draw_text_center)
+from horse_engine import Race, simulate_race
+from horse_odds import payout, payout_table
+
+FINISH_LINE = HORSE_FINISH
+
+
+class HorseState(NamedTuple):
+    bet_idx: int
+    bet_amount: int
+    positions: Tuple[int, ...]
+    race: Race | None          # immutable once generated – shared, not copied
+    frame: int
+    winner: int | None
+
 
 class HorseRaceGame:
     def __init__(self, app) -> None:
         self.app  = app
-        self.odds = [0.4, 0.3, 0.2, 0.1]        # must sum to 1
+        self.rng  = app.rngs["horse"]
+        self.odds = list(HORSE_WEIGHTS)         # stride weights, must sum to 1
+        # calibrated return multipliers (shipped or cached, see horse_odds)
+        self.payouts = payout_table(self.odds, FINISH_LINE,
+                                    target_rtp=HORSE_TARGET_RTP)
         self.reset()
 
     # ----------------------------------------------------------------------
@@ -13,18 +35,34 @@ class HorseRaceGame:
         self.bet_idx     = 0
         self.bet_amount  = BET_INCREMENT
         self.positions   = [0] * NUM_HORSES
+        self.race        = None     # precomputed Race, replayed frame by frame
+        self.frame       = 0
         self.winner      = None     # None = betting, -1 = racing, >=0 = finished
         self.app.input.reset()
 
+    @property
+    def animating(self) -> bool:
+        """Race being replayed – the app must keep updating/drawing."""
+        return self.winner == -1
+
+    def snapshot(self) -> HorseState:
+        return HorseState(self.bet_idx, self.bet_amount, tuple(self.positions),
+                          self.race, self.frame, self.winner)
+
+    def restore(self, state: HorseState) -> None:
+        self.bet_idx, self.bet_amount = state.bet_idx, state.bet_amount
+        self.positions = list(state.positions)
+        self.race, self.frame, self.winner = state.race, state.frame, state.winner
+
     # ----------------------------------------------------------------------
     def update(self) -> None:
         ih = self.app.input
 
         # ------------------------ betting phase ----------------------------
         if self.winner is None:
-            if pyxel.btnp(pyxel.KEY_LEFT):
+            if ih.btnp(pyxel.KEY_LEFT):
                 self.bet_idx = (self.bet_idx - 1) % NUM_HORSES
-            if pyxel.btnp(pyxel.KEY_RIGHT):
+            if ih.btnp(pyxel.KEY_RIGHT):
                 self.bet_idx = (self.bet_idx + 1) % NUM_HORSES
 
             if ih.accelerated_press(pyxel.KEY_UP) and \
@@ -34,35 +72,35 @@ class HorseRaceGame:
                self.bet_amount - BET_INCREMENT >= BET_INCREMENT:
                 self.bet_amount -= BET_INCREMENT
 
-            if pyxel.btnp(pyxel.KEY_SPACE):          # start the race
-                self.app.balance -= self.bet_amount
+            if ih.btnp(pyxel.KEY_SPACE):          # start the race
+                self.app.ledger.bet("Horse", self.bet_amount)
+                self.race        = simulate_race(self.odds, FINISH_LINE, self.rng)
+                self.frame       = 0
                 self.positions   = [0] * NUM_HORSES
                 self.winner      = -1                 # now racing
 
-            if pyxel.btnp(pyxel.KEY_Q):
+            if ih.btnp(pyxel.KEY_Q):
                 self.app.to_menu()
                 return
 
         # ------------------------ racing phase -----------------------------
         if self.winner == -1:
-            for i in range(NUM_HORSES):
-                self.positions[i] += random.randint(
-                    0, int(3 + self.odds[i] * 5)
-                )
-                if self.positions[i] >= SCREEN_W - 20:
-                    self.winner = i
+            self.frame += 1                           # replay next row
+            self.positions = list(self.race.positions[self.frame])
+            if self.frame >= self.race.frames:
+                self.winner = self.race.winner        # photo-finish result
 
             if self.winner >= 0:                      # race finished
-                payout = int(self.bet_amount / self.odds[self.winner]) \
-                         if self.winner == self.bet_idx else 0
-                self.app.balance += payout
+                won = payout(self.bet_amount, self.payouts[self.winner]) \
+                      if self.winner == self.bet_idx else 0
+                self.app.ledger.payout("Horse", won)
 
         # ------------------------ post-race phase --------------------------
         if self.winner is not None and self.winner >= 0:
-            if pyxel.btnp(pyxel.KEY_RETURN):
+            if ih.btnp(pyxel.KEY_RETURN):
                 self.reset()
 
-        if pyxel.btnp(pyxel.KEY_Q):
+        if ih.btnp(pyxel.KEY_Q):
             self.app.to_menu()
 
     # ----------------------------------------------------------------------
@@ -71,18 +109,23 @@ class HorseRaceGame:
             draw_text_center("Horse-race betting", 30, 7)
             for i in range(NUM_HORSES):
                 color = 11 if i == self.bet_idx else 7
-                draw_text_center(f"Horse {i+1}  |  Odds {self.odds[i]:.2f}",
-                                 60 + i * 12, color)
-            draw_text_center(f"Bet: ${self.bet_amount}", 120, 11)
+                draw_text_center("Horse {}  |  Pays x{:.1f}", 60 + i * 12, color,
+                                 i + 1, self.payouts[i])
+            draw_text_center("Bet: ${}", 120, 11, self.bet_amount)
             draw_text_center("← → horse  •  ↑ ↓ bet  •  Space start  •  Q menu",
                              220, 5)
 
         else:                                         # race in progress / end
+            xs = self.positions
+            if self.winner == -1 and self.frame and self.app.alpha < 1.0:
+                a = self.app.alpha                    # between the last two rows
+                prev = self.race.positions[self.frame - 1]
+                xs = [p + (x - p) * a for p, x in zip(prev, xs)]
             for i in range(NUM_HORSES):
                 y = 40 + i * 20
-                pyxel.rect(self.positions[i], y, 16, 8, 8 + i)
+                pyxel.rect(xs[i], y, 16, 8, 8 + i)
             if self.winner == -1:                     # still racing
                 draw_text_center("Racing…", 200, 7)
             else:                                     # finished
-                draw_text_center(f"Horse {self.winner + 1} wins!", 200, 11)
+                draw_text_center("Horse {} wins!", 200, 11, self.winner + 1)
                 draw_text_center("Press Enter to bet again", 214, 5)
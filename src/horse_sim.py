@@ -0,0 +1,113 @@
+"""horse_sim.py – vectorised horse races for calibration (NumPy)
+
+Runs the `horse_engine` rules for thousands of races side by side and only
+keeps the winners – what `horse_odds.calibrate` needs to price a field.
+Strides are drawn `BLOCK_FRAMES` frames at a time as a (races, frames,
+horses) tensor; races still undecided after a block carry on. Shards run
+in worker processes where the platform has them.
+
+    python horse_sim.py                # win frequencies of the game's field
+"""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from horse_engine import BASE_STRIDE, surge_chances
+
+BLOCK_FRAMES = 64           # frames generated per NumPy batch
+CHUNK_RACES  = 20_000
+SHARDS       = 16           # independent RNG streams per run
+
+
+def draw_strides(rng: np.random.Generator, surge: np.ndarray,
+                 lead_shape: tuple) -> np.ndarray:
+    """Strides for every horse, shape `lead_shape + (n,)`: two RNG calls."""
+    shape = lead_shape + (surge.size,)
+    out = rng.integers(0, BASE_STRIDE + 1, size=shape, dtype=np.int16)
+    out += rng.random(shape) < surge
+    return out
+
+
+def photo_finish(before: np.ndarray, after: np.ndarray, finish: int) -> np.ndarray:
+    """`horse_engine.photo_finish` for whole arrays of horses."""
+    stride = (after - before).astype(np.float64)
+    crossed = (after >= finish) & (before < finish)
+    frac = np.full(after.shape, np.inf)
+    np.divide(finish - before, stride, out=frac, where=crossed)
+    return frac
+
+
+def simulate_winners(weights: Sequence[float], finish: int, races: int,
+                     rng: np.random.Generator) -> np.ndarray:
+    """Winner index of *races* independent races, all run side by side."""
+    surge = np.asarray(surge_chances(weights))
+    pos = np.zeros((races, 1, len(weights)), dtype=np.int16)
+    active = np.arange(races)
+    winners = np.empty(races, dtype=np.int32)
+    while active.size:
+        strides = draw_strides(rng, surge, (active.size, BLOCK_FRAMES))
+        path = np.concatenate((pos, pos + np.cumsum(strides, axis=1, dtype=np.int16)), axis=1)
+        done = path[:, -1].max(axis=1) >= finish      # positions only grow
+        if done.any():
+            rows = np.flatnonzero(done)
+            crossed = (path[rows, 1:] >= finish).any(axis=2)
+            f = crossed.argmax(axis=1)                    # first deciding frame
+            frac = photo_finish(path[rows, f], path[rows, f + 1], finish)
+            best = frac == frac.min(axis=1, keepdims=True)
+            # exact photo‑finish ties: uniform pick among the tied horses
+            winners[active[rows]] = np.where(best, rng.random(frac.shape), -1).argmax(axis=1)
+        pos = path[~done, -1:]
+        active = active[~done]
+    return winners
+
+
+def _count_wins(args: Tuple[Sequence[float], int, int, np.random.SeedSequence]) -> np.ndarray:
+    weights, finish, races, seed = args
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(len(weights), dtype=np.int64)
+    for lo in range(0, races, CHUNK_RACES):
+        w = simulate_winners(weights, finish, min(CHUNK_RACES, races - lo), rng)
+        counts += np.bincount(w, minlength=len(weights))
+    return counts
+
+
+def win_counts(weights: Sequence[float], finish: int, races: int, *,
+               workers: int | None = None, seed: int | None = None) -> List[int]:
+    """How many of *races* races each horse won.
+
+    The races are split into `SHARDS` fixed streams, so a seed gives the
+    same counts on any number of cores.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = np.random.SeedSequence(seed).spawn(SHARDS)
+    shares = [races // SHARDS + (i < races % SHARDS) for i in range(SHARDS)]
+    jobs = [(tuple(weights), finish, share, s) for share, s in zip(shares, seeds) if share]
+
+    counts = None
+    if workers > 1 and len(jobs) > 1:
+        try:
+            with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+                counts = sum(pool.map(_count_wins, jobs))
+        except (OSError, ImportError, NotImplementedError, BrokenProcessPool):
+            counts = None                        # no processes (e.g. web build)
+    if counts is None:
+        counts = sum(_count_wins(job) for job in jobs)
+    return [int(c) for c in counts]
+
+
+# ──────────────────────────── script entry ─────────────────────────────
+if __name__ == "__main__":
+    from common import HORSE_FINISH, HORSE_WEIGHTS
+    races = 1_000_000
+    t0 = time.perf_counter()
+    counts = win_counts(HORSE_WEIGHTS, HORSE_FINISH, races, seed=0)
+    dt = time.perf_counter() - t0
+    print(f"{races:,} races in {dt:.1f}s ({races / dt:,.0f} races/s)")
+    for i, c in enumerate(counts):
+        print(f"horse {i + 1}: wins {c / races:.4f}")
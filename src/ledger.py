@@ -0,0 +1,264 @@
+"""ledger.py – append‑only balance ledger with write‑behind persistence
+
+Every change to the player's balance is a `Ledger` transaction (game, kind,
+amount, balance after). Transactions are applied in memory immediately and
+packed into a buffer; the buffer is handed to a background writer in
+batches (`tick()` once a frame, at most every `FLUSH_SECONDS`), so the
+frame loop never waits on the disk.
+
+On disk (`DATA_DIR`, or `CASINO_DATA_DIR`):
+
+    balance.log    fixed‑size records, each with its own CRC32
+    balance.snap   (seq, balance) written atomically every
+                   `SNAPSHOT_EVERY` transactions; the log is then truncated
+
+Recovery loads the snapshot and replays only the log records after it;
+a torn record at the end of the log (crash mid‑write) is dropped.
+
+    python ledger.py            # balance + last transactions
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+from typing import Iterator, List, NamedTuple, Tuple
+
+log = logging.getLogger(__name__)
+
+DATA_DIR = os.environ.get(
+    "CASINO_DATA_DIR",
+    os.path.join(os.path.expanduser("~"), ".local", "share", "pyxel-casino"),
+)
+LOG_NAME, SNAP_NAME = "balance.log", "balance.snap"
+
+FLUSH_SECONDS  = 1.0        # max age of an unflushed transaction
+FLUSH_RECORDS  = 64         # …or this many pending, whichever comes first
+SNAPSHOT_EVERY = 256        # transactions between snapshots
+
+BET, PAYOUT, RESET = 1, 2, 3
+KIND_NAME = {BET: "bet", PAYOUT: "payout", RESET: "reset"}
+
+_RECORD = struct.Struct("<Q12sBqq")   # seq, game, kind, amount, balance after
+_CRC    = struct.Struct("<I")
+_SNAP   = struct.Struct("<4sQq")      # magic, seq, balance (+ CRC32)
+SNAP_MAGIC = b"LSN1"
+RECORD_SIZE = _RECORD.size + _CRC.size
+
+
+class Txn(NamedTuple):
+    seq: int
+    game: str
+    kind: int
+    amount: int        # signed change applied to the balance
+    balance: int       # balance after this transaction
+
+
+def _pack(txn: Txn) -> bytes:
+    body = _RECORD.pack(txn.seq, txn.game.encode()[:12], txn.kind,
+                        txn.amount, txn.balance)
+    return body + _CRC.pack(zlib.crc32(body))
+
+
+def read_log(path: str) -> Tuple[List[Txn], int]:
+    """Valid records of *path* and the byte length they cover."""
+    try:
+        with open(path, "rb") as fh:
+            blob = fh.read()
+    except OSError:
+        return [], 0
+    txns, off = [], 0
+    while off + RECORD_SIZE <= len(blob):
+        body = blob[off:off + _RECORD.size]
+        (crc,) = _CRC.unpack_from(blob, off + _RECORD.size)
+        if zlib.crc32(body) != crc:
+            break                                   # torn / corrupt tail
+        seq, game, kind, amount, balance = _RECORD.unpack(body)
+        txns.append(Txn(seq, game.rstrip(b"\0").decode(), kind, amount, balance))
+        off += RECORD_SIZE
+    return txns, off
+
+
+def read_snapshot(path: str) -> Tuple[int, int] | None:
+    """(seq, balance) of the snapshot at *path*, or None if missing/corrupt."""
+    try:
+        with open(path, "rb") as fh:
+            blob = fh.read()
+    except OSError:
+        return None
+    if len(blob) != _SNAP.size + _CRC.size:
+        return None
+    (crc,) = _CRC.unpack_from(blob, _SNAP.size)
+    magic, seq, balance = _SNAP.unpack_from(blob)
+    if magic != SNAP_MAGIC or zlib.crc32(blob[:_SNAP.size]) != crc:
+        return None
+    return seq, balance
+
+
+# ───────────────────────── background writer ───────────────────────────
+class _Writer:
+    """
+    Owns the files. Jobs run on a daemon thread; where threads are not
+    available (e.g. the Pyodide web build) they run inline instead.
+    """
+
+    def __init__(self, directory: str, valid_bytes: int) -> None:
+        self.log_path  = os.path.join(directory, LOG_NAME)
+        self.snap_path = os.path.join(directory, SNAP_NAME)
+        os.makedirs(directory, exist_ok=True)
+        self._log = open(self.log_path, "ab")
+        self._log.truncate(valid_bytes)             # drop a torn tail
+        self._jobs: "queue.Queue" = queue.Queue()
+        self.error: OSError | None = None           # first failed write, if any
+        try:
+            self._thread: threading.Thread | None = threading.Thread(
+                target=self._run, name="ledger-writer", daemon=True)
+            self._thread.start()
+        except RuntimeError:
+            self._thread = None
+
+    def submit(self, job: tuple) -> None:
+        if self._thread is None:
+            self._do(job)
+        else:
+            self._jobs.put(job)
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._jobs.put(None)
+            self._thread.join()
+        self._log.close()
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            self._do(job)
+
+    def _do(self, job: tuple) -> None:
+        try:
+            if job[0] == "append":
+                self._log.write(job[1])
+                self._log.flush()
+                os.fsync(self._log.fileno())
+            else:                                   # ("snapshot", seq, balance)
+                body = _SNAP.pack(SNAP_MAGIC, job[1], job[2])
+                tmp = self.snap_path + ".tmp"
+                with open(tmp, "wb") as fh:
+                    fh.write(body + _CRC.pack(zlib.crc32(body)))
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                os.replace(tmp, self.snap_path)
+                self._log.truncate(0)               # all of it ≤ snapshot seq
+        except OSError as exc:                      # keep playing, say why
+            log.error("ledger write failed: %s", exc)
+            if self.error is None:
+                self.error = exc
+
+
+# ───────────────────────────── ledger ──────────────────────────────────
+class Ledger:
+    """
+    The balance and its transaction history. `directory=None` keeps it in
+    memory only (headless runs, replays); otherwise state is recovered
+    from *directory* and every transaction is persisted write‑behind.
+    """
+
+    def __init__(self, starting_balance: int, directory: str | None = None) -> None:
+        self.balance = starting_balance
+        self.seq     = 0
+        self.recent: List[Txn] = []        # since the last snapshot
+        self._pending = bytearray()
+        self._pending_since = 0.0
+        self._writer: _Writer | None = None
+        if directory is not None:
+            valid = self._recover(directory)
+            self._writer = _Writer(directory, valid)
+
+    def _recover(self, directory: str) -> int:
+        snap = read_snapshot(os.path.join(directory, SNAP_NAME))
+        if snap is not None:
+            self.seq, self.balance = snap
+        txns, valid = read_log(os.path.join(directory, LOG_NAME))
+        for txn in txns:
+            if txn.seq > self.seq:                  # log tail after snapshot
+                self.seq, self.balance = txn.seq, txn.balance
+                self.recent.append(txn)
+        return valid
+
+    # ------------------------------------------------------ transactions
+    def bet(self, game: str, stake: int) -> None:
+        self._post(game, BET, -stake)
+
+    def payout(self, game: str, amount: int) -> None:
+        self._post(game, PAYOUT, amount)
+
+    def reset(self, game: str, balance: int) -> None:
+        """Set the balance outright (e.g. the game‑over refill)."""
+        self._post(game, RESET, balance - self.balance)
+
+    def _post(self, game: str, kind: int, amount: int) -> None:
+        self.seq += 1
+        self.balance += amount
+        txn = Txn(self.seq, game, kind, amount, self.balance)
+        self.recent.append(txn)
+        if self._writer is None:
+            if len(self.recent) > SNAPSHOT_EVERY:
+                del self.recent[:-SNAPSHOT_EVERY]
+            return
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending += _pack(txn)
+        if self.seq % SNAPSHOT_EVERY == 0:
+            self.flush()
+            self._writer.submit(("snapshot", self.seq, self.balance))
+            self.recent.clear()
+        elif len(self._pending) >= FLUSH_RECORDS * RECORD_SIZE:
+            self.flush()
+
+    # ------------------------------------------------------- persistence
+    @property
+    def error(self) -> OSError | None:
+        """First write the background writer failed, or None while saving works."""
+        return self._writer.error if self._writer is not None else None
+
+    def tick(self) -> None:
+        """Once per frame: hand old enough pending records to the writer."""
+        if self._pending and time.monotonic() - self._pending_since >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending and self._writer is not None:
+            self._writer.submit(("append", bytes(self._pending)))
+            self._pending.clear()
+
+    def close(self) -> None:
+        """Flush everything and wait for the writer (call at exit)."""
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+
+
+def history(directory: str = DATA_DIR) -> Iterator[Txn]:
+    """Transactions still on disk (those after the latest snapshot)."""
+    snap = read_snapshot(os.path.join(directory, SNAP_NAME))
+    floor = snap[0] if snap else 0
+    return (t for t in read_log(os.path.join(directory, LOG_NAME))[0] if t.seq > floor)
+
+
+# ──────────────────────────── script entry ─────────────────────────────
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else DATA_DIR
+    snap = read_snapshot(os.path.join(directory, SNAP_NAME))
+    txns = list(history(directory))
+    print(f"snapshot: {snap}  log tail: {len(txns)} transaction(s)")
+    for t in txns[-20:]:
+        print(f"#{t.seq:<6} {t.game:<9} {KIND_NAME.get(t.kind, '?'):<6} "
+              f"{t.amount:+7d}  → {t.balance}")
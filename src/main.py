@@ -1,30 +1,172 @@
-import pyxel
-from common import SCREEN_W, SCREEN_H, STARTING_BALANCE, draw_text_center, InputHelper
-from roulette import RouletteGame
-from blackjack import BlackjackGame
-from horse_racing import HorseRaceGame
+from __future__ import annotations
+
+import time
+
+_T0 = time.perf_counter()
+
+import argparse
+import atexit
+import logging
+import os
+import random
+
+import backend
+from backend import NullPyxel, pyxel
+from common import (MAX_CATCHUP, RENDER_FPS, SCREEN_W, SCREEN_H, SIM_FPS, STARTING_BALANCE,
+                    TEXT_CACHE, draw_text_center, InputHelper, RngStreams)
+from ledger import DATA_DIR, Ledger
+from replay import RECORDED, InputRecorder, SessionLog
+from rewind import QUICKSAVE_NAME, AppState, RewindBuffer, load_state, save_state
+from scenes import SCENES, SceneRegistry
+
+STARTUP_BUDGET_MS = 250         # import + CasinoApp() before the first frame
+IMPORT_MS = (time.perf_counter() - _T0) * 1000
+
+log = logging.getLogger("casino")
 
 
 class CasinoApp:
     """Top‑level application – holds balance, menu, game‑over screen."""
 
-    def __init__(self) -> None:
-        pyxel.init(SCREEN_W, SCREEN_H, title="Rems Casino 🏨🎰")
+    SAVE_EVERY  = 600           # frames between session‑log flushes
+    IDLE_GRACE  = 2             # settle frames before going idle
+    IDLE_REDRAW = 30            # idle refresh interval (1 Hz at 30 fps)
 
-        self.balance = STARTING_BALANCE
+    def __init__(self, headless: bool = False, seed: int | None = None,
+                 record: str | None = None, profile: str | None = None,
+                 ledger_dir: str | None = None, dev: bool = False,
+                 fps: int = RENDER_FPS) -> None:
+        t0 = time.perf_counter()
+        self.headless = headless
+        self.dev      = dev        # rewind + quick‑save/load keys (never in the packaged game)
+        if headless:
+            backend.use(NullPyxel())
+        pyxel.init(SCREEN_W, SCREEN_H, title="Rems Casino 🏨🎰", fps=fps)
+        TEXT_CACHE.clear()                 # label atlas belongs to this init
+
+        self.seed    = seed if seed is not None else random.SystemRandom().getrandbits(32)
+        self.rngs    = RngStreams(self.seed)   # seed + input log replay a session
+        self.frame   = 0            # simulation ticks so far
+        self.alpha   = 1.0          # draw‑time position between the last two ticks
+        self._clock: float | None = None
+        self._lag    = 0.0          # wall time not yet simulated, in seconds
+        self.ledger  = Ledger(STARTING_BALANCE, ledger_dir)
+        self.unsaved = False        # the ledger could not write – warn on screen
         self.input   = InputHelper()
+        atexit.register(self.ledger.close)
+
+        # ------------------------- idle state --------------------------
+        self.idle_frames = 0
+
+        # ---------------------- record / replay ------------------------
+        self.balance_log = None    # [(frame, balance)] on every change
+        self.recorder    = None
+        self.record_path = record
+        self.start_balance = self.ledger.balance
+        if record:
+            self.recorder    = InputRecorder()
+            self.balance_log = []
+            atexit.register(self.save_recording)
+
+        # ------------------------- profiling ---------------------------
+        self.profiler = None       # profiler.FrameProfiler; F1 toggles
+        self.profile_path = profile
+        if profile:
+            self.toggle_profiler()
+            atexit.register(self.export_profile)
+
+        # --------------------- rewind / quick‑save ---------------------
+        self.history   = RewindBuffer()
+        self.rewinding = False
+        self.quicksave: AppState | None = None
+        self.save_path = os.path.join(ledger_dir, QUICKSAVE_NAME) if ledger_dir else None
 
         # ---------------------------- state ----------------------------
-        self.scene      = "menu"   # "menu" | "Roulette" | "Blackjack" | "Horse" | "game_over"
+        self.scene      = "menu"   # "menu" | "game_over" | a `scenes.SCENES` key
         self.menu_idx   = 0
-        self.menu_items = ["Roulette", "Blackjack", "Horse Race"]
+        self.menu_items = list(SCENES.values())
 
         # ------------------------- sub‑games ---------------------------
-        self.roulette  = RouletteGame(self)
-        self.blackjack = BlackjackGame(self)
-        self.horse     = HorseRaceGame(self)
+        self.games = SceneRegistry(self)      # built on first selection
+
+        self.startup_ms = IMPORT_MS + (time.perf_counter() - t0) * 1000
+        if self.startup_ms > STARTUP_BUDGET_MS:
+            log.debug("startup took %.0f ms (budget %d ms)",
+                      self.startup_ms, STARTUP_BUDGET_MS)
+
+        if not headless:
+            pyxel.run(self.update, self.draw)
+
+    # ------------------------------------------------ headless stepping -
+    def step(self, frames: int = 1, draw: bool = True) -> None:
+        """Run *frames* complete frames of one tick each (headless mode only)."""
+        null = backend.active()
+        for _ in range(frames):
+            self.input.sample()
+            self.tick()
+            if draw:
+                self.draw()
+            null.end_frame()
+
+    def save_recording(self) -> None:
+        SessionLog(self.seed, self.frame, self.recorder.events,
+                   self.balance_log, self.start_balance, self.dev).save(self.record_path)
 
-        pyxel.run(self.update, self.draw)
+    # ------------------------------------------------ profiling --------
+    def toggle_profiler(self) -> None:
+        if self.profiler is None:
+            try:
+                from profiler import FrameProfiler   # NumPy – keep off startup
+            except ImportError:                      # web build: no NumPy
+                log.warning("the profiler needs NumPy")
+                return
+            self.profiler = FrameProfiler()
+        else:
+            self.profiler.close()
+            self.profiler = None
+
+    def export_profile(self) -> None:
+        if self.profiler is not None:
+            self.profiler.export(self.profile_path)
+
+    # ------------------------------------------------ balance ----------
+    @property
+    def balance(self) -> int:
+        """Read‑only; change it through `self.ledger`."""
+        return self.ledger.balance
+
+    # ------------------------------------------------ snapshots --------
+    def snapshot(self) -> AppState:
+        return AppState(self.scene, self.menu_idx, self.balance,
+                        self.rngs.snapshot(), self.input.snapshot(),
+                        tuple((name, game.snapshot())
+                              for name, game in self.games.loaded.items()))
+
+    def restore(self, state: AppState) -> None:
+        self.scene, self.menu_idx = state.scene, state.menu_idx
+        if state.balance != self.balance:
+            self.ledger.reset("rewind", state.balance)
+        self.rngs.restore(state.rngs)
+        saved = dict(state.games)
+        for name, game in self.games.loaded.items():
+            if name not in saved:               # built after the snapshot
+                game.reset()
+        for name, game_state in saved.items():
+            self.games[name].restore(game_state)
+        self.input.restore(state.input)         # after `reset()` cleared it
+
+    def quick_save(self) -> None:
+        self.quicksave = self.snapshot()
+        if self.save_path:
+            save_state(self.save_path, self.quicksave)
+
+    def quick_load(self) -> None:
+        state = self.quicksave
+        if state is None and self.save_path:
+            state = self.quicksave = load_state(self.save_path)
+        if state is not None:
+            self.restore(state)
+            self.history.clear()
 
     # ------------------------------------------------ scene helpers ----
     def to_menu(self) -> None:
@@ -34,6 +176,79 @@ class CasinoApp:
 
     # ------------------------------------------------ update loop ------
     def update(self) -> None:
+        """Pyxel's frame callback: catch the simulation up with wall time."""
+        tick = 1.0 / SIM_FPS
+        now = time.perf_counter()
+        if self._clock is None:                  # first frame: one tick
+            self._clock = now - tick
+        self._lag += now - self._clock
+        self._clock = now
+        self.input.sample()                      # the frame's only keyboard read
+        for _ in range(MAX_CATCHUP):
+            if self._lag < tick:
+                break
+            self._lag -= tick
+            self.tick()
+        else:
+            self._lag %= tick                    # stalled: drop, don't race
+        self.alpha = self._lag / tick
+
+    def tick(self) -> None:
+        """Advance the whole game by one fixed `SIM_FPS` step."""
+        ih = self.input
+        ih.poll()
+        if self.recorder is not None:
+            self.recorder.record(self.frame, ih.held, ih.pressed)
+        if ih.btnp(pyxel.KEY_F1):
+            self.toggle_profiler()
+        if self.dev:
+            if ih.btnp(pyxel.KEY_F5):
+                self.quick_save()
+            if ih.btnp(pyxel.KEY_F9):
+                self.quick_load()
+        if (ih.held | ih.pressed) & RECORDED or self._animating():
+            self.idle_frames = 0
+        else:
+            self.idle_frames += 1
+        self.rewinding = self.dev and ih.btn(pyxel.KEY_R)
+        prof = self.profiler
+        if self.idle:                            # nothing can change
+            pass
+        elif self.rewinding:
+            state = self.history.pop()
+            if state is not None:
+                self.restore(state)
+        else:
+            if self.dev:
+                self.history.push(self.snapshot())
+            if prof is None:
+                self._update_scene()
+            else:
+                prof.begin_update(self.scene)
+                self._update_scene()
+                prof.end_update()
+        changes = self.balance_log
+        if changes is not None and (not changes or changes[-1][1] != self.balance):
+            changes.append((self.frame, self.balance))
+        self.frame += 1
+        self.ledger.tick()
+        if not self.unsaved and self.ledger.error is not None:
+            self.unsaved = True
+            log.warning("balance is no longer being saved: %s", self.ledger.error)
+        # pyxel may exit the process without running atexit hooks
+        if self.recorder is not None and self.frame % self.SAVE_EVERY == 0:
+            self.save_recording()
+
+    # ------------------------------------------------ idle detection ---
+    @property
+    def idle(self) -> bool:
+        return self.idle_frames > self.IDLE_GRACE
+
+    def _animating(self) -> bool:
+        game = self.games.get(self.scene)
+        return game is not None and game.animating
+
+    def _update_scene(self) -> None:
         """Delegates to current scene and monitors bankrupt condition."""
         # bankrupcy check *before* doing anything else
         if self.balance <= 0 and self.scene != "game_over":
@@ -43,65 +258,66 @@ class CasinoApp:
 
         if self.scene == "menu":
             self._update_menu()
-        elif self.scene == "Roulette":
-            self.roulette.update()
-        elif self.scene == "Blackjack":
-            self.blackjack.update()
-        elif self.scene == "Horse":
-            self.horse.update()
         elif self.scene == "game_over":
             self._update_game_over()
+        else:
+            self.games[self.scene].update()
 
     # ---------------------- per‑scene update helpers ------------------
     def _update_menu(self) -> None:
-        if pyxel.btnp(pyxel.KEY_DOWN):
+        ih = self.input
+        if ih.btnp(pyxel.KEY_DOWN):
             self.menu_idx = (self.menu_idx + 1) % len(self.menu_items)
-        if pyxel.btnp(pyxel.KEY_UP):
+        if ih.btnp(pyxel.KEY_UP):
             self.menu_idx = (self.menu_idx - 1) % len(self.menu_items)
 
-        if pyxel.btnp(pyxel.KEY_RETURN):
-            choice = self.menu_items[self.menu_idx]
-            if choice == "Roulette":
-                self.scene = "Roulette"
-                self.roulette.reset()
-            elif choice == "Blackjack":
-                self.scene = "Blackjack"
-                self.blackjack.start_new()
-            else:
-                self.scene = "Horse"
-                self.horse.reset()
+        if ih.btnp(pyxel.KEY_RETURN):
+            choice = self.menu_items[self.menu_idx].name
+            self.games[choice].reset()
+            self.scene = choice
 
     def _update_game_over(self) -> None:
         # Any key? we'll stick to Enter / Space so it matches other screens
-        if pyxel.btnp(pyxel.KEY_RETURN) or pyxel.btnp(pyxel.KEY_SPACE):
-            self.balance = STARTING_BALANCE
-            self.roulette.reset()
-            self.blackjack.reset()
-            self.horse.reset()
+        if self.input.btnp(pyxel.KEY_RETURN, pyxel.KEY_SPACE):
+            self.ledger.reset("app", STARTING_BALANCE)
+            for game in self.games.loaded.values():   # unbuilt ones start fresh
+                game.reset()
             self.to_menu()
 
     # ------------------------------------------------ draw loop --------
     def draw(self) -> None:
+        if self.idle and self.profiler is None and self.idle_frames % self.IDLE_REDRAW:
+            return                               # framebuffer still valid
+        prof = self.profiler
+        if prof is None:
+            self._draw_scene()
+        else:
+            prof.begin_draw()
+            self._draw_scene()
+            prof.end_draw()
+            prof.draw_overlay(pyxel)
+
+    def _draw_scene(self) -> None:
         pyxel.cls(0)
-        draw_text_center(f"Balance: ${self.balance}", 2, 10)
+        draw_text_center("Balance: ${}", 2, 10, self.balance)
+        if self.rewinding:
+            draw_text_center("<< rewind {}", 12, 8, len(self.history))
+        if self.unsaved:
+            draw_text_center("Balance not saved!", SCREEN_H - 10, 8)
 
         if self.scene == "menu":
             self._draw_menu()
-        elif self.scene == "Roulette":
-            self.roulette.draw()
-        elif self.scene == "Blackjack":
-            self.blackjack.draw()
-        elif self.scene == "Horse":
-            self.horse.draw()
         elif self.scene == "game_over":
             self._draw_game_over()
+        else:
+            self.games[self.scene].draw()
 
     # ---------------------- per‑scene draw helpers --------------------
     def _draw_menu(self) -> None:
         draw_text_center("=== Rems Casino ===", 40, 7)
-        for idx, name in enumerate(self.menu_items):
+        for idx, spec in enumerate(self.menu_items):
             col = 11 if idx == self.menu_idx else 7
-            draw_text_center(name, 60 + idx * 10, col)
+            draw_text_center(spec.label, 60 + idx * 10, col)
         draw_text_center("↑↓ move  •  Enter select", 200, 5)
 
     def _draw_game_over(self) -> None:
@@ -110,5 +326,47 @@ class CasinoApp:
         draw_text_center("Press Enter to restart with $500", 140, 11)
 
 
+def soak(frames: int, seed: int = 0, profile: str | None = None) -> None:
+    """Mash random keys headless for *frames* frames and report throughput."""
+    app  = CasinoApp(headless=True, seed=seed, profile=profile, dev=True)
+    null = backend.active()
+    rng  = random.Random(seed)
+    keys = [null.KEY_UP, null.KEY_DOWN, null.KEY_LEFT, null.KEY_RIGHT,
+            null.KEY_RETURN, null.KEY_SPACE, null.KEY_TAB, null.KEY_A,
+            null.KEY_H, null.KEY_S, null.KEY_Q, null.KEY_R]
+    visits: dict = {}
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        if rng.random() < 0.3:
+            null.tap(rng.choice(keys))
+        app.step()
+        visits[app.scene] = visits.get(app.scene, 0) + 1
+    dt = time.perf_counter() - t0
+    print(f"{frames:,} frames in {dt:.2f}s ({frames / dt:,.0f} fps)  "
+          f"balance ${app.balance}  scenes {visits}")
+    loads = "  ".join(f"{n} {ms:.0f}" for n, ms in app.games.load_ms.items())
+    print(f"startup {app.startup_ms:.0f} ms (budget {STARTUP_BUDGET_MS})  "
+          f"first‑load ms: {loads}")
+
+
 if __name__ == "__main__":
-    CasinoApp()
+    parser = argparse.ArgumentParser(description="Rems Casino")
+    parser.add_argument("--headless", type=int, metavar="FRAMES",
+                        help="soak‑test without a window for FRAMES frames")
+    parser.add_argument("--seed", type=int, help="seed every RNG stream")
+    parser.add_argument("--record", metavar="PATH",
+                        help="log inputs + balance for `replay.py PATH`")
+    parser.add_argument("--ledger", metavar="DIR", default=DATA_DIR,
+                        help=f"where the balance is kept (default {DATA_DIR})")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="profile from the start, export to PATH (.csv/.json) on exit")
+    parser.add_argument("--fps", type=int, choices=(30, 60), default=RENDER_FPS,
+                        help="render rate; 60 draws twice per tick, interpolated")
+    parser.add_argument("--dev", action="store_true",
+                        help="enable R rewind and F5 / F9 quick‑save / quick‑load")
+    args = parser.parse_args()
+    if args.headless:
+        soak(args.headless, args.seed or 0, args.profile)
+    else:
+        CasinoApp(seed=args.seed, record=args.record, profile=args.profile,
+                  ledger_dir=args.ledger, dev=args.dev, fps=args.fps)
@@ -0,0 +1,173 @@
+"""profiler.py – per‑scene frame‑time profiler + on‑screen overlay
+
+`CasinoApp` owns at most one `FrameProfiler`; while it is off the update /
+draw loop pays for a single `is None` check. While it is on, every frame's
+update time (all of its simulation ticks), draw time and pyxel draw‑call
+count are written into a fixed‑size ring buffer for the scene that was
+active when the frame began, so memory stays constant however long the session runs:
+
+    F1                           toggle profiler + overlay in game
+    python main.py --profile out.csv      export on exit (.csv or .json)
+    python main.py --headless 50000 --profile out.json
+
+Draw calls are counted by `DrawCounter`, a thin backend wrapper installed
+only while profiling (headless runs behave the same as the real window).
+"""
+from __future__ import annotations
+
+import csv
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+import backend
+from common import FRAME_BUDGET_MS
+
+RING_FRAMES   = 1024        # samples kept per scene (~34 s at 30 fps)
+BUDGET_MS     = FRAME_BUDGET_MS   # 33 ms, even when rendering at 60 fps
+REFRESH_EVERY = 15          # frames between overlay percentile refreshes
+PERCENTILES   = (50, 95, 99)
+
+DRAW_CALLS = ("cls", "pset", "line", "rect", "rectb", "circ", "circb", "elli",
+              "ellib", "tri", "trib", "fill", "blt", "bltm", "text")
+
+clock = time.perf_counter
+
+
+# ───────────────────────── draw‑call counting ──────────────────────────
+def _counted(name: str) -> Callable[..., Any]:
+    def call(self: "DrawCounter", *args: Any, **kwargs: Any) -> Any:
+        self.calls += 1
+        return getattr(self._impl, name)(*args, **kwargs)
+    call.__name__ = name
+    return call
+
+
+class DrawCounter:
+    """Backend wrapper that counts drawing calls and forwards everything."""
+
+    def __init__(self, impl: Any) -> None:
+        self._impl = impl
+        self.calls = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._impl, name)
+
+
+for _name in DRAW_CALLS:
+    setattr(DrawCounter, _name, _counted(_name))
+del _name
+
+
+# ───────────────────────── ring buffers ────────────────────────────────
+class SceneRing:
+    """Last `RING_FRAMES` update/draw timings (ms) and draw counts of a scene."""
+
+    __slots__ = ("update_ms", "draw_ms", "draw_calls", "count")
+
+    def __init__(self, size: int = RING_FRAMES) -> None:
+        self.update_ms  = np.zeros(size, dtype=np.float32)
+        self.draw_ms    = np.zeros(size, dtype=np.float32)
+        self.draw_calls = np.zeros(size, dtype=np.int32)
+        self.count      = 0          # total frames ever recorded
+
+    def add(self, update_ms: float, draw_ms: float, calls: int) -> None:
+        i = self.count % self.update_ms.size
+        self.update_ms[i]  = update_ms
+        self.draw_ms[i]    = draw_ms
+        self.draw_calls[i] = calls
+        self.count += 1
+
+    def stats(self) -> Dict[str, Any]:
+        n = min(self.count, self.update_ms.size)
+        upd, drw = self.update_ms[:n], self.draw_ms[:n]
+        total = upd + drw
+        out: Dict[str, Any] = {"frames": self.count, "samples": n}
+        for name, arr in (("update_ms", upd), ("draw_ms", drw),
+                          ("frame_ms", total), ("draw_calls", self.draw_calls[:n])):
+            pct = np.percentile(arr, PERCENTILES) if n else np.zeros(len(PERCENTILES))
+            for p, v in zip(PERCENTILES, pct):
+                out[f"{name}_p{p}"] = round(float(v), 3)
+        out["over_budget"] = int((total > BUDGET_MS).sum())
+        return out
+
+
+# ───────────────────────── profiler ────────────────────────────────────
+class FrameProfiler:
+    """
+    Collects per‑scene timings. The app brackets its scene update with
+    `begin_update(scene)` / `end_update()` and its draw with `begin_draw()` /
+    `end_draw()`; the frame is filed under the scene passed to the former.
+    """
+
+    def __init__(self) -> None:
+        self.rings: Dict[str, SceneRing] = {}
+        self.counter = backend.use(DrawCounter(backend.active()))
+        self._scene = ""
+        self._update_ms = self._draw_ms = 0.0
+        self._calls0 = 0
+        self._t0 = 0.0
+        self._frames = 0
+        self._cached: Dict[str, Dict[str, Any]] = {}
+
+    def close(self) -> None:
+        """Unhook the draw counter (only if nothing wrapped it since)."""
+        if backend.active() is self.counter:
+            backend.use(self.counter._impl)
+
+    # ------------------------------------------------------------ timing
+    def begin_update(self, scene: str) -> None:
+        self._scene = scene
+        self._draw_ms = 0.0
+        self._t0 = clock()
+
+    def end_update(self) -> None:
+        self._update_ms += (clock() - self._t0) * 1000   # every tick of the frame
+
+    def begin_draw(self) -> None:
+        self._calls0 = self.counter.calls
+        self._t0 = clock()
+
+    def end_draw(self) -> None:
+        self._draw_ms = (clock() - self._t0) * 1000
+        ring = self.rings.get(self._scene)
+        if ring is None:
+            ring = self.rings[self._scene] = SceneRing()
+        ring.add(self._update_ms, self._draw_ms, self.counter.calls - self._calls0)
+        self._update_ms = 0.0
+        self._frames += 1
+
+    # ------------------------------------------------------------- stats
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {scene: ring.stats() for scene, ring in self.rings.items()}
+
+    def export(self, path: str) -> None:
+        """Write per‑scene percentiles as JSON, or CSV if *path* ends in .csv."""
+        stats = self.stats()
+        with open(path, "w", newline="") as fh:
+            if path.endswith(".csv"):
+                rows: List[Dict[str, Any]] = [{"scene": s, **v} for s, v in stats.items()]
+                fields = ["scene"] + (list(rows[0])[1:] if rows else [])
+                writer = csv.DictWriter(fh, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                json.dump({"budget_ms": round(BUDGET_MS, 3),
+                           "ring_frames": RING_FRAMES, "scenes": stats}, fh, indent=2)
+
+    # ----------------------------------------------------------- overlay
+    def draw_overlay(self, pyxel: Any) -> None:
+        """Small table of p50/p95/p99 frame ms and draw calls per scene."""
+        if self._frames % REFRESH_EVERY == 0 or not self._cached:
+            self._cached = self.stats()
+        rows = self._cached
+        pyxel.rect(0, 0, 132, 8 + 7 * len(rows), 1)
+        pyxel.text(2, 1, "scene     p50  p95  p99 calls", 6)
+        for i, (scene, st) in enumerate(rows.items()):
+            col = 8 if st["frame_ms_p95"] > BUDGET_MS else 7
+            pyxel.text(2, 8 + 7 * i,
+                       f"{scene[:8]:<8}{st['frame_ms_p50']:5.1f}"
+                       f"{st['frame_ms_p95']:5.1f}{st['frame_ms_p99']:5.1f}"
+                       f"{int(st['draw_calls_p50']):5d}", col)
@@ -0,0 +1,117 @@
+"""replay.py – record real sessions and replay them headless
+
+A session is fully determined by its seed (see `RngStreams`) plus the keys
+the game saw each frame. `InputHelper.poll()` already samples every bound
+key once per frame into two bitmasks (held, newly pressed); the
+`InputRecorder` logs them for the frames where one is non‑zero. Replaying
+feeds those masks straight back through `InputHelper.feed` frame by frame
+and must reproduce the recorded balance history exactly:
+
+    python main.py --record bug.rec          # play normally, log as you go
+    python replay.py bug.rec                 # re‑run at full speed + verify
+"""
+from __future__ import annotations
+
+import struct
+import sys
+import time
+import zlib
+from typing import List, Tuple
+
+from common import BOUND_KEYS, STARTING_BALANCE
+
+RECORDED = (1 << len(BOUND_KEYS)) - 1     # mask bits that go into the log
+
+MAGIC = b"CSN3"
+_HEADER  = struct.Struct("<4sQqIII?") # magic, seed, start balance, frames,
+                                      # #events, #balances, dev keys on
+_EVENT   = struct.Struct("<IHH")      # frame, held mask, pressed mask
+_BALANCE = struct.Struct("<Iq")       # frame, balance after that frame
+
+Event = Tuple[int, int, int]
+
+
+# ───────────────────────────── log ─────────────────────────────────────
+class SessionLog:
+    """Seed + start balance + sparse per‑frame input masks + balance history,
+    and whether the session had the dev keys (`CasinoApp.dev`)."""
+
+    def __init__(self, seed: int, frames: int = 0,
+                 events: List[Event] | None = None,
+                 balances: List[Tuple[int, int]] | None = None,
+                 start_balance: int = STARTING_BALANCE, dev: bool = False) -> None:
+        self.seed     = seed
+        self.start_balance = start_balance
+        self.dev      = dev
+        self.frames   = frames
+        self.events   = events if events is not None else []
+        self.balances = balances if balances is not None else []
+
+    def save(self, path: str) -> None:
+        parts = [_HEADER.pack(MAGIC, self.seed, self.start_balance, self.frames,
+                              len(self.events), len(self.balances), self.dev)]
+        parts += [_EVENT.pack(*e) for e in self.events]
+        parts += [_BALANCE.pack(*b) for b in self.balances]
+        with open(path, "wb") as fh:
+            fh.write(zlib.compress(b"".join(parts)))
+
+    @classmethod
+    def load(cls, path: str) -> "SessionLog":
+        with open(path, "rb") as fh:
+            blob = zlib.decompress(fh.read())
+        magic, seed, start, frames, n_ev, n_bal, dev = _HEADER.unpack_from(blob)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a session log")
+        off = _HEADER.size
+        events = list(_EVENT.iter_unpack(blob[off:off + n_ev * _EVENT.size]))
+        off += n_ev * _EVENT.size
+        balances = list(_BALANCE.iter_unpack(blob[off:off + n_bal * _BALANCE.size]))
+        return cls(seed, frames, events, balances, start, dev)
+
+
+# ─────────────────────────── recording ─────────────────────────────────
+class InputRecorder:
+    """Per‑frame input masks from `InputHelper.poll()`, kept when non‑zero."""
+
+    def __init__(self) -> None:
+        self.events: List[Event] = []
+
+    def record(self, frame: int, held: int, pressed: int) -> None:
+        held, pressed = held & RECORDED, pressed & RECORDED
+        if held or pressed:
+            self.events.append((frame, held, pressed))
+
+
+# ──────────────────────────── replaying ────────────────────────────────
+def replay(log: SessionLog, draw: bool = False) -> List[Tuple[int, int]]:
+    """Re‑run *log* headless at full speed; returns the balance history."""
+    from main import CasinoApp          # main imports this module
+
+    app = CasinoApp(headless=True, seed=log.seed, dev=log.dev)
+    if log.start_balance != app.balance:              # persisted ledger
+        app.ledger.reset("replay", log.start_balance)
+    app.balance_log = []
+    feed = app.input.feed
+
+    events = iter(log.events)
+    nxt = next(events, None)
+    for frame in range(log.frames):
+        if nxt is not None and nxt[0] == frame:
+            feed(nxt[1], nxt[2])
+            nxt = next(events, None)
+        else:
+            feed(0, 0)
+        app.step(draw=draw)
+    return app.balance_log
+
+
+# ──────────────────────────── script entry ─────────────────────────────
+if __name__ == "__main__":
+    log = SessionLog.load(sys.argv[1])
+    t0 = time.perf_counter()
+    history = replay(log)
+    dt = time.perf_counter() - t0
+    same = history == log.balances
+    print(f"{log.frames:,} frames in {dt:.2f}s  seed {log.seed}  "
+          f"balance history {'identical' if same else 'DIVERGED'}")
+    sys.exit(0 if same else 1)
@@ -0,0 +1,166 @@
+"""rewind.py – frame snapshots, a rewind ring buffer and quick‑save
+
+`CasinoApp.snapshot()` captures everything a frame can change: the scene,
+the menu cursor, the balance, the RNG streams, the key‑repeat counters and
+the `snapshot()` of every loaded game. All of it goes into one `AppState`
+of immutable tuples. Nothing is deep‑copied. Parts that did not change
+are shared with the previous snapshot: a shoe's card order, an RNG state
+between draws, a generated race, placed bets. A snapshot therefore costs
+microseconds and a few hundred new bytes.
+
+`RewindBuffer` keeps the last `REWIND_FRAMES` snapshots in a fixed ring.
+Holding R steps back one frame per frame. F5 / F9 quick‑save /
+quick‑load, and with a data directory the save also goes to disk
+(`save_state`). These keys are a development aid, live only with
+`CasinoApp(dev=True)` (`main.py --dev`).
+Rewind and in‑session quick‑loads replay exactly. Loading a save from an
+earlier session cannot be replayed, because the save is not in the log.
+
+    python rewind.py         # snapshot / restore cost and memory
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import sys
+import time
+from typing import Any, Iterable, List, NamedTuple, Set, Tuple
+
+from common import SIM_FPS
+
+REWIND_SECONDS = 5
+REWIND_FRAMES  = REWIND_SECONDS * SIM_FPS      # one snapshot per tick
+QUICKSAVE_NAME = "quicksave.bin"
+SAVE_MAGIC     = b"CSV3"        # bumped whenever a snapshot layout changes
+
+
+class AppState(NamedTuple):
+    scene: str
+    menu_idx: int
+    balance: int
+    rngs: tuple                          # `RngStreams.snapshot()`
+    input: tuple                         # `InputHelper.snapshot()`
+    games: Tuple[Tuple[str, Any], ...]   # (scene name, game snapshot), loaded only
+
+
+# ───────────────────────────── ring buffer ─────────────────────────────
+class RewindBuffer:
+    """The last *capacity* snapshots; the oldest is overwritten when full."""
+
+    def __init__(self, capacity: int = REWIND_FRAMES) -> None:
+        self._ring: List[AppState | None] = [None] * capacity
+        self._head = 0                   # next slot to write
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._ring)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, state: AppState) -> None:
+        self._ring[self._head] = state
+        self._head = (self._head + 1) % len(self._ring)
+        self._size = min(self._size + 1, len(self._ring))
+
+    def pop(self) -> AppState | None:
+        """Newest snapshot, removed – None once the history is used up."""
+        if not self._size:
+            return None
+        self._head = (self._head - 1) % len(self._ring)
+        state, self._ring[self._head] = self._ring[self._head], None
+        self._size -= 1
+        return state
+
+    def clear(self) -> None:
+        self._ring = [None] * len(self._ring)
+        self._head = self._size = 0
+
+    def nbytes(self) -> int:
+        """Memory held by the buffered snapshots, shared objects counted once."""
+        return nbytes(s for s in self._ring if s is not None)
+
+
+# ───────────────────────────── measuring ───────────────────────────────
+def _sizeof(obj: Any, seen: Set[int]) -> int:
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, type(None))):
+        return size
+    if isinstance(obj, (tuple, list)):
+        return size + sum(_sizeof(o, seen) for o in obj)
+    if isinstance(obj, dict):
+        return size + sum(_sizeof(k, seen) + _sizeof(v, seen) for k, v in obj.items())
+    extra = getattr(obj, "nbytes", 0)              # NumPy arrays
+    if hasattr(obj, "__dict__"):
+        extra += _sizeof(vars(obj), seen)
+    return size + (extra if isinstance(extra, int) else 0)
+
+
+def nbytes(states: Iterable[Any], seen: Set[int] | None = None) -> int:
+    """Deep size of *states*; objects already in *seen* are not counted."""
+    seen = set() if seen is None else seen
+    return sum(_sizeof(s, seen) for s in states)
+
+
+# ───────────────────────────── save / load ─────────────────────────────
+def save_state(path: str, state: AppState) -> None:
+    """Write *state* atomically (temp file + rename)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(SAVE_MAGIC)
+        pickle.dump(state, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def load_state(path: str) -> AppState | None:
+    """The state saved at *path*, or None if missing or unreadable."""
+    try:
+        with open(path, "rb") as fh:
+            if fh.read(len(SAVE_MAGIC)) != SAVE_MAGIC:
+                return None
+            return pickle.load(fh)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+
+# ──────────────────────────── script entry ─────────────────────────────
+if __name__ == "__main__":
+    import random
+
+    import backend
+    from main import CasinoApp
+
+    app = CasinoApp(headless=True, seed=1)
+    null = backend.active()
+    rng = random.Random(1)
+    keys = [null.KEY_UP, null.KEY_DOWN, null.KEY_RETURN, null.KEY_SPACE,
+            null.KEY_H, null.KEY_S, null.KEY_A, null.KEY_TAB, null.KEY_Q]
+    for name in ("Roulette", "Blackjack", "Horse"):     # load every game
+        app.games[name]
+    buf = RewindBuffer()
+    take = give = 0.0
+    for frame in range(20_000):
+        if rng.random() < 0.3:
+            null.tap(rng.choice(keys))
+        app.step()
+        t0 = time.perf_counter()
+        state = app.snapshot()
+        t1 = time.perf_counter()
+        buf.push(state)
+        take += t1 - t0
+    for _ in range(len(buf)):
+        state = buf.pop()
+        t0 = time.perf_counter()
+        app.restore(state)
+        give += time.perf_counter() - t0
+    for _ in range(REWIND_FRAMES):
+        buf.push(app.snapshot())
+    full = buf.nbytes()
+    print(f"snapshot {take / 20_000 * 1e6:.1f} µs   restore {give / REWIND_FRAMES * 1e6:.1f} µs")
+    print(f"{REWIND_FRAMES} frames ({REWIND_SECONDS} s) of rewind: {full / 1024:.0f} KiB, "
+          f"{(full - nbytes([state])) / (REWIND_FRAMES - 1):.0f} B per extra snapshot")
@@ -2,7 +2,7 @@
 
 New features / fixes
 ────────────────────
-• Added **Even / Odd** betting (2 : 1 payout).
+• Added **Even / Odd** betting (2 : 1 payout).
 • Controls characters are plain ASCII (`<`, `>`, `^`, `v`) so Pyxel’s 4×6 font
   shows them correctly.
 • You can now press **Q** on the result screen to go back to the main menu.
@@ -12,54 +12,59 @@ Bet summary
 ───────────
     Bet Type        | Keys to cycle | Payout (net)
     ----------------|---------------|--------------
-    Number (0‑36)   | TAB           | 35 : 1
-    Red / Black     | TAB           | 1 : 1
-    Even / Odd      | TAB           | 1 : 1
-    Dozen 1‑12 etc. | TAB           | 2 : 1
+    Number (0‑36)   | TAB           | 35 : 1
+    Split           | TAB           | 17 : 1
+    Street          | TAB           | 11 : 1
+    Corner          | TAB           |  8 : 1
+    Column / Dozen  | TAB           |  2 : 1
+    High / Low      | TAB           |  1 : 1
+    Red / Black     | TAB           |  1 : 1
+    Even / Odd      | TAB           |  1 : 1
 
 Keys in betting screen
 ──────────────────────
     TAB        Cycle bet type
-    <  >       Change number / colour / dozen / parity
+    <  >       Change number / colour / dozen / parity …
     ^  v       Stake ± BET_INCREMENT
-    Space/Ent  Spin
+    A          Add the current bet to the board
+    Backspace  Clear the board
+    Space/Ent  Spin (an empty board places the current bet first)
+    Space/Ent  (while spinning) skip to the result
     Q          Menu
 """
 from __future__ import annotations
 
-import random
-from enum import Enum, auto
-from typing import Dict, List, Tuple
+from typing import NamedTuple, Tuple
 
-import pyxel
-from common import BET_INCREMENT, draw_text_center, InputHelper
-from roulette_wheel_animation import RouletteWheel
+from backend import pyxel
+from common import BET_INCREMENT, ROULETTE_LAYOUT, draw_text_center
+from roulette_table import LAYOUTS, Bet, BetBoard, BetType
+from roulette_wheel_animation import RouletteWheel, WheelState
 
 # ───────────────────────── wheel layout ────────────────────────────────
-ROULETTE_NUMBERS = list(range(37))                # 0‑36
-ROULETTE_COLORS: Dict[int, str] = {0: "G"}
-for n in ROULETTE_NUMBERS[1:]:                    # simple colour map
-    ROULETTE_COLORS[n] = "R" if n % 2 else "B"
+LAYOUT = LAYOUTS[ROULETTE_LAYOUT]
+ROULETTE_NUMBERS = list(range(LAYOUT.pockets))    # pocket indices
+ROULETTE_COLORS  = dict(enumerate(LAYOUT.colors)) # real wheel colours
 
+BOARD_LINES = 6        # bets listed on the betting screen
 
-# ─────────────────────────── bet types ─────────────────────────────────
-class BetType(Enum):
-    NUMBER = auto()
-    COLOR  = auto()
-    PARITY = auto()      # Even / Odd
-    DOZEN  = auto()
 
-COLOR_OPTS   = ["R", "B"]           # Red, Black
-PARITY_OPTS  = ["Even", "Odd"]
-DOZEN_RANGES = [(1, 12), (13, 24), (25, 36)]
+def _bet_line(bet) -> str:
+    return f"{bet.bet_type.name.title()} {bet.label}  ${bet.stake}"
 
-# stake * multiplier = return (includes original stake)
-PAYOUT_MULT = {
-    BetType.NUMBER: 36,   # 35:1
-    BetType.COLOR:  2,    # 1:1
-    BetType.PARITY: 2,    # 1:1
-    BetType.DOZEN:  3,    # 2:1
-}
+
+class RouletteState(NamedTuple):
+    bet_type: BetType
+    selection_idx: int
+    bet_amount: int
+    result: int | None
+    spin_ticks: int
+    win_amount: int
+    staked: int
+    facts: tuple
+    bets: Tuple[Bet, ...]
+    wheel: WheelState
+    notice: str = ""
 
 
 # ────────────────────────── main class ────────────────────────────────
@@ -67,143 +72,183 @@ class RouletteGame:
     def __init__(self, app) -> None:
         self.app   = app
         self.input = app.input  # InputHelper shared across scenes
+        self.rng   = app.rngs["roulette"]
+        self.board = BetBoard(LAYOUT)
         self.wheel = RouletteWheel(pyxel.width // 2,      # centre-x
                            pyxel.height // 2 - 10,  # centre-y
-                           70)       
+                           70, LAYOUT, rng=app.rngs["wheel"])
         self.reset()
 
     # ----------------------------------------------------------------- state
     def reset(self) -> None:
         self.bet_type      = BetType.NUMBER
-        self.selection_idx = 0               # meaning depends on type
+        self.selection_idx = 0               # index into LAYOUT.options
         self.bet_amount    = BET_INCREMENT
         self.result: int | None = None
         self._spin_ticks   = 0
         self.win_amount    = 0
+        self.staked        = 0
+        self.facts: tuple  = ()
+        self.notice        = ""              # why the last A / spin did nothing
+        self.board.clear()
         self.input.reset()
         self.wheel.reset()
 
+    @property
+    def animating(self) -> bool:
+        """Wheel in motion – the app must keep updating/drawing."""
+        return bool(self._spin_ticks)
+
+    def snapshot(self) -> RouletteState:
+        return RouletteState(self.bet_type, self.selection_idx, self.bet_amount,
+                             self.result, self._spin_ticks, self.win_amount,
+                             self.staked, self.facts, tuple(self.board.bets),
+                             self.wheel.snapshot(), self.notice)
+
+    def restore(self, state: RouletteState) -> None:
+        (self.bet_type, self.selection_idx, self.bet_amount, self.result,
+         self._spin_ticks, self.win_amount, self.staked, self.facts) = state[:8]
+        self.board.bets[:] = state.bets
+        self.wheel.restore(state.wheel)
+        self.notice = state.notice
+
     # ---------------------------------------------------------------- helpers
     def _sel_label(self) -> str:
-        if self.bet_type is BetType.NUMBER:
-            return str(self.selection_idx)
-        if self.bet_type is BetType.COLOR:
-            return "Red" if COLOR_OPTS[self.selection_idx] == "R" else "Black"
-        if self.bet_type is BetType.PARITY:
-            return PARITY_OPTS[self.selection_idx]
-        lo, hi = DOZEN_RANGES[self.selection_idx]
-        return f"{lo}-{hi}"
-
-    def _player_wins(self) -> bool:
-        n = self.result
-        if self.bet_type is BetType.NUMBER:
-            return n == self.selection_idx
-        if self.bet_type is BetType.COLOR:
-            return ROULETTE_COLORS[n] == COLOR_OPTS[self.selection_idx]
-        if self.bet_type is BetType.PARITY:
-            if n == 0:
-                return False  # house wins on zero
-            return (n % 2 == 0) if self.selection_idx == 0 else (n % 2 == 1)
-        # dozen
-        lo, hi = DOZEN_RANGES[self.selection_idx]
-        return lo <= n <= hi
+        return LAYOUT.label(self.bet_type, self.selection_idx)
 
     def _move_sel(self, delta: int) -> None:
-        if self.bet_type is BetType.NUMBER:
-            self.selection_idx = (self.selection_idx + delta) % 37
-        elif self.bet_type is BetType.COLOR:
-            self.selection_idx = (self.selection_idx + delta) % len(COLOR_OPTS)
-        elif self.bet_type is BetType.PARITY:
-            self.selection_idx = (self.selection_idx + delta) % len(PARITY_OPTS)
-        else:  # DOZEN
-            self.selection_idx = (self.selection_idx + delta) % len(DOZEN_RANGES)
+        n_opts = len(LAYOUT.options[self.bet_type])
+        self.selection_idx = (self.selection_idx + delta) % n_opts
+
+    def _free_balance(self) -> int:
+        """Balance not already committed to the board."""
+        return self.app.balance - self.board.total_stake
+
+    def _place_current(self) -> bool:
+        """Put the current bet on the board, or say why it does not fit."""
+        if self.bet_amount > self._free_balance():
+            self.notice = "Not enough balance for ${}".format(self.bet_amount)
+            return False
+        self.board.place(self.bet_type, self.selection_idx, self.bet_amount)
+        self.notice = ""
+        return True
 
     # ----------------------------------------------------------------- update
     def update(self) -> None:
+        ih = self.input
         if self._spin_ticks:                        # wheel is spinning ──────
+            if ih.btnp(pyxel.KEY_SPACE, pyxel.KEY_RETURN):
+                self.wheel.skip()                   # jump straight to result
             self.wheel.update()                     # advance animation
             if not self.wheel.is_spinning:          # wheel just stopped
                 self._spin_ticks = 0                # clear flag → result mode
-                if self._player_wins():             # settle bet
-                    mult = PAYOUT_MULT[self.bet_type]
-                    self.win_amount  = self.bet_amount * mult
-                    self.app.balance += self.win_amount
+                self.win_amount  = self.board.settle(self.result)   # all bets
+                self.app.ledger.payout("Roulette", self.win_amount)
+                self.facts       = self._result_facts()
             # allow abort to menu even while wheel spins
-            if pyxel.btnp(pyxel.KEY_Q):
+            if ih.btnp(pyxel.KEY_Q):
                 self.app.to_menu()
             return
         else:
             # result screen (result is not None, spin_ticks == 0)
             if self.result is not None:
-                if pyxel.btnp(pyxel.KEY_SPACE) or pyxel.btnp(pyxel.KEY_RETURN):
+                if ih.btnp(pyxel.KEY_SPACE, pyxel.KEY_RETURN):
                     self.reset()
-                if pyxel.btnp(pyxel.KEY_Q):
+                if ih.btnp(pyxel.KEY_Q):
                     self.app.to_menu()
                 return
 
             # betting screen -------------------------------------------------
-            ih = self.input
             # change bet type
-            if pyxel.btnp(pyxel.KEY_TAB):
+            if ih.btnp(pyxel.KEY_TAB):
                 self.bet_type = BetType((self.bet_type.value % len(BetType)) + 1)
                 self.selection_idx = 0
 
             # change selection
-            if pyxel.btnp(pyxel.KEY_LEFT):
+            if ih.btnp(pyxel.KEY_LEFT):
                 self._move_sel(-1)
-            if pyxel.btnp(pyxel.KEY_RIGHT):
+            if ih.btnp(pyxel.KEY_RIGHT):
                 self._move_sel(1)
 
             # stake
-            if ih.accelerated_press(pyxel.KEY_UP) and self.bet_amount + BET_INCREMENT <= self.app.balance:
+            if ih.accelerated_press(pyxel.KEY_UP) and self.bet_amount + BET_INCREMENT <= self._free_balance():
                 self.bet_amount += BET_INCREMENT
             if ih.accelerated_press(pyxel.KEY_DOWN) and self.bet_amount - BET_INCREMENT >= BET_INCREMENT:
                 self.bet_amount -= BET_INCREMENT
 
-            # place bet
-            if pyxel.btnp(pyxel.KEY_SPACE) or pyxel.btnp(pyxel.KEY_RETURN):
-                self.app.balance -= self.bet_amount
-                self.result      = random.choice(ROULETTE_NUMBERS)   # choose now
+            # board
+            if ih.btnp(pyxel.KEY_A):
+                self._place_current()
+            if ih.btnp(pyxel.KEY_BACKSPACE):
+                self.board.clear()
+
+            # spin – never with an empty board
+            if ih.btnp(pyxel.KEY_SPACE, pyxel.KEY_RETURN) and \
+               (self.board.bets or self._place_current()):
+                self.notice      = ""
+                self.staked      = self.board.total_stake
+                self.app.ledger.bet("Roulette", self.staked)
+                self.result      = self.rng.choice(ROULETTE_NUMBERS) # choose now
                 self.wheel.start_spin(self.result)                   # tell wheel
                 self._spin_ticks = 1         # flag “spinning”; any non-zero works
                 self.win_amount  = 0
 
-            if pyxel.btnp(pyxel.KEY_Q):
+            if ih.btnp(pyxel.KEY_Q):
                 self.app.to_menu()
 
     # ------------------------------------------------------------------- draw
     def draw(self) -> None:
         if self._spin_ticks:                # real spinning animation ─────
-            self.wheel.draw()
+            self.wheel.draw(self.app.alpha)
             return                          # nothing else while spinning
         elif self.result is not None:
             self._draw_result()
         else:                                # betting screen
             draw_text_center("Roulette – place your bet", 30, 7)
-            draw_text_center(f"Type   : {self.bet_type.name.title()}", 60, 11)
-            draw_text_center(f"Choice : {self._sel_label()}", 75, 11)
-            draw_text_center(f"Stake  : ${self.bet_amount}", 90, 11)
-            draw_text_center("TAB type  •  < > choice  •  ^ V stake  •  Space spin  •  Q menu", 200, 5)
+            draw_text_center("Type   : {}", 60, 11, self.bet_type.name.title())
+            draw_text_center("Choice : {}", 75, 11, self._sel_label())
+            draw_text_center("Stake  : ${}", 90, 11, self.bet_amount)
+            self._draw_board(110)
+            if self.notice:
+                draw_text_center(self.notice, 186, 8)
+            draw_text_center("TAB type  •  < > choice  •  ^ V stake  •  A add  •  BkSp clear", 200, 5)
+            draw_text_center("Space spin  •  Q menu", 210, 5)
+
+    def _draw_board(self, y: int) -> None:
+        bets = self.board.bets
+        if not bets:
+            draw_text_center("Board empty – Space bets the choice above", y, 5)
+            return
+        draw_text_center("Board: {} bets, ${}", y, 7, len(bets), self.board.total_stake)
+        for bet in bets[-BOARD_LINES:]:                 # newest bets only
+            y += 10
+            draw_text_center(_bet_line, y, 6, bet)
 
     # detailed result ----------------------------------------------------
+    def _result_facts(self) -> tuple:
+        """Result screen lines – built once per spin, not once per frame."""
+        colour = ROULETTE_COLORS[self.result]
+        n = LAYOUT.number(self.result)
+        return (
+            f"Colour: {'Red' if colour=='R' else 'Black' if colour=='B' else 'Green'}",
+            f"Parity: {'Even' if n and n % 2 == 0 else 'Odd' if n else '–'}",
+            f"Dozen : {self._dozen_label(n)}",
+            f"Staked: ${self.staked} on {len(self.board.bets)} bet(s)",
+        )
+
     def _draw_result(self) -> None:
         colour = ROULETTE_COLORS[self.result]
         col_code = {"R": 8, "B": 12, "G": 11}[colour]
-        draw_text_center(f"Result: {self.result} {colour}", 80, col_code)
+        draw_text_center("Result: {} {}", 80, col_code, LAYOUT.labels[self.result], colour)
 
         # info lines centred
-        facts = [
-            f"Colour: {'Red' if colour=='R' else 'Black' if colour=='B' else 'Green'}",
-            f"Parity: {'Even' if self.result and self.result % 2 == 0 else 'Odd' if self.result else '–'}",
-            f"Dozen : {self._dozen_label(self.result)}",
-        ]
         y = 100
-        for line in facts:
+        for line in self.facts:
             draw_text_center(line, y, 7)
             y += 12
 
         if self.win_amount:
-            draw_text_center(f"You win ${self.win_amount}!", y + 10, 11)
+            draw_text_center("You win ${}!", y + 10, 11, self.win_amount)
         else:
             draw_text_center("No win this time…", y + 10, 8)
 
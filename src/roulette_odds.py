@@ -0,0 +1,127 @@
+"""roulette_odds.py – exact session‑result distributions for roulette bets
+
+Everything comes from the tables the game settles with: a `BetBoard` on a
+`Layout` gives the net result of one spin for every pocket, and pockets
+are equally likely. No sampling is involved.
+
+The per‑spin distribution lives on an integer grid (net results divided by
+their common step, e.g. ±1 for an even‑money bet, −1/+35 → 0/1 for a
+straight‑up number). The result after *k* independent spins is its k‑fold
+convolution, computed as one FFT power
+
+    pmf_k = irfft(rfft(pmf) ** k)
+
+so tens of thousands of spins cost a single transform of length ~k·grid.
+`SessionStats` then reports EV, house edge, variance, quantiles and the
+chance of finishing ahead.
+
+    python roulette_odds.py                    # every bet type, 1,000 spins
+    python roulette_odds.py --spins 50000 --layout american
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from roulette_table import EUROPEAN, LAYOUTS, BetBoard, BetType, Layout
+
+FLOOR = 1e-15               # FFT round‑off; smaller probabilities read as 0
+
+
+# ───────────────────────────── one spin ────────────────────────────────
+def spin_outcomes(board: BetBoard) -> np.ndarray:
+    """Net result of one spin for every pocket of the board's layout."""
+    stake = board.total_stake
+    return np.array([board.settle(p) - stake for p in range(board.layout.pockets)],
+                    dtype=np.int64)
+
+
+def spin_distribution(board: BetBoard) -> Tuple[int, int, np.ndarray]:
+    """(lowest net, grid step, pmf): net `lo + step * i` has probability `pmf[i]`."""
+    net = spin_outcomes(board)
+    lo = int(net.min())
+    step = math.gcd(*(int(v) for v in net - lo)) or 1
+    pmf = np.bincount((net - lo) // step) / len(net)
+    return lo, step, pmf
+
+
+# ──────────────────────────── k spins ──────────────────────────────────
+@dataclass(frozen=True)
+class SessionStats:
+    spins: int
+    stake: int                  # total staked per spin
+    values: np.ndarray          # possible net results after `spins` spins
+    probs: np.ndarray           # their probabilities
+    mean: float                 # exact, from the one‑spin moments
+    variance: float
+
+    @property
+    def house_edge(self) -> float:
+        """Expected loss per unit staked."""
+        return -self.mean / (self.spins * self.stake)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def p_ahead(self) -> float:
+        return float(self.probs[self.values > 0].sum())
+
+    def quantile(self, q: float) -> int:
+        """Smallest net result whose cumulative probability reaches *q*."""
+        cdf = np.cumsum(self.probs)
+        return int(self.values[min(np.searchsorted(cdf, q * cdf[-1]), len(cdf) - 1)])
+
+
+def session(board: BetBoard, spins: int) -> SessionStats:
+    """Exact distribution of the net result of *spins* spins of *board*."""
+    if spins < 1:
+        raise ValueError("spins must be ≥ 1")
+    lo, step, pmf = spin_distribution(board)
+    grid = np.arange(len(pmf))
+    mean1 = float((pmf * grid).sum())
+    var1 = float((pmf * grid * grid).sum()) - mean1 * mean1
+
+    size = spins * (len(pmf) - 1) + 1
+    nfft = 1 << (size - 1).bit_length()
+    probs = np.fft.irfft(np.fft.rfft(pmf, nfft) ** spins, nfft)[:size]
+    probs[probs < FLOOR] = 0.0
+    probs /= probs.sum()
+
+    values = spins * lo + step * np.arange(size, dtype=np.int64)
+    return SessionStats(spins, board.total_stake, values, probs,
+                        spins * (lo + step * mean1), spins * step * step * var1)
+
+
+def bet_session(bet_type: BetType, spins: int, stake: int = 1, *,
+                selection: int = 0, layout: Layout = EUROPEAN) -> SessionStats:
+    """`session` for a single bet of *bet_type* (the game's selection index)."""
+    board = BetBoard(layout)
+    board.place(bet_type, selection, stake)
+    return session(board, spins)
+
+
+# ──────────────────────────── script entry ─────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exact roulette session odds")
+    parser.add_argument("--spins", type=int, default=1_000)
+    parser.add_argument("--stake", type=int, default=10)
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="european")
+    args = parser.parse_args()
+    layout = LAYOUTS[args.layout]
+    print(f"{layout.name}, ${args.stake} per spin, {args.spins:,} spins")
+    print(f"{'bet':<10} {'edge':>7} {'EV':>9} {'SD':>8} {'5%':>8} "
+          f"{'median':>8} {'95%':>8} {'P(ahead)':>9}")
+    for bet_type in BetType:
+        t0 = time.perf_counter()
+        s = bet_session(bet_type, args.spins, args.stake, layout=layout)
+        dt = time.perf_counter() - t0
+        print(f"{bet_type.name:<10} {s.house_edge * 100:6.3f}% {s.mean:+9.1f} "
+              f"{s.std:8.1f} {s.quantile(0.05):+8d} {s.quantile(0.5):+8d} "
+              f"{s.quantile(0.95):+8d} {s.p_ahead:9.4f}   ({dt * 1000:.0f} ms)")
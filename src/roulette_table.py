@@ -0,0 +1,187 @@
+"""roulette_table.py – pyxel‑free roulette layouts, bet masks and bet board
+
+Every bet is compiled once into a bitmask over pockets (bit *i* set ⇔ the bet
+wins when the ball lands in pocket *i*). Settling a spin is then one AND and
+one multiply per bet, no matter how exotic the bet is.
+
+Pockets are indexed 0‑36 like their numbers; the American layout adds
+pocket 37, labelled "00".
+
+    Bet Type        | Selections                  | Payout (net)
+    ----------------|-----------------------------|--------------
+    Number          | every pocket (incl. 00)     | 35 : 1
+    Split           | two adjacent numbers        | 17 : 1
+    Street          | row of three                | 11 : 1
+    Corner          | block of four               |  8 : 1
+    Column          | 1st / 2nd / 3rd column      |  2 : 1
+    Dozen           | 1‑12 / 13‑24 / 25‑36         |  2 : 1
+    High / Low      | 1‑18 / 19‑36                 |  1 : 1
+    Red / Black     | real wheel colours          |  1 : 1
+    Even / Odd      | zero(s) lose                |  1 : 1
+"""
+from __future__ import annotations
+
+from enum import Enum, auto
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+
+# ─────────────────────────── bet types ─────────────────────────────────
+class BetType(Enum):
+    NUMBER   = auto()
+    COLOR    = auto()
+    PARITY   = auto()      # Even / Odd
+    DOZEN    = auto()
+    SPLIT    = auto()
+    STREET   = auto()
+    CORNER   = auto()
+    COLUMN   = auto()
+    HIGH_LOW = auto()
+
+# stake * multiplier = return (includes original stake)
+PAYOUT_MULT = {
+    BetType.NUMBER:   36,   # 35:1
+    BetType.SPLIT:    18,   # 17:1
+    BetType.STREET:   12,   # 11:1
+    BetType.CORNER:   9,    # 8:1
+    BetType.COLUMN:   3,    # 2:1
+    BetType.DOZEN:    3,    # 2:1
+    BetType.HIGH_LOW: 2,    # 1:1
+    BetType.COLOR:    2,    # 1:1
+    BetType.PARITY:   2,    # 1:1
+}
+
+RED_NUMBERS = frozenset({1, 3, 5, 7, 9, 12, 14, 16, 18,
+                         19, 21, 23, 25, 27, 30, 32, 34, 36})
+
+DOUBLE_ZERO = 37        # pocket index of "00" on the American wheel
+
+# clockwise pocket order starting at 0
+EUROPEAN_WHEEL = (0, 32, 15, 19, 4, 21, 2, 25, 17, 34, 6, 27, 13, 36, 11, 30,
+                  8, 23, 10, 5, 24, 16, 33, 1, 20, 14, 31, 9, 22, 18, 29, 7,
+                  28, 12, 35, 3, 26)
+AMERICAN_WHEEL = (0, 28, 9, 26, 30, 11, 7, 20, 32, 17, 5, 22, 34, 15, 3, 24,
+                  36, 13, 1, DOUBLE_ZERO, 27, 10, 25, 29, 12, 8, 19, 31, 18, 6,
+                  21, 33, 16, 4, 23, 35, 14, 2)
+
+Option = Tuple[str, int]    # (label, pocket mask)
+
+
+def _mask(pockets: Sequence[int]) -> int:
+    m = 0
+    for p in pockets:
+        m |= 1 << p
+    return m
+
+
+# ─────────────────────────── layouts ───────────────────────────────────
+class Layout:
+    """
+    Pocket tables for one wheel.
+
+    `options[bet_type]` lists every legal selection for that bet type as a
+    `(label, mask)` pair; the game cycles through them by index.
+    """
+
+    def __init__(self, name: str, wheel_order: Sequence[int]) -> None:
+        self.name        = name
+        self.wheel_order = tuple(wheel_order)
+        self.pockets     = len(self.wheel_order)
+        self.labels      = tuple("00" if p == DOUBLE_ZERO else str(p)
+                                 for p in range(self.pockets))
+        self.colors      = tuple("R" if p in RED_NUMBERS
+                                 else "G" if p in (0, DOUBLE_ZERO) else "B"
+                                 for p in range(self.pockets))
+        self.options: Dict[BetType, Tuple[Option, ...]] = self._build_options()
+
+    # ---------------------------------------------------------------- tables
+    def _build_options(self) -> Dict[BetType, Tuple[Option, ...]]:
+        nums = range(1, 37)
+        opts: Dict[BetType, List[Option]] = {t: [] for t in BetType}
+
+        opts[BetType.NUMBER] = [(lbl, 1 << p) for p, lbl in enumerate(self.labels)]
+
+        # splits: zero(s) against the first row, then horizontal, vertical
+        zero_splits = [(0, 1), (0, 2), (0, 3)]
+        if self.pockets > DOUBLE_ZERO:
+            zero_splits = [(0, 1), (0, 2), (0, DOUBLE_ZERO),
+                           (DOUBLE_ZERO, 2), (DOUBLE_ZERO, 3)]
+        pairs = zero_splits + [(n, n + 1) for n in nums if n % 3] \
+                            + [(n, n + 3) for n in nums if n <= 33]
+        opts[BetType.SPLIT] = [(f"{self.labels[a]}/{self.labels[b]}", _mask((a, b)))
+                               for a, b in pairs]
+
+        opts[BetType.STREET] = [(f"{n}-{n + 2}", _mask((n, n + 1, n + 2)))
+                                for n in range(1, 37, 3)]
+        opts[BetType.CORNER] = [(f"{n}/{n + 1}/{n + 3}/{n + 4}",
+                                 _mask((n, n + 1, n + 3, n + 4)))
+                                for n in range(1, 33) if n % 3]
+        opts[BetType.COLUMN] = [(f"Column {c + 1}",
+                                 _mask([n for n in nums if n % 3 == (c + 1) % 3]))
+                                for c in range(3)]
+        opts[BetType.DOZEN] = [(f"{lo}-{lo + 11}", _mask(range(lo, lo + 12)))
+                               for lo in (1, 13, 25)]
+        opts[BetType.HIGH_LOW] = [("Low 1-18", _mask(range(1, 19))),
+                                  ("High 19-36", _mask(range(19, 37)))]
+        opts[BetType.COLOR] = [("Red", _mask(RED_NUMBERS)),
+                               ("Black", _mask(set(nums) - RED_NUMBERS))]
+        opts[BetType.PARITY] = [("Even", _mask(range(2, 37, 2))),
+                                ("Odd", _mask(range(1, 37, 2)))]
+        return {t: tuple(o) for t, o in opts.items()}
+
+    # --------------------------------------------------------------- helpers
+    def mask(self, bet_type: BetType, selection: int) -> int:
+        return self.options[bet_type][selection][1]
+
+    def label(self, bet_type: BetType, selection: int) -> str:
+        return self.options[bet_type][selection][0]
+
+    def number(self, pocket: int) -> int:
+        """Numeric value of a pocket; both zeros count as 0."""
+        return 0 if pocket == DOUBLE_ZERO else pocket
+
+
+EUROPEAN = Layout("European", EUROPEAN_WHEEL)
+AMERICAN = Layout("American", AMERICAN_WHEEL)
+LAYOUTS  = {"european": EUROPEAN, "american": AMERICAN}
+
+
+# ─────────────────────────── bet board ─────────────────────────────────
+class Bet(NamedTuple):
+    bet_type:  BetType
+    selection: int
+    stake:     int
+    mask:      int
+    mult:      int
+    label:     str
+
+
+class BetBoard:
+    """Any number of simultaneous bets, settled with one mask test each."""
+
+    def __init__(self, layout: Layout = EUROPEAN) -> None:
+        self.layout = layout
+        self.bets: List[Bet] = []
+
+    def place(self, bet_type: BetType, selection: int, stake: int) -> Bet:
+        """Add a bet; stakes on an identical bet are merged."""
+        mask = self.layout.mask(bet_type, selection)
+        for i, b in enumerate(self.bets):
+            if b.bet_type is bet_type and b.mask == mask:
+                self.bets[i] = b._replace(stake=b.stake + stake)
+                return self.bets[i]
+        bet = Bet(bet_type, selection, stake, mask, PAYOUT_MULT[bet_type],
+                  self.layout.label(bet_type, selection))
+        self.bets.append(bet)
+        return bet
+
+    def clear(self) -> None:
+        self.bets.clear()
+
+    @property
+    def total_stake(self) -> int:
+        return sum(b.stake for b in self.bets)
+
+    def settle(self, pocket: int) -> int:
+        """Total return (stakes included) of every bet for *pocket*."""
+        bit = 1 << pocket
+        return sum(b.stake * b.mult for b in self.bets if b.mask & bit)
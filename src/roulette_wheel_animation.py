@@ -9,22 +9,24 @@ from __future__ import annotations
 
 import math
 import random
-from typing import Dict, List
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple
 
-import pyxel
+from backend import pyxel
+from roulette_table import EUROPEAN, Layout
 
 # ───────────────────────── config / constants ───────────────────────────
 SCREEN_W, SCREEN_H = 256, 256
 CENTER_X, CENTER_Y = SCREEN_W // 2, SCREEN_H // 2
 WHEEL_RADIUS       = 90
-NUM_SLOTS          = 37                             # 0‑36 (single‑zero)
+NUM_SLOTS          = EUROPEAN.pockets               # 0‑36 (single‑zero)
 
-# simple colour mapping (palette index → Pyxel colour)
+# real wheel colours (palette index → Pyxel colour)
 COL_RED, COL_BLACK, COL_GREEN = 8, 12, 11
+COLOUR_CODE = {"R": COL_RED, "B": COL_BLACK, "G": COL_GREEN}
 
-SLOT_COLOURS: Dict[int, int] = {0: COL_GREEN}
-for n in range(1, NUM_SLOTS):
-    SLOT_COLOURS[n] = COL_RED if n % 2 else COL_BLACK
+SLOT_COLOURS: Dict[int, int] = {n: COLOUR_CODE[c]
+                                for n, c in enumerate(EUROPEAN.colors)}
 
 TEXT_COL            = 7
 POINTER_COL         = 7
@@ -33,12 +35,79 @@ CONSTANT_PHASE_FRAMES = 40    # frames at peak speed before braking
 
 MAX_ANGVEL          = 0.45    # radians per frame at peak (empirical)
 BRAKE_RATE          = 0.985   # multiply ω each frame while braking
+STOP_ANGVEL         = 0.01    # ω at which the brake phase ends
 
-# Pre‑compute slot angles (0 at 12 o’clock, clockwise positive)
-SLOT_ANGLE: List[float] = [i * 2 * math.pi / NUM_SLOTS for i in range(NUM_SLOTS)]
+# closed‑form pieces of the trajectory (see RouletteWheel.angle_at)
+_BRAKE_K      = -math.log(BRAKE_RATE)                       # ω(t) = ω0·e^(−k t)
+_BRAKE_FRAMES = math.log(MAX_ANGVEL / STOP_ANGVEL) / _BRAKE_K
+_BRAKE_DIST   = (MAX_ANGVEL - STOP_ANGVEL) / _BRAKE_K
+_ACCEL_DIST   = MAX_ANGVEL * ACCEL_PHASE_FRAMES / 2
+
+FRAME_STEPS         = 144             # quantised wheel angles (2.5° apart)
+FRAME_CACHE_BYTES   = 4 * 1024 * 1024 # ≈ one byte per cached pixel
+
+
+def slot_angles(layout: Layout) -> List[float]:
+    """Angle of every pocket in real wheel order (0 at 12 o’clock, clockwise)."""
+    angles = [0.0] * layout.pockets
+    for pos, pocket in enumerate(layout.wheel_order):
+        angles[pocket] = pos * 2 * math.pi / layout.pockets
+    return angles
+
+
+SLOT_ANGLE: List[float] = slot_angles(EUROPEAN)
+
+
+# ─────────────────────────── frame cache ────────────────────────────────
+class WheelFrameCache:
+    """
+    LRU of pre‑rendered wheel images keyed by angle.
+
+    Capacity is derived from a byte budget; an evicted `pyxel.Image` is
+    handed back to *render* for reuse, so a full cache never allocates.
+    """
+
+    def __init__(self, render: Callable[[float, "pyxel.Image | None"], "pyxel.Image"],
+                 frame_bytes: int, budget: int = FRAME_CACHE_BYTES) -> None:
+        self._render  = render
+        self._frames: "OrderedDict[float, pyxel.Image]" = OrderedDict()
+        self.capacity = max(1, budget // frame_bytes)
+        self.hits     = 0
+        self.misses   = 0
+
+    def get(self, angle: float) -> "pyxel.Image":
+        img = self._frames.get(angle)
+        if img is not None:
+            self.hits += 1
+            self._frames.move_to_end(angle)
+            return img
+        self.misses += 1
+        spare = None
+        if len(self._frames) >= self.capacity:
+            _, spare = self._frames.popitem(last=False)
+        img = self._frames[angle] = self._render(angle, spare)
+        return img
+
+    def clear(self) -> None:
+        self._frames.clear()
+
+    def __len__(self) -> int:
+        return len(self._frames)
 
 
 # ─────────────────────────── helper class ───────────────────────────────
+class WheelState(NamedTuple):
+    phase: str
+    angle: float
+    ang_vel: float
+    timer: float
+    result: int | None
+    target_angle: float
+    start_angle: float
+    cruise_frames: float
+    duration: float
+
+
 class RouletteWheel:
     """
     A self-contained wheel that can be dropped into any Pyxel scene.
@@ -53,10 +122,18 @@ class RouletteWheel:
     """
 
     def __init__(self, cx: int = CENTER_X, cy: int = CENTER_Y,
-                 radius: int = WHEEL_RADIUS) -> None:
+                 radius: int = WHEEL_RADIUS, layout: Layout = EUROPEAN,
+                 rng: random.Random | None = None) -> None:
         self.cx      = cx
         self.cy      = cy
         self.radius  = radius
+        self.layout  = layout
+        self.rng     = rng or random.Random()
+        self.slot_angle  = slot_angles(layout)
+        self.slot_colour = [COLOUR_CODE[c] for c in layout.colors]
+        self.frame_size  = 2 * (radius + 12) + 1
+        self.frames      = WheelFrameCache(self._render_frame,
+                                           self.frame_size ** 2)
         self.reset()
 
     # ---------------------------------------------------------- state ----
@@ -64,27 +141,99 @@ class RouletteWheel:
         self.phase      = "idle"          # idle | accel | cruise | brake | done
         self.angle      = 0.0
         self.ang_vel    = 0.0
-        self.timer      = 0
+        self.timer      = 0.0             # frames since start_spin()
         self.result: int | None = None
         self.target_angle = 0.0            # filled in start_spin()
+        self.start_angle  = 0.0
+        self.cruise_frames = float(CONSTANT_PHASE_FRAMES)
+        self.duration      = 0.0           # total spin length in frames
+
+    def snapshot(self) -> WheelState:
+        """The motion state; `restore()` puts it back."""
+        return WheelState(self.phase, self.angle, self.ang_vel, self.timer,
+                          self.result, self.target_angle, self.start_angle,
+                          self.cruise_frames, self.duration)
+
+    def restore(self, state: WheelState) -> None:
+        (self.phase, self.angle, self.ang_vel, self.timer, self.result,
+         self.target_angle, self.start_angle, self.cruise_frames,
+         self.duration) = state
 
     # ---------------------------------------------------------- spin -----
     def start_spin(self, target_number: int | None = None) -> None:
         """
         Begin a new spin.
 
-        • target_number 0-36 → wheel will stop on that pocket  
+        • target_number pocket index (0-36, 37 = 00) → wheel will stop on it  
         • target_number None → a random number is chosen
+
+        The whole trajectory is solved here: the cruise phase is stretched
+        by less than one turn so that the wheel coasts to rest exactly on
+        `target_angle`, and `duration` is known up front.
         """
+        start = self.angle % (2 * math.pi)
         self.reset()
-        self.result = (random.randrange(NUM_SLOTS)
+        self.result = (self.rng.randrange(self.layout.pockets)
                        if target_number is None else target_number)
-        # compute the angle needed so that the chosen pocket ends at 12 o’clock
-        self.target_angle = (-SLOT_ANGLE[self.result]) % (2 * math.pi)
+        # compute the angle needed so that the chosen pocket ends at 12 o'clock
+        self.target_angle = (-self.slot_angle[self.result]) % (2 * math.pi)
+        self.start_angle  = start
+
+        natural = _ACCEL_DIST + MAX_ANGVEL * CONSTANT_PHASE_FRAMES + _BRAKE_DIST
+        extra   = (self.target_angle - start - natural) % (2 * math.pi)
+        self.cruise_frames = CONSTANT_PHASE_FRAMES + extra / MAX_ANGVEL
+        self.duration      = ACCEL_PHASE_FRAMES + self.cruise_frames + _BRAKE_FRAMES
+        self.phase         = "accel"
+        self.seek(0.0)
+
+    # ------------------------------------------------------- trajectory --
+    def angle_at(self, t: float) -> float:
+        """Wheel angle *t* frames after `start_spin()` – O(1), any order."""
+        t = min(max(t, 0.0), self.duration)
+        a = self.start_angle
+        if t < ACCEL_PHASE_FRAMES:                       # ω grows linearly
+            return a + MAX_ANGVEL * t * t / (2 * ACCEL_PHASE_FRAMES)
+        a += _ACCEL_DIST
+        t -= ACCEL_PHASE_FRAMES
+        if t < self.cruise_frames:                       # constant ω
+            return a + MAX_ANGVEL * t
+        a += MAX_ANGVEL * self.cruise_frames
+        t -= self.cruise_frames                          # ω decays by BRAKE_RATE
+        return a + MAX_ANGVEL * (1.0 - BRAKE_RATE ** t) / _BRAKE_K
+
+    def ang_vel_at(self, t: float) -> float:
+        if t <= 0.0 or t >= self.duration:
+            return 0.0
+        if t < ACCEL_PHASE_FRAMES:
+            return MAX_ANGVEL * t / ACCEL_PHASE_FRAMES
+        t -= ACCEL_PHASE_FRAMES + self.cruise_frames
+        return MAX_ANGVEL if t < 0 else MAX_ANGVEL * BRAKE_RATE ** t
+
+    def seek(self, t: float) -> None:
+        """Jump to frame *t* of the current spin (replay, skip, catch‑up)."""
+        if self.phase == "idle":
+            return
+        self.timer   = min(max(t, 0.0), self.duration)
+        self.angle   = self.angle_at(self.timer)
+        self.ang_vel = self.ang_vel_at(self.timer)
+        if self.timer >= self.duration:
+            self.angle = self.target_angle       # exact, no float drift
+            self.phase = "done"
+        elif self.timer < ACCEL_PHASE_FRAMES:
+            self.phase = "accel"
+        elif self.timer < ACCEL_PHASE_FRAMES + self.cruise_frames:
+            self.phase = "cruise"
+        else:
+            self.phase = "brake"
+
+    def skip(self) -> None:
+        """Fast‑forward straight to the result."""
+        self.seek(self.duration)
 
-        self.phase   = "accel"
-        self.ang_vel = 0.0
-        self.timer   = 0
+    @property
+    def remaining(self) -> float:
+        """Frames left until the wheel stops (0 when not spinning)."""
+        return self.duration - self.timer if self.is_spinning else 0.0
 
     # ----------------------------------------------------- handy flag ----
     @property
@@ -92,47 +241,52 @@ class RouletteWheel:
         return self.phase not in {"idle", "done"}
 
     # ---------------------------------------------------------- update ---
-    def update(self) -> None:
-        if self.phase in {"idle", "done"}:
-            return
-
-        # accelerate → cruise → brake
-        if self.phase == "accel":
-            self.ang_vel += MAX_ANGVEL / ACCEL_PHASE_FRAMES
-            self.timer   += 1
-            if self.timer >= ACCEL_PHASE_FRAMES:
-                self.phase, self.timer = "cruise", 0
-
-        elif self.phase == "cruise":
-            self.timer += 1
-            if self.timer >= CONSTANT_PHASE_FRAMES:
-                self.phase, self.timer = "brake", 0
-
-        elif self.phase == "brake":
-            self.ang_vel *= BRAKE_RATE
-            if self.ang_vel < 0.01:                 # slow enough → snap
-                self.angle = self.angle % (2 * math.pi)
-                delta      = (self.target_angle - self.angle) % (2 * math.pi)
-                self.angle += delta
-                self.phase = "done"
-
-        # advance rotation
-        self.angle += self.ang_vel
+    def update(self, frames: float = 1.0) -> None:
+        """Advance the spin by *frames* (fractional / several at once ok)."""
+        if self.is_spinning:
+            self.seek(self.timer + frames)
 
     # ---------------------------------------------------------- draw -----
-    def draw(self) -> None:
+    def _frame_angle(self, alpha: float = 1.0) -> float:
+        """
+        Nearest quantised angle while moving, the exact one at rest. *alpha*
+        places the drawing between the previous frame (0) and this one (1).
+        """
+        tau = 2 * math.pi
+        if not self.is_spinning:
+            return self.angle % tau
+        angle = self.angle if alpha >= 1.0 else self.angle_at(self.timer - 1.0 + alpha)
+        step = tau / FRAME_STEPS
+        return (round(angle / step) % FRAME_STEPS) * step
+
+    def _render_frame(self, angle: float,
+                      img: "pyxel.Image | None") -> "pyxel.Image":
+        size = self.frame_size
+        if img is None:
+            img = pyxel.Image(size, size)
+        c = size // 2
+        img.cls(0)
+
         # outer ring
-        pyxel.circ(self.cx, self.cy, self.radius + 12, COL_BLACK)
-        pyxel.circ(self.cx, self.cy, self.radius + 10, 0)
+        img.circ(c, c, self.radius + 12, COL_BLACK)
+        img.circ(c, c, self.radius + 10, 0)
 
         # slot labels
-        for n in range(NUM_SLOTS):
-            ang = self.angle + SLOT_ANGLE[n]
-            sx  = self.cx + math.sin(ang) * self.radius
-            sy  = self.cy - math.cos(ang) * self.radius
-            col = SLOT_COLOURS[n]
-            txt = str(n)
-            pyxel.text(int(sx) - (2 if n < 10 else 4), int(sy) - 2, txt, col)
+        for n in range(self.layout.pockets):
+            ang = angle + self.slot_angle[n]
+            sx  = c + math.sin(ang) * self.radius
+            sy  = c - math.cos(ang) * self.radius
+            col = self.slot_colour[n]
+            txt = self.layout.labels[n]
+            img.text(int(sx) - 2 * len(txt), int(sy) - 2, txt, col)
+        return img
+
+    def draw(self, alpha: float = 1.0) -> None:
+        """*alpha* < 1 draws the wheel part way back towards the previous tick."""
+        # disc + labels: one blit of the cached frame (black is transparent)
+        size = self.frame_size
+        pyxel.blt(self.cx - size // 2, self.cy - size // 2,
+                  self.frames.get(self._frame_angle(alpha)), 0, 0, size, size, 0)
 
         # pointer
         pyxel.tri(self.cx - 6, self.cy - self.radius - 18,
@@ -141,10 +295,8 @@ class RouletteWheel:
 
         # finished? show result banner
         if self.phase == "done":
-            colour_char = ("R" if SLOT_COLOURS[self.result] == COL_RED
-                           else "B" if SLOT_COLOURS[self.result] == COL_BLACK
-                           else "G")
-            msg = f"Number: {self.result}   Colour: {colour_char}"
+            colour_char = self.layout.colors[self.result]
+            msg = f"Number: {self.layout.labels[self.result]}   Colour: {colour_char}"
             draw_text_center(msg, 220, TEXT_COL)
 
 
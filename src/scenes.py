@@ -0,0 +1,73 @@
+"""scenes.py – registry of casino tables, imported and built on demand
+
+`CasinoApp` knows nothing about individual games: the menu lists
+`SCENES` and a game's module is only imported – and its class only
+constructed – the first time the player selects it. Under the Pyodide web
+build that keeps NumPy, the wheel frame cache and the horse race engine
+off the startup path.
+
+Adding a table is one line here; the class just has to follow `Scene`:
+
+    register("Baccarat", "baccarat", "BaccaratGame")
+"""
+from __future__ import annotations
+
+import importlib
+import time
+from typing import Any, Dict, NamedTuple, Protocol
+
+
+class Scene(Protocol):
+    """What `CasinoApp` expects from a game; built as `cls(app)`."""
+
+    animating: bool                     # frames advance without input
+
+    def reset(self) -> None: ...        # on selection and after game over
+    def update(self) -> None: ...
+    def draw(self) -> None: ...         # may interpolate with `app.alpha`
+    def snapshot(self) -> Any: ...      # immutable, compact state (rewind)
+    def restore(self, state: Any) -> None: ...
+
+
+class SceneSpec(NamedTuple):
+    name: str                           # scene key (`CasinoApp.scene`)
+    label: str                          # menu text
+    module: str
+    cls: str
+
+
+SCENES: Dict[str, SceneSpec] = {}
+
+
+def register(label: str, module: str, cls: str, name: str | None = None) -> SceneSpec:
+    spec = SceneSpec(name or label.split()[0], label, module, cls)
+    SCENES[spec.name] = spec
+    return spec
+
+
+register("Roulette", "roulette", "RouletteGame")
+register("Blackjack", "blackjack", "BlackjackGame")
+register("Horse Race", "horse_racing", "HorseRaceGame")
+
+
+class SceneRegistry:
+    """Lazily imported + constructed games of one app, keyed by scene name."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self.loaded: Dict[str, Scene] = {}
+        self.load_ms: Dict[str, float] = {}     # import + construction time
+
+    def __getitem__(self, name: str) -> Scene:
+        game = self.loaded.get(name)
+        if game is None:
+            spec = SCENES[name]
+            t0 = time.perf_counter()
+            cls = getattr(importlib.import_module(spec.module), spec.cls)
+            game = self.loaded[name] = cls(self.app)
+            self.load_ms[name] = (time.perf_counter() - t0) * 1000
+        return game
+
+    def get(self, name: str) -> Scene | None:
+        """Loaded game for *name*, or None (never triggers a load)."""
+        return self.loaded.get(name)
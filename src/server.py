@@ -0,0 +1,484 @@
+"""server.py – asyncio multi‑table casino server (no pyxel)
+
+Hosts thousands of independent player sessions over a local TCP socket,
+reusing the pyxel‑free rule modules (`roulette_table`, `blackjack_rules`,
+`horse_engine` / `horse_odds`). Messages are newline‑delimited JSON
+objects in both directions.
+
+Shared tables run on a fixed cadence: `open` is broadcast to every seated
+player, bets are taken for `round_ms`, then one spin / race is broadcast
+and every bet at the table is settled in bulk (NumPy over the bet arrays)
+before each player gets a single `settle` message. Leaving a table, or
+disconnecting, refunds that player's bets on the open round. Blackjack is
+played per session against its own shoe.
+
+Client → server                          Server → client
+    {"op": "join", "table": "roulette-1"}    {"ev": "welcome", "session", "balance", "tables"}
+    {"op": "leave", "table": …}              {"ev": "open", "table", "round"}
+    {"op": "bet", "table": "roulette-1",     {"ev": "result", "table", "round", "pocket"|"winner"}
+     "type": "COLOR", "sel": 0, "stake": 10} {"ev": "settle", "table", "round", "win", "balance"}
+    {"op": "bet", "table": "horse-1",        {"ev": "hand", "player", "dealer", "value", …}
+     "horse": 2, "stake": 10}                {"ev": "ok" | "error", …}
+    {"op": "bj_deal", "stake": 10}
+    {"op": "bj_hit"}  {"op": "bj_stand"}
+    {"op": "balance"}  {"op": "stats"}
+
+    python server.py serve --port 8765       # tables spin every 5 s
+    python server.py bench --sessions 2000   # spawn a server + load generator
+"""
+from __future__ import annotations
+
+import abc
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from blackjack_rules import DEALER_STANDS_ON, Hand, Shoe, card_str, payout_multiple
+from common import (HORSE_FINISH, HORSE_TARGET_RTP, HORSE_WEIGHTS, ROULETTE_LAYOUT,
+                    STARTING_BALANCE, RngStreams)
+from horse_engine import simulate_race
+from horse_odds import payout_table
+from ledger import Ledger
+from roulette_table import LAYOUTS, PAYOUT_MULT, BetType
+
+ROUND_MS    = 5000            # betting window of a shared table
+MAX_BUFFER  = 1 << 20         # bytes queued to a client before it is dropped
+LAYOUT      = LAYOUTS[ROULETTE_LAYOUT]
+
+
+def _line(msg: Dict[str, Any]) -> bytes:
+    return json.dumps(msg, separators=(",", ":")).encode() + b"\n"
+
+
+def _whole(msg: Dict[str, Any], key: str, lo: int, hi: int) -> int:
+    """`msg[key]` if it is a whole number in [lo, hi], else `ValueError`.
+
+    Every number a client sends goes through here: JSON floats (1e400 is
+    inf), booleans and strings never reach `int()`.
+    """
+    value = msg[key]
+    if isinstance(value, bool) or not isinstance(value, int) or not lo <= value <= hi:
+        raise ValueError(f"invalid {key}")
+    return value
+
+
+# ───────────────────────────── sessions ────────────────────────────────
+class Session:
+    """One connected player: balance, seats and blackjack hand."""
+
+    __slots__ = ("id", "writer", "ledger", "tables", "shoe", "player", "dealer", "stake")
+
+    def __init__(self, sid: int, writer: asyncio.StreamWriter) -> None:
+        self.id     = sid
+        self.writer = writer
+        self.ledger = Ledger(STARTING_BALANCE)
+        self.tables: set = set()
+        self.shoe: Shoe | None = None
+        self.player = self.dealer = None
+        self.stake  = 0
+
+    def send(self, data: bytes) -> None:
+        transport = self.writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > MAX_BUFFER:   # not reading
+            transport.abort()
+            return
+        self.writer.write(data)
+
+
+# ───────────────────────────── tables ──────────────────────────────────
+class Table(abc.ABC):
+    """Shared table: seated sessions, a betting round, bulk settlement."""
+
+    kind = ""
+
+    def __init__(self, name: str, rng: random.Random, round_ms: int) -> None:
+        self.name     = name
+        self.rng      = rng
+        self.round_s  = round_ms / 1000
+        self.seated: Dict[int, Session] = {}
+        self.round    = 0
+        self.is_open  = False
+        self.settled  = 0              # bets settled since start
+        self.settle_s = 0.0            # time spent settling them
+        self._clear()
+
+    def _clear(self) -> None:
+        self.bet_sid: List[int] = []   # parallel bet arrays for bulk settlement
+        self.bet_stake: List[int] = []
+
+    def _columns(self) -> List[list]:
+        """Every parallel bet array, `bet_sid` first."""
+        return [self.bet_sid, self.bet_stake]
+
+    def broadcast(self, msg: Dict[str, Any]) -> None:
+        data = _line(msg)              # serialised once for every seat
+        for s in self.seated.values():
+            s.send(data)
+
+    async def run(self) -> None:
+        while True:
+            self.round += 1
+            self.is_open = True
+            self.broadcast({"ev": "open", "table": self.name, "round": self.round})
+            await asyncio.sleep(self.round_s)
+            self.is_open = False
+            self.settle()
+
+    def settle(self) -> None:
+        t0 = time.perf_counter()
+        outcome, wins = self.resolve()
+        self.broadcast({"ev": "result", "table": self.name, "round": self.round,
+                        **outcome})
+        if self.bet_sid:
+            sids = np.asarray(self.bet_sid)
+            uniq, inv = np.unique(sids, return_inverse=True)
+            totals = np.bincount(inv, weights=wins, minlength=uniq.size)
+            for sid, win in zip(uniq.tolist(), totals.astype(np.int64).tolist()):
+                s = self.seated[sid]             # leavers were refunded in `unseat`
+                s.ledger.payout(self.name, win)
+                s.send(_line({"ev": "settle", "table": self.name, "round": self.round,
+                              "win": win, "balance": s.ledger.balance}))
+            self.settled += sids.size
+        self._clear()
+        self.settle_s += time.perf_counter() - t0
+
+    @abc.abstractmethod
+    def place(self, s: Session, msg: Dict[str, Any], stake: int) -> None:
+        """Validate *msg* and record one bet of *stake* (via `take`)."""
+
+    @abc.abstractmethod
+    def resolve(self) -> tuple:
+        """Draw this round's outcome: (broadcast fields, win per bet or None)."""
+
+    def take(self, s: Session, stake: int) -> None:
+        s.ledger.bet(self.name, stake)
+        self.bet_sid.append(s.id)
+        self.bet_stake.append(stake)
+
+    def unseat(self, s: Session) -> None:
+        """Remove *s* from the table, refunding its bets on the open round."""
+        self.seated.pop(s.id, None)
+        keep = [i for i, sid in enumerate(self.bet_sid) if sid != s.id]
+        if len(keep) == len(self.bet_sid):
+            return
+        refund = sum(stake for sid, stake in zip(self.bet_sid, self.bet_stake) if sid == s.id)
+        for column in self._columns():
+            column[:] = [column[i] for i in keep]
+        s.ledger.payout(self.name, refund)
+
+
+class RouletteTable(Table):
+    kind = "roulette"
+
+    def _clear(self) -> None:
+        super()._clear()
+        self.bet_mask: List[int] = []
+        self.bet_mult: List[int] = []
+
+    def _columns(self) -> List[list]:
+        return super()._columns() + [self.bet_mask, self.bet_mult]
+
+    def place(self, s: Session, msg: Dict[str, Any], stake: int) -> None:
+        bet_type = BetType[msg["type"]]
+        sel = _whole(msg, "sel", 0, len(LAYOUT.options[bet_type]) - 1)
+        self.take(s, stake)
+        self.bet_mask.append(LAYOUT.mask(bet_type, sel))
+        self.bet_mult.append(PAYOUT_MULT[bet_type])
+
+    def resolve(self) -> tuple:
+        pocket = self.rng.randrange(LAYOUT.pockets)
+        if not self.bet_sid:
+            return {"pocket": pocket}, None
+        hit = (np.asarray(self.bet_mask, dtype=np.uint64) >> np.uint64(pocket)) & np.uint64(1)
+        wins = hit.astype(np.int64) * np.asarray(self.bet_stake) * np.asarray(self.bet_mult)
+        return {"pocket": pocket, "label": LAYOUT.labels[pocket]}, wins
+
+
+class HorseTable(Table):
+    kind = "horse"
+
+    def __init__(self, name: str, rng: random.Random, round_ms: int) -> None:
+        super().__init__(name, rng, round_ms)
+        self.payouts = np.asarray(payout_table(HORSE_WEIGHTS, HORSE_FINISH,
+                                               target_rtp=HORSE_TARGET_RTP))
+
+    def _clear(self) -> None:
+        super()._clear()
+        self.bet_horse: List[int] = []
+
+    def _columns(self) -> List[list]:
+        return super()._columns() + [self.bet_horse]
+
+    def place(self, s: Session, msg: Dict[str, Any], stake: int) -> None:
+        horse = _whole(msg, "horse", 0, len(HORSE_WEIGHTS) - 1)
+        self.take(s, stake)
+        self.bet_horse.append(horse)
+
+    def resolve(self) -> tuple:
+        race = simulate_race(HORSE_WEIGHTS, HORSE_FINISH, self.rng)
+        outcome = {"winner": race.winner, "time": round(race.finish_time, 3)}
+        if not self.bet_sid:
+            return outcome, None
+        hit = np.asarray(self.bet_horse) == race.winner
+        stakes = np.asarray(self.bet_stake, dtype=np.float64)
+        # floored like `horse_odds.payout`, float noise rounded off first
+        return outcome, np.floor(np.round(hit * stakes * self.payouts[race.winner], 6))
+
+
+# ───────────────────────────── server ──────────────────────────────────
+class CasinoServer:
+    def __init__(self, tables: int = 2, round_ms: int = ROUND_MS, seed: int = 0) -> None:
+        self.rngs = RngStreams(seed)
+        self.sessions: Dict[int, Session] = {}
+        self.tables: Dict[str, Table] = {}
+        for i in range(1, tables + 1):
+            for cls in (RouletteTable, HorseTable):
+                name = f"{cls.kind}-{i}"
+                self.tables[name] = cls(name, self.rngs[name], round_ms)
+        self._next_id = 0
+        self.connected = 0               # sessions ever accepted
+
+    async def serve(self, host: str, port: int) -> asyncio.AbstractServer:
+        self._tasks = [asyncio.ensure_future(t.run()) for t in self.tables.values()]
+        return await asyncio.start_server(self._handle, host, port, limit=1 << 16,
+                                          backlog=4096)
+
+    async def _handle(self, reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        self._next_id += 1
+        s = Session(self._next_id, writer)
+        self.sessions[s.id] = s
+        self.connected += 1
+        s.send(_line({"ev": "welcome", "session": s.id, "balance": s.ledger.balance,
+                      "tables": list(self.tables)}))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:                   # longer than the limit
+                    s.send(_line({"ev": "error", "error": "line too long"}))
+                    break
+                if not line:
+                    break
+                try:
+                    reply = self.dispatch(s, json.loads(line))
+                except (KeyError, ValueError, TypeError) as exc:
+                    reply = {"ev": "error", "error": str(exc)}
+                except RecursionError:               # absurdly nested JSON
+                    reply = {"ev": "error", "error": "message nested too deeply"}
+                if reply is not None:
+                    s.send(_line(reply))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for name in s.tables:
+                self.tables[name].unseat(s)
+            del self.sessions[s.id]
+            if s.shoe is not None:
+                self.rngs.discard(f"shoe:{s.id}")
+            writer.close()
+
+    # ------------------------------------------------------------ ops
+    def dispatch(self, s: Session, msg: Dict[str, Any]) -> Dict[str, Any] | None:
+        if not isinstance(msg, dict):
+            raise ValueError("message must be a JSON object")
+        op = msg["op"]
+        if not isinstance(op, str):
+            raise ValueError("op must be a string")
+        if op == "bet":
+            table = self._table(msg)
+            if s.id not in table.seated:
+                raise ValueError("not seated")
+            if not table.is_open:
+                raise ValueError("betting closed")
+            table.place(s, msg, self._stake(s, msg))
+            return None                                  # answered by `settle`
+        if op == "join":
+            table = self._table(msg)
+            table.seated[s.id] = s
+            s.tables.add(table.name)
+            return {"ev": "ok", "op": op, "table": table.name, "open": table.is_open,
+                    "round": table.round}
+        if op == "leave":
+            table = self._table(msg)
+            table.unseat(s)
+            s.tables.discard(table.name)
+            return {"ev": "ok", "op": op, "balance": s.ledger.balance}
+        if op == "balance":
+            return {"ev": "ok", "op": op, "balance": s.ledger.balance}
+        if op == "stats":
+            tables = self.tables.values()
+            return {"ev": "ok", "op": op, "sessions": len(self.sessions),
+                    "connected": self.connected,
+                    "settled": sum(t.settled for t in tables),
+                    "settle_s": sum(t.settle_s for t in tables)}
+        if op.startswith("bj_"):
+            return self._blackjack(s, op, msg)
+        raise ValueError(f"unknown op {op!r}")
+
+    def _table(self, msg: Dict[str, Any]) -> Table:
+        table = msg["table"]
+        if not isinstance(table, str) or table not in self.tables:
+            raise ValueError("no such table")
+        return self.tables[table]
+
+    @staticmethod
+    def _stake(s: Session, msg: Dict[str, Any]) -> int:
+        return _whole(msg, "stake", 1, s.ledger.balance)
+
+    def _blackjack(self, s: Session, op: str, msg: Dict[str, Any]) -> Dict[str, Any]:
+        if op == "bj_deal":
+            if s.player is not None:
+                raise ValueError("hand in progress")
+            stake = self._stake(s, msg)
+            if s.shoe is None:
+                s.shoe = Shoe(rng=self.rngs[f"shoe:{s.id}"])
+            s.shoe.new_round()
+            s.player = Hand((s.shoe.deal(), s.shoe.deal()))
+            s.dealer = Hand((s.shoe.deal(), s.shoe.deal(visible=False)))
+            s.stake = stake
+            s.ledger.bet("blackjack", stake)
+            return self._hand(s, done=False)
+        if s.player is None:
+            raise ValueError("no hand in progress")
+        if op == "bj_hit":
+            s.player.append(s.shoe.deal())
+            if s.player.value <= 21:
+                return self._hand(s, done=False)
+        elif op != "bj_stand":
+            raise ValueError(f"unknown op {op!r}")
+        s.shoe.reveal(s.dealer[1])
+        if s.player.value <= 21:
+            while s.dealer.value < DEALER_STANDS_ON:
+                s.dealer.append(s.shoe.deal())
+        win = s.stake * payout_multiple(s.player.value, s.dealer.value)
+        s.ledger.payout("blackjack", win)
+        reply = self._hand(s, done=True)
+        reply.update(win=win, balance=s.ledger.balance)
+        s.player = s.dealer = None
+        return reply
+
+    @staticmethod
+    def _hand(s: Session, done: bool) -> Dict[str, Any]:
+        dealer = [card_str(c) for c in s.dealer] if done else [card_str(s.dealer[0]), "??"]
+        return {"ev": "hand", "player": [card_str(c) for c in s.player],
+                "value": s.player.value, "dealer": dealer, "done": done,
+                **({"dealer_value": s.dealer.value} if done else {})}
+
+
+async def serve(host: str, port: int, tables: int, round_ms: int, seed: int) -> None:
+    server = CasinoServer(tables, round_ms, seed)
+    srv = await server.serve(host, port)
+    addr = srv.sockets[0].getsockname()
+    print(f"listening on {addr[0]}:{addr[1]}", flush=True)
+    async with srv:
+        await srv.serve_forever()
+
+
+# ──────────────────────────── load generator ───────────────────────────
+def _raise_fd_limit() -> None:
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def _client(host: str, port: int, idx: int, tables: List[str], rounds: int,
+                  stats: Dict[str, int], connected: asyncio.Event) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    await reader.readline()                                       # welcome
+    table = tables[idx % len(tables)]
+    writer.write(_line({"op": "join", "table": table}))
+    stats["sessions"] += 1
+    if stats["sessions"] == stats["target"]:
+        connected.set()
+    await connected.wait()
+    rng = random.Random(idx)
+    settled = 0
+    while settled < rounds:
+        msg = json.loads(await reader.readline())
+        ev = msg["ev"]
+        if ev == "open" or (ev == "ok" and msg.get("open")):
+            if table.startswith("roulette"):
+                bet = {"op": "bet", "table": table, "type": "COLOR",
+                       "sel": rng.randrange(2), "stake": 10}
+            else:
+                bet = {"op": "bet", "table": table, "horse": rng.randrange(4), "stake": 10}
+            writer.write(_line(bet))
+        elif ev == "settle":
+            settled += 1
+            stats["settled"] += 1
+            if stats["settled"] == 1:
+                stats["t_first"] = time.perf_counter()
+            stats["t_last"] = time.perf_counter()
+    writer.close()
+
+
+async def bench(sessions: int, tables: int, rounds: int, round_ms: int) -> None:
+    _raise_fd_limit()
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, __file__, "serve", "--port", "0", "--tables", str(tables),
+        "--round-ms", str(round_ms), stdout=asyncio.subprocess.PIPE)
+    line = (await proc.stdout.readline()).decode()
+    host, port = line.rsplit(" ", 1)[1].strip().split(":")
+    names = [f"{k}-{i}" for i in range(1, tables + 1) for k in ("roulette", "horse")]
+    stats = {"sessions": 0, "settled": 0, "target": sessions}
+    connected = asyncio.Event()
+    try:
+        t0 = time.perf_counter()
+        clients = [asyncio.ensure_future(_client(host, int(port), i, names, rounds,
+                                                 stats, connected))
+                   for i in range(sessions)]
+        await connected.wait()
+        t_conn = time.perf_counter() - t0
+        await asyncio.gather(*clients)
+        reader, writer = await asyncio.open_connection(host, int(port))
+        await reader.readline()                                   # welcome
+        writer.write(_line({"op": "stats"}))
+        server = json.loads(await reader.readline())
+        writer.close()
+    finally:
+        proc.terminate()
+        await proc.wait()
+    span = stats["t_last"] - stats["t_first"]
+    print(f"{sessions:,} sessions connected in {t_conn:.2f}s "
+          f"({sessions / t_conn:,.0f} sessions/s)")
+    print(f"{stats['settled']:,} settlements over {span:.2f}s "
+          f"({stats['settled'] / max(span, 1e-9):,.0f} settlements/s, "
+          f"{len(names)} tables, {round_ms} ms rounds)")
+    print(f"server: {server['settled']:,} bets settled in {server['settle_s']:.3f}s "
+          f"of settle time ({server['settled'] / max(server['settle_s'], 1e-9):,.0f} "
+          f"bets/s incl. result broadcast + per-player settle messages)")
+
+
+# ──────────────────────────── script entry ─────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rems Casino table server")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_serve = sub.add_parser("serve")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8765)
+    p_serve.add_argument("--tables", type=int, default=2, help="of each kind")
+    p_serve.add_argument("--round-ms", type=int, default=ROUND_MS)
+    p_serve.add_argument("--seed", type=int, default=0)
+    p_bench = sub.add_parser("bench")
+    p_bench.add_argument("--sessions", type=int, default=2000)
+    p_bench.add_argument("--tables", type=int, default=2, help="of each kind")
+    p_bench.add_argument("--rounds", type=int, default=10)
+    p_bench.add_argument("--round-ms", type=int, default=250)
+    args = parser.parse_args()
+    if args.cmd == "serve":
+        asyncio.run(serve(args.host, args.port, args.tables, args.round_ms, args.seed))
+    else:
+        asyncio.run(bench(args.sessions, args.tables, args.rounds, args.round_ms))
@@ -0,0 +1,20 @@
+"""Shared pytest setup: the game modules sit flat in `src/`, run headless."""
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import backend                      # noqa: E402  (needs the path above)
+from backend import NullPyxel       # noqa: E402
+
+
+@pytest.fixture
+def null() -> NullPyxel:
+    """A fresh `NullPyxel` as the active backend."""
+    fake = NullPyxel()
+    backend.use(fake)
+    return fake
@@ -0,0 +1,45 @@
+import pytest
+
+from blackjack_rules import Hand, hand_value
+
+ACE, FIVE, SIX, NINE, KING = (1, 0), (5, 1), (6, 2), (9, 3), (13, 0)
+
+
+@pytest.mark.parametrize("cards, value, soft", [
+    ([ACE], 11, True),
+    ([ACE, KING], 21, True),
+    ([ACE, ACE], 12, True),
+    ([ACE, SIX], 17, True),
+    ([ACE, SIX, NINE], 16, False),         # the ace drops back to 1
+    ([ACE, ACE, NINE], 21, True),
+    ([ACE, ACE, ACE, ACE, SIX], 20, True),
+    ([ACE, ACE, ACE, ACE, SIX, SIX], 16, False),
+    ([KING, SIX, ACE], 17, False),
+    ([KING, SIX, ACE, FIVE], 22, False),
+])
+def test_running_total_with_aces(cards, value, soft):
+    hand = Hand()
+    for card in cards:
+        hand.append(card)
+    assert (hand.value, hand.soft) == (value, soft)
+    assert hand.value == hand_value(list(cards))
+    assert Hand(cards).value == value
+
+
+def test_every_mutation_keeps_the_total():
+    hand = Hand([ACE, NINE])
+    hand += [KING]
+    assert hand.value == 20
+    hand.pop()
+    assert (hand.value, hand.soft) == (20, True)
+    hand.remove(ACE)
+    assert (hand.value, hand.soft) == (9, False)
+    hand.insert(0, ACE)
+    hand[1] = ACE
+    assert hand.value == 12
+    del hand[0]
+    assert hand.value == 11
+    hand *= 2
+    assert hand.value == 12
+    hand.clear()
+    assert (hand.value, hand.soft, hand.hard) == (0, False, 0)
@@ -0,0 +1,107 @@
+import os
+
+from ledger import (BET, LOG_NAME, PAYOUT, RECORD_SIZE, SNAP_NAME, SNAPSHOT_EVERY,
+                    Ledger, Txn, _pack, history, read_log, read_snapshot)
+
+
+def play(ledger, rounds):
+    """Alternate bets and payouts; returns the expected balance."""
+    for i in range(rounds):
+        if i % 2:
+            ledger.payout("Roulette", 20)
+        else:
+            ledger.bet("Roulette", 10)
+    return ledger.balance
+
+
+def test_memory_only_ledger_writes_nothing(tmp_path):
+    ledger = Ledger(500)
+    play(ledger, 10)
+    ledger.close()
+    assert ledger.balance == 550 and ledger.error is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_reopen_replays_the_log(tmp_path):
+    ledger = Ledger(500, str(tmp_path))
+    balance = play(ledger, 9)
+    ledger.close()
+    again = Ledger(500, str(tmp_path))
+    assert (again.balance, again.seq) == (balance, 9)
+    assert [t.kind for t in again.recent] == [BET, PAYOUT] * 4 + [BET]
+    again.close()
+
+
+def test_snapshot_plus_tail(tmp_path):
+    ledger = Ledger(500, str(tmp_path))
+    balance = play(ledger, SNAPSHOT_EVERY + 10)
+    ledger.close()
+    seq, snap_balance = read_snapshot(str(tmp_path / SNAP_NAME))
+    assert seq == SNAPSHOT_EVERY and snap_balance != balance
+    tail = list(history(str(tmp_path)))
+    assert [t.seq for t in tail] == list(range(SNAPSHOT_EVERY + 1, SNAPSHOT_EVERY + 11))
+    again = Ledger(0, str(tmp_path))
+    assert (again.balance, again.seq) == (balance, SNAPSHOT_EVERY + 10)
+    again.close()
+
+
+def test_records_covered_by_the_snapshot_are_skipped(tmp_path):
+    """Crash between writing the snapshot and truncating the log."""
+    ledger = Ledger(500, str(tmp_path))
+    play(ledger, SNAPSHOT_EVERY)
+    ledger.close()
+    stale = b"".join(_pack(Txn(s, "old", BET, -1, 1000 - s)) for s in range(1, 5))
+    fresh = _pack(Txn(SNAPSHOT_EVERY + 1, "Roulette", PAYOUT, 5, 12345))
+    (tmp_path / LOG_NAME).write_bytes(stale + fresh)
+    again = Ledger(0, str(tmp_path))
+    assert (again.balance, again.seq) == (12345, SNAPSHOT_EVERY + 1)
+    again.close()
+
+
+def test_torn_tail_is_dropped_and_truncated(tmp_path):
+    ledger = Ledger(500, str(tmp_path))
+    balance = play(ledger, 5)
+    ledger.close()
+    log = tmp_path / LOG_NAME
+    with open(log, "ab") as fh:
+        fh.write(_pack(Txn(6, "Roulette", BET, -10, balance - 10))[:RECORD_SIZE // 2])
+    assert read_log(str(log))[1] == 5 * RECORD_SIZE
+
+    again = Ledger(500, str(tmp_path))
+    assert (again.balance, again.seq) == (balance, 5)
+    assert log.stat().st_size == 5 * RECORD_SIZE
+    again.bet("Horse", 30)                    # appended after the last good record
+    again.close()
+    txns, valid = read_log(str(log))
+    assert valid == log.stat().st_size == 6 * RECORD_SIZE
+    assert txns[-1] == Txn(6, "Horse", BET, -30, balance - 30)
+
+
+def test_corrupt_record_stops_recovery(tmp_path):
+    ledger = Ledger(500, str(tmp_path))
+    play(ledger, 4)
+    ledger.close()
+    log = tmp_path / LOG_NAME
+    blob = bytearray(log.read_bytes())
+    blob[2 * RECORD_SIZE + 20] ^= 0xFF        # flip a byte in record 3
+    log.write_bytes(bytes(blob))
+    txns, valid = read_log(str(log))
+    assert [t.seq for t in txns] == [1, 2] and valid == 2 * RECORD_SIZE
+
+
+def test_write_failure_is_logged_and_kept(tmp_path, caplog):
+    class Full:
+        def write(self, data):
+            raise OSError(28, "No space left on device")
+
+        def close(self):
+            pass
+
+    ledger = Ledger(500, str(tmp_path))
+    writer = ledger._writer
+    writer._log = Full()
+    assert ledger.error is None
+    ledger.bet("Blackjack", 10)
+    ledger.close()                            # flushes and waits for the writer
+    assert isinstance(writer.error, OSError) and writer.error.errno == 28
+    assert "No space left on device" in caplog.text
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+import backend
+from main import CasinoApp
+from replay import SessionLog, replay
+
+FRAMES = 6000
+
+
+def record_session(path, seed, dev=False):
+    """Play *FRAMES* frames of random key taps headless and save the log."""
+    app = CasinoApp(headless=True, seed=seed, record=str(path), dev=dev)
+    null = backend.active()
+    keys = [null.KEY_UP, null.KEY_DOWN, null.KEY_RETURN, null.KEY_SPACE, null.KEY_A,
+            null.KEY_H, null.KEY_S, null.KEY_Q, null.KEY_R, null.KEY_F5, null.KEY_F9]
+    rng = random.Random(seed)
+    for _ in range(FRAMES):
+        if rng.random() < 0.3:
+            null.tap(rng.choice(keys))
+        app.step()
+    app.save_recording()
+    return SessionLog.load(str(path))
+
+
+@pytest.mark.parametrize("dev", [False, True])
+def test_replay_reproduces_the_balance_history(tmp_path, dev):
+    log = record_session(tmp_path / "session.rec", seed=7, dev=dev)
+    assert log.frames == FRAMES and log.dev == dev
+    assert len(log.balances) > 10                 # bets were actually settled
+    assert replay(log) == log.balances
+
+
+def test_log_round_trips(tmp_path):
+    log = SessionLog(42, 10, [(0, 1, 1), (3, 0, 2)], [(0, 500), (9, 490)],
+                     start_balance=480, dev=True)
+    log.save(str(tmp_path / "x.rec"))
+    back = SessionLog.load(str(tmp_path / "x.rec"))
+    assert vars(back) == vars(log)
+
+
+def test_another_seed_diverges(tmp_path):
+    log = record_session(tmp_path / "session.rec", seed=7)
+    log.seed += 1
+    assert replay(log) != log.balances
@@ -0,0 +1,75 @@
+import pytest
+
+from roulette_table import (DOUBLE_ZERO, LAYOUTS, PAYOUT_MULT, RED_NUMBERS, BetBoard,
+                            BetType)
+
+LAYOUT_NAMES = sorted(LAYOUTS)
+
+
+def pockets_of(mask):
+    return {p for p in range(mask.bit_length()) if mask >> p & 1}
+
+
+@pytest.mark.parametrize("name", LAYOUT_NAMES)
+def test_every_bet_returns_36_units_over_the_wheel(name):
+    """mult × covered pockets is 36 for every bet, so each pays 36/pockets."""
+    layout = LAYOUTS[name]
+    for bet_type, options in layout.options.items():
+        for label, mask in options:
+            assert mask >> layout.pockets == 0, label
+            assert PAYOUT_MULT[bet_type] * bin(mask).count("1") == 36, label
+
+
+@pytest.mark.parametrize("name", LAYOUT_NAMES)
+def test_outside_bets_match_the_numbers(name):
+    layout = LAYOUTS[name]
+    nums = range(1, 37)
+    expected = {
+        BetType.COLOR:    [RED_NUMBERS, set(nums) - RED_NUMBERS],
+        BetType.PARITY:   [{n for n in nums if n % 2 == 0}, {n for n in nums if n % 2}],
+        BetType.HIGH_LOW: [set(range(1, 19)), set(range(19, 37))],
+        BetType.DOZEN:    [set(range(lo, lo + 12)) for lo in (1, 13, 25)],
+        BetType.COLUMN:   [set(range(c, 37, 3)) for c in (1, 2, 3)],
+    }
+    for bet_type, pocket_sets in expected.items():
+        got = [pockets_of(layout.mask(bet_type, i)) for i in range(len(pocket_sets))]
+        assert got == pocket_sets, bet_type
+
+
+@pytest.mark.parametrize("name", LAYOUT_NAMES)
+def test_zeros_only_win_inside_bets(name):
+    layout = LAYOUTS[name]
+    zeros = {0, DOUBLE_ZERO} if layout.pockets > DOUBLE_ZERO else {0}
+    assert [layout.labels[z] for z in sorted(zeros)] == ["0", "00"][:len(zeros)]
+    for bet_type, options in layout.options.items():
+        for label, mask in options:
+            if pockets_of(mask) & zeros:
+                assert bet_type in (BetType.NUMBER, BetType.SPLIT), label
+
+
+@pytest.mark.parametrize("name", LAYOUT_NAMES)
+def test_numbers_and_splits_cover_the_board(name):
+    layout = LAYOUTS[name]
+    numbers = [pockets_of(m) for _, m in layout.options[BetType.NUMBER]]
+    assert numbers == [{p} for p in range(layout.pockets)]
+    splits = {frozenset(pockets_of(m)) for _, m in layout.options[BetType.SPLIT]}
+    assert len(splits) == len(layout.options[BetType.SPLIT])
+    assert frozenset({17, 20}) in splits and frozenset({3, 4}) not in splits
+
+
+@pytest.mark.parametrize("name", LAYOUT_NAMES)
+def test_board_settles_every_bet_for_a_pocket(name):
+    layout = LAYOUTS[name]
+    board = BetBoard(layout)
+    board.place(BetType.NUMBER, 17, 10)                 # 17
+    board.place(BetType.COLOR, 1, 20)                   # black
+    board.place(BetType.COLOR, 1, 5)                    # merged into the same bet
+    board.place(BetType.DOZEN, 0, 10)                   # 1‑12
+    assert len(board.bets) == 3 and board.total_stake == 45
+    assert board.settle(17) == 10 * 36 + 25 * 2
+    assert board.settle(3) == 10 * 3                    # red, first dozen
+    assert board.settle(0) == 0
+    if layout.pockets > DOUBLE_ZERO:
+        assert board.settle(DOUBLE_ZERO) == 0
+        board.place(BetType.NUMBER, DOUBLE_ZERO, 1)
+        assert board.settle(DOUBLE_ZERO) == 36
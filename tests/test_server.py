@@ -0,0 +1,194 @@
+import asyncio
+import json
+
+import pytest
+
+from horse_odds import payout
+from server import CasinoServer, Session, Table
+
+
+class Transport:
+    def is_closing(self):
+        return False
+
+    def get_write_buffer_size(self):
+        return 0
+
+
+class Writer:
+    """Collects what the server sends one session."""
+
+    transport = Transport()
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, data):
+        self.lines += [json.loads(line) for line in data.splitlines()]
+
+    def events(self, ev):
+        return [m for m in self.lines if m["ev"] == ev]
+
+
+class FixedPocket:
+    def __init__(self, pocket):
+        self.pocket = pocket
+
+    def randrange(self, n):
+        return self.pocket
+
+
+@pytest.fixture
+def server():
+    srv = CasinoServer(tables=1)
+    for table in srv.tables.values():
+        table.is_open = True
+    return srv
+
+
+def seat(server, sid, *tables):
+    s = Session(sid, Writer())
+    server.sessions[sid] = s
+    for name in tables:
+        server.dispatch(s, {"op": "join", "table": name})
+    return s
+
+
+def bet(server, s, table, stake, **fields):
+    return server.dispatch(s, {"op": "bet", "table": table, "stake": stake, **fields})
+
+
+def test_table_is_abstract():
+    with pytest.raises(TypeError):
+        Table("x", None, 1000)
+
+
+def test_roulette_round_settles_every_bet(server):
+    table = server.tables["roulette-1"]
+    table.rng = FixedPocket(17)                       # black, odd, 2nd dozen
+    a, b = seat(server, 1, "roulette-1"), seat(server, 2, "roulette-1")
+    bet(server, a, "roulette-1", 10, type="NUMBER", sel=17)
+    bet(server, a, "roulette-1", 5, type="COLOR", sel=0)       # red
+    bet(server, b, "roulette-1", 20, type="COLOR", sel=1)      # black
+    bet(server, b, "roulette-1", 30, type="DOZEN", sel=0)      # 1‑12
+    assert (a.ledger.balance, b.ledger.balance) == (485, 450)
+    table.settle()
+    assert a.writer.events("result")[-1]["pocket"] == 17
+    assert [(m["win"], m["balance"]) for m in a.writer.events("settle")] == [(360, 845)]
+    assert [(m["win"], m["balance"]) for m in b.writer.events("settle")] == [(40, 490)]
+    assert table.settled == 4 and table.bet_sid == [] and table.bet_mask == []
+
+
+def test_horse_round_pays_the_calibrated_multiplier(server):
+    table = server.tables["horse-1"]
+    s = seat(server, 1, "horse-1")
+    for horse in range(len(table.payouts)):
+        bet(server, s, "horse-1", 30, horse=horse)
+    table.settle()
+    winner = s.writer.events("result")[-1]["winner"]
+    win = payout(30, float(table.payouts[winner]))
+    assert [m["win"] for m in s.writer.events("settle")] == [win]
+    assert s.ledger.balance == 500 - 30 * len(table.payouts) + win
+
+
+def test_leaving_refunds_open_bets(server):
+    table = server.tables["roulette-1"]
+    a, b = seat(server, 1, "roulette-1"), seat(server, 2, "roulette-1")
+    bet(server, a, "roulette-1", 10, type="NUMBER", sel=3)
+    bet(server, b, "roulette-1", 7, type="NUMBER", sel=5)
+    bet(server, a, "roulette-1", 20, type="COLOR", sel=0)
+    reply = server.dispatch(a, {"op": "leave", "table": "roulette-1"})
+    assert reply["balance"] == a.ledger.balance == 500
+    assert (table.bet_sid, table.bet_stake, table.bet_mult) == ([2], [7], [36])
+    table.settle()                                    # nothing left for `a`
+    assert a.writer.events("settle") == [] and len(b.writer.events("settle")) == 1
+
+
+def test_disconnect_refunds_open_bets():
+    async def scenario():
+        server = CasinoServer(tables=1, round_ms=60_000)
+        srv = await server.serve("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(*srv.sockets[0].getsockname()[:2])
+        try:
+            await reader.readline()                   # welcome
+            writer.write(b'{"op":"join","table":"horse-1"}\n'
+                         b'{"op":"bet","table":"horse-1","horse":2,"stake":50}\n')
+            while json.loads(await reader.readline())["ev"] != "ok":
+                pass
+            (session,) = server.sessions.values()
+            while not server.tables["horse-1"].bet_sid:
+                await asyncio.sleep(0.01)
+            assert session.ledger.balance == 450
+            writer.close()
+            while server.sessions:
+                await asyncio.sleep(0.01)
+            return session, server.tables["horse-1"]
+        finally:
+            srv.close()
+            await srv.wait_closed()
+            for task in server._tasks:
+                task.cancel()
+
+    session, table = asyncio.run(scenario())
+    assert session.ledger.balance == 500
+    assert (table.bet_sid, table.bet_horse) == ([], [])
+
+
+@pytest.mark.parametrize("msg", [
+    {"op": "bet", "table": "roulette-1", "type": "COLOR", "sel": 0, "stake": 1e400},
+    {"op": "bet", "table": "roulette-1", "type": "COLOR", "sel": 0, "stake": True},
+    {"op": "bet", "table": "roulette-1", "type": "COLOR", "sel": 0, "stake": "10"},
+    {"op": "bet", "table": "roulette-1", "type": "COLOR", "sel": 0, "stake": 10.5},
+    {"op": "bet", "table": "roulette-1", "type": "COLOR", "sel": 0, "stake": 0},
+    {"op": "bet", "table": "roulette-1", "type": "COLOR", "sel": 0, "stake": 501},
+    {"op": "bet", "table": "roulette-1", "type": "COLOR", "sel": 2, "stake": 10},
+    {"op": "bet", "table": "roulette-1", "type": "COLOR", "sel": -1, "stake": 10},
+    {"op": "bet", "table": "roulette-1", "type": "NOPE", "sel": 0, "stake": 10},
+    {"op": "bet", "table": "horse-1", "horse": 4, "stake": 10},
+    {"op": "bet", "table": "horse-1", "horse": -1e400, "stake": 10},
+    {"op": "bet", "table": "roulette-9", "type": "COLOR", "sel": 0, "stake": 10},
+    {"op": "bet", "table": ["roulette-1"], "type": "COLOR", "sel": 0, "stake": 10},
+    {"op": "bj_deal", "stake": float("nan")},
+    {"op": "bj_hit"},
+    {"op": ["balance"]},
+    {"op": "nope"},
+    {"stake": 10},
+    [1, 2, 3],
+])
+def test_bad_input_is_rejected_without_side_effects(server, msg):
+    s = seat(server, 1, "roulette-1", "horse-1")
+    with pytest.raises((KeyError, ValueError, TypeError)):
+        server.dispatch(s, msg)
+    assert s.ledger.balance == 500 and s.ledger.seq == 0
+    assert all(not t.bet_sid for t in server.tables.values())
+
+
+def test_session_survives_bad_lines_over_the_socket():
+    bad = [b'{"op":"bj_deal","stake":1e400}', b"[" * 30000 + b"]" * 30000,
+           b"5", b"not json", b'{"op":"bet","table":"horse-1","horse":1,"stake":10}']
+
+    async def scenario():
+        server = CasinoServer(tables=1, round_ms=60_000)
+        srv = await server.serve("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(*srv.sockets[0].getsockname()[:2])
+        try:
+            assert json.loads(await reader.readline())["ev"] == "welcome"
+            for line in bad + [b'{"op":"balance"}']:
+                writer.write(line + b"\n")
+            replies = []
+            while len(replies) <= len(bad):
+                msg = json.loads(await reader.readline())
+                if msg["ev"] != "open":
+                    replies.append(msg)
+            return replies
+        finally:
+            writer.close()
+            srv.close()
+            await srv.wait_closed()
+            for task in server._tasks:
+                task.cancel()
+
+    replies = asyncio.run(scenario())
+    assert [m["ev"] for m in replies] == ["error"] * len(bad) + ["ok"]
+    assert replies[1]["error"] == "message nested too deeply"
+    assert replies[-1]["balance"] == 500
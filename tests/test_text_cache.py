@@ -0,0 +1,41 @@
+from backend import NullImage
+from common import GLYPH_H, GLYPH_W, TextCache
+
+
+class CountingImage(NullImage):
+    rendered: list = []
+
+    def text(self, x, y, s, col):
+        self.rendered.append(s)
+
+
+def test_label_is_rendered_once_and_then_blitted(null):
+    null.Image = CountingImage
+    CountingImage.rendered = []
+    cache = TextCache()
+    for _ in range(5):
+        cache.draw(10, 20, "Balance: ${}", 7, 500)
+    assert CountingImage.rendered == ["Balance: $500"]
+    assert null.draw_calls == 5
+
+
+def test_new_values_render_a_new_label(null):
+    null.Image = CountingImage
+    CountingImage.rendered = []
+    cache = TextCache()
+    cache.draw(None, 0, "Balance: ${}", 7, 500)
+    cache.draw(None, 0, "Balance: ${}", 7, 490)
+    cache.draw(None, 0, "Balance: ${}", 8, 490)
+    assert CountingImage.rendered == ["Balance: $500", "Balance: $490", "Balance: $490"]
+
+
+def test_full_atlas_starts_over(null):
+    null.Image = CountingImage
+    CountingImage.rendered = []
+    cache = TextCache()
+    shelves = cache.ATLAS_H // GLYPH_H
+    wide = "x" * (cache.ATLAS_W // GLYPH_W - 2) + "{:02d}"   # a whole shelf each
+    for i in range(shelves + 1):
+        cache.draw(0, 0, wide, 7, i)
+    cache.draw(0, 0, wide, 7, 0)                 # evicted with the rest
+    assert len(CountingImage.rendered) == shelves + 2